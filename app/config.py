@@ -3,9 +3,48 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://localhost:5432/contextkernel"
+    # Optional read replica for /kernel/* GETs; falls back to the primary when lagging
+    database_read_url: str | None = None
+    database_read_max_lag_seconds: float = 30.0
     default_tz: str = "UTC"
     kernel_api_key: str | None = None
 
+    # Row fetch backend for card reads: "sqlalchemy" | "asyncpg" (native pool, prepared statements)
+    kernel_connector_backend: str = "sqlalchemy"
+    # Decoder for json/jsonb columns: "json" | "orjson" | "msgspec" (optional extras)
+    kernel_json_decoder: str = "json"
+    # Let Postgres extract SIGNAL_CONFIG paths from raw_data (typed columns, no JSONB transfer)
+    kernel_signal_projection: bool = False
+    # Aggregate in Postgres when a card's target range spans at least this many days
+    kernel_sql_aggregation_min_days: int | None = None
+    # One row per device/day: the daily row, else the latest intraday snapshot ("today so far")
+    kernel_intraday_snapshots: bool = False
+    # Read cards from health_connect_signals_daily while its last refresh is this recent
+    kernel_signal_table: bool = False
+    kernel_signal_table_max_staleness_seconds: int = 900
+    # Stream rows through a server-side cursor in batches of this size (bounded memory)
+    kernel_stream_batch_size: int | None = None
+    # Compute per-signal reductions and card math with numpy (optional "vectorized" extra)
+    kernel_vectorized_features: bool = False
+    # Cards of one preset run built concurrently, each on its own session (caps DB connections per request)
+    kernel_preset_max_concurrency: int = 4
+    # In-process card cache (entries; 0 disables); entries are re-validated by a received_at watermark
+    kernel_card_cache_size: int = 0
+    kernel_card_cache_ttl_seconds: float = 300.0
+    # Persist cards of fully elapsed periods in kernel_card_store (invalidated by late-received rows)
+    kernel_card_store: bool = False
+    # Background pre-warm of current cards after local midnight and settled ingestion bursts
+    kernel_prewarm: bool = False
+    kernel_prewarm_poll_seconds: float = 60.0
+    kernel_prewarm_midnight_delay_seconds: float = 120.0
+    kernel_prewarm_active_days: int = 7
+    # Per-stage timings as a Server-Timing header and a structured log line per request
+    kernel_server_timing: bool = False
+    # In-process Prometheus counters/histograms served at /metrics
+    kernel_metrics: bool = False
+    # Build envelopes without re-validation and render responses from precompiled TypeAdapters
+    kernel_fast_render: bool = False
+
     # Optional user profile / goals tuning (single-user, env-backed, not yet integrated)
     user_age: int | None = None
     user_height_cm: float | None = None
@@ -1,18 +1,202 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+import asyncpg
+from fastapi import Request
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import settings
 
-_raw_url = settings.database_url
 
-if _raw_url.startswith("postgres://"):
-    _raw_url = _raw_url.replace("postgres://", "postgresql+asyncpg://", 1)
-elif _raw_url.startswith("postgresql://"):
-    _raw_url = _raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+def _asyncpg_url(url: str) -> str:
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+_raw_url = _asyncpg_url(settings.database_url)
+
+
+def json_loader(name: str) -> Callable[[bytes], Any]:
+    """bytes -> object decoder for json/jsonb columns, per KERNEL_JSON_DECODER."""
+    if name == "json":
+        # decode first: json.loads(bytes) pays for encoding detection
+        return lambda value: json.loads(value.decode())
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads
+    if name == "msgspec":
+        import msgspec
+
+        return msgspec.json.decode
+    raise ValueError(f"Unknown KERNEL_JSON_DECODER: {name!r} (expected json, orjson or msgspec)")
+
+
+_json_loads = json_loader(settings.kernel_json_decoder)
+
+
+async def register_json_codecs(
+    conn: asyncpg.Connection,
+    loads: Callable[[bytes], Any],
+    dumps: Callable[[Any], str] = str,
+) -> None:
+    """Binary json/jsonb codecs that hand raw bytes straight to `loads`.
+
+    `dumps` serialises bound values; SQLAlchemy passes them pre-serialised.
+    """
+
+    def _jsonb_decoder(bin_value: bytes) -> Any:
+        # jsonb binary format carries a \x01 version prefix
+        return loads(bin_value[1:])
+
+    await conn.set_type_codec(
+        "json",
+        encoder=lambda v: dumps(v).encode(),
+        decoder=loads,
+        schema="pg_catalog",
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=lambda v: b"\x01" + dumps(v).encode(),
+        decoder=_jsonb_decoder,
+        schema="pg_catalog",
+        format="binary",
+    )
+
 
 engine = create_async_engine(_raw_url, pool_pre_ping=True)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Replica lag probes give up after this long (they run inside a request)
+_LAG_PROBE_TIMEOUT_SECONDS = 2.0
+
+# Optional read replica (DATABASE_READ_URL) with its own pool; connects fail
+# fast so an unreachable replica falls back to the primary within the probe timeout
+read_engine = (
+    create_async_engine(
+        _asyncpg_url(settings.database_read_url),
+        pool_pre_ping=True,
+        connect_args={"timeout": _LAG_PROBE_TIMEOUT_SECONDS},
+    )
+    if settings.database_read_url
+    else None
+)
+read_session = (
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+
+def _register_fast_json(dbapi_connection, connection_record) -> None:
+    # Runs after the asyncpg dialect's own codec setup, replacing its
+    # str-decoding json.loads codec with the configured decoder.
+    dbapi_connection.run_async(lambda conn: register_json_codecs(conn, _json_loads))
+
+
+if settings.kernel_json_decoder != "json":
+    for _engine in (engine, read_engine):
+        if _engine is not None:
+            event.listen(_engine.sync_engine, "connect", _register_fast_json)
+
+
+# Replica lag is re-checked at most this often
+_LAG_CHECK_INTERVAL_SECONDS = 5.0
+_replica_checked_at: float | None = None
+_replica_usable = False
 
-async def get_session() -> AsyncSession:  # type: ignore[misc]
-    async with async_session() as session:
+# 0 when every received WAL record is replayed (an idle primary must not look
+# like lag), otherwise the age of the last replayed transaction.
+_REPLICA_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+async def replica_lag_seconds() -> float | None:
+    """Replay lag of the read replica, or None if unknown, unreachable or slower than the probe timeout."""
+    if read_engine is None:
+        return None
+
+    async def _probe() -> Any:
+        async with read_engine.connect() as conn:
+            return (await conn.execute(text(_REPLICA_LAG_SQL))).scalar()
+
+    try:
+        lag = await asyncio.wait_for(_probe(), _LAG_PROBE_TIMEOUT_SECONDS)
+    except Exception:
+        return None
+    return float(lag) if lag is not None else None
+
+
+async def replica_usable() -> bool:
+    """True when the replica's lag is within DATABASE_READ_MAX_LAG_SECONDS (cached briefly)."""
+    global _replica_checked_at, _replica_usable
+    if read_engine is None:
+        return False
+    now = time.monotonic()
+    if _replica_checked_at is None or now - _replica_checked_at > _LAG_CHECK_INTERVAL_SECONDS:
+        _replica_checked_at = now
+        lag = await replica_lag_seconds()
+        _replica_usable = lag is not None and lag <= settings.database_read_max_lag_seconds
+    return _replica_usable
+
+
+async def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Primary sessionmaker, or the replica's for /kernel/* GETs while the replica keeps up."""
+    if (
+        read_session is not None
+        and request.method == "GET"
+        and request.url.path.startswith("/kernel/")
+        and await replica_usable()
+    ):
+        return read_session
+    return async_session
+
+
+async def get_session(request: Request) -> AsyncSession:  # type: ignore[misc]
+    """Primary session, or a replica session for /kernel/* GETs while the replica keeps up."""
+    factory = await get_session_factory(request)
+    async with factory() as session:
         yield session
+
+
+# ---------------------------------------------------------------------------
+# Native asyncpg pool (KERNEL_CONNECTOR_BACKEND=asyncpg)
+# ---------------------------------------------------------------------------
+
+_pg_pool: asyncpg.Pool | None = None
+_pg_pool_lock = asyncio.Lock()
+
+
+def _native_dsn(url: str) -> str:
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def _init_native_connection(conn: asyncpg.Connection) -> None:
+    # asyncpg returns json/jsonb as text unless a codec is registered
+    await register_json_codecs(conn, _json_loads, dumps=json.dumps)
+
+
+async def get_pg_pool() -> asyncpg.Pool:
+    """Lazily create the shared asyncpg pool (same database as `engine`)."""
+    global _pg_pool
+    if _pg_pool is None:
+        async with _pg_pool_lock:
+            if _pg_pool is None:
+                _pg_pool = await asyncpg.create_pool(_native_dsn(_raw_url), init=_init_native_connection)
+    return _pg_pool
+
+
+async def close_pg_pool() -> None:
+    global _pg_pool
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
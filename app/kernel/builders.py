@@ -7,13 +7,19 @@ Graceful degradation: missing data never raises.
 
 from __future__ import annotations
 
+import asyncio
 import calendar
 from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, TypeVar
 from zoneinfo import ZoneInfo
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.kernel import connector, extractor, features
+from app import metrics, timing
+from app.config import settings
+from app.db import get_pg_pool
+from app.kernel import connector, features, planner, rolling, signal_table, stats
 from app.kernel.models import (
     CardEnvelope,
     Coverage,
@@ -23,11 +29,15 @@ from app.kernel.models import (
     Granularity,
     Signal,
     SignalCoverage,
+    SignalTimeseries,
     TimeRange,
+    TimeseriesEnvelope,
 )
 from app.kernel.goals_config import get_goal, list_goals
 from app.kernel.models import PriorityStatus
+from app.kernel.series import SignalSeries
 from app.kernel.signal_map import get_signal_config, list_signals
+from app.kernel.stats import PeriodStats
 
 
 def _tz(tz_name: str) -> ZoneInfo:
@@ -44,6 +54,16 @@ def _date_range_utc(start: date, end_exclusive: date, tz: ZoneInfo) -> tuple[dat
     return _to_utc(s), _to_utc(e)
 
 
+M = TypeVar("M", bound=BaseModel)
+
+
+def _new(model: type[M], **fields: Any) -> M:
+    """Kernel-built values are trusted: with KERNEL_FAST_RENDER, skip validation (model_construct)."""
+    if settings.kernel_fast_render:
+        return model.model_construct(**fields)
+    return model(**fields)
+
+
 def _build_priority_summary(signals: list[Signal]) -> dict[str, PriorityStatus] | None:
     """Build per-priority status summary from goal-bearing signals."""
     buckets: dict[int, list[Signal]] = {}
@@ -79,7 +99,8 @@ def _build_priority_summary(signals: list[Signal]) -> dict[str, PriorityStatus]
         labels = [s.name for s in sigs]
         msg = f"{', '.join(labels)}: {overall_status}"
 
-        result[f"P{pri}"] = PriorityStatus(
+        result[f"P{pri}"] = _new(
+            PriorityStatus,
             status=overall_status,
             progress=round(avg_progress, 1),
             trend=overall_trend,
@@ -89,6 +110,152 @@ def _build_priority_summary(signals: list[Signal]) -> dict[str, PriorityStatus]
     return result
 
 
+async def _fetch_period_stats(
+    session: AsyncSession,
+    target_start: date,
+    target_end_exclusive: date,
+    baseline_start: date,
+    device_id: str | None,
+    prefetched: SignalSeries | None = None,
+) -> tuple[PeriodStats, PeriodStats]:
+    """Return (target, baseline) stats, aggregating in SQL for long ranges.
+
+    prefetched: rows already read for a covering range (preset planner);
+    sliced instead of querying.
+    """
+    target_days = (target_end_exclusive - target_start).days or 1
+    baseline_days = (target_start - baseline_start).days or 1
+
+    if prefetched is not None:
+        series = prefetched.slice(baseline_start, target_end_exclusive)
+        return _series_stats(series, target_start, target_days, baseline_days)
+
+    latest_snapshot = settings.kernel_intraday_snapshots
+    if _aggregates_in_sql(target_days):
+        with timing.span("fetch"):
+            aggs = await connector.fetch_period_aggregates(
+                session,
+                baseline_start,
+                target_start,
+                target_end_exclusive,
+                device_id,
+                latest_snapshot=latest_snapshot,
+            )
+        return (
+            stats.stats_from_aggregate(aggs.get("target"), target_days),
+            stats.stats_from_aggregate(aggs.get("baseline"), baseline_days),
+        )
+
+    projected = settings.kernel_signal_projection
+    batch_size = settings.kernel_stream_batch_size
+    if batch_size is not None:
+        target_acc = stats.PeriodAccumulator(projected)
+        baseline_acc = stats.PeriodAccumulator(projected)
+        batches = connector.stream_daily_rows(
+            session,
+            baseline_start,
+            target_end_exclusive,
+            device_id,
+            batch_size,
+            projected=projected,
+            latest_snapshot=latest_snapshot,
+        )
+        # fetch and reduction interleave per batch, so they are timed together
+        with timing.span("stream"):
+            async for batch in batches:
+                for row in batch:
+                    (baseline_acc if row["date"] < target_start else target_acc).add(row)
+            return target_acc.stats(target_days), baseline_acc.stats(baseline_days)
+
+    series = await _fetch_series(session, baseline_start, target_end_exclusive, device_id)
+    return _series_stats(series, target_start, target_days, baseline_days)
+
+
+def _aggregates_in_sql(target_days: int) -> bool:
+    min_days = settings.kernel_sql_aggregation_min_days
+    return min_days is not None and target_days >= min_days
+
+
+def _series_stats(
+    series: SignalSeries,
+    target_start: date,
+    target_days: int,
+    baseline_days: int,
+) -> tuple[PeriodStats, PeriodStats]:
+    baseline_series, target_series = series.split_at(target_start)
+    if not len(target_series):
+        return PeriodStats(), PeriodStats()
+    vectorized = settings.kernel_vectorized_features
+    with timing.span("reduce"):
+        return (
+            stats.stats_from_series(target_series, target_days, vectorized),
+            stats.stats_from_series(baseline_series, baseline_days, vectorized),
+        )
+
+
+async def reads_signal_table(session: AsyncSession) -> bool:
+    """True when cards are currently read from the signal table (KERNEL_SIGNAL_TABLE and fresh)."""
+    # The signal table only holds daily rows, so snapshot mode bypasses it
+    return (
+        settings.kernel_signal_table
+        and not settings.kernel_intraday_snapshots
+        and await signal_table.is_fresh(session, settings.kernel_signal_table_max_staleness_seconds)
+    )
+
+
+async def _fetch_series(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None,
+) -> SignalSeries:
+    """All rows in [start, end_exclusive) as one series, in a single query via the configured row source."""
+    latest_snapshot = settings.kernel_intraday_snapshots
+    projected = settings.kernel_signal_projection
+    from_signal_table = await reads_signal_table(session)
+    if from_signal_table:
+        projected = True
+    pool = await get_pg_pool() if settings.kernel_connector_backend == "asyncpg" else None
+    with timing.span("fetch"):
+        rows = await connector.fetch_rows(
+            session,
+            start,
+            end_exclusive,
+            device_id,
+            projected=projected,
+            pool=pool,
+            from_signal_table=from_signal_table,
+            latest_snapshot=latest_snapshot,
+        )
+    with timing.span("extract"):
+        return SignalSeries.from_rows(rows, projected)
+
+
+def _signal_math(
+    names: list[str],
+    target: PeriodStats,
+    baseline: PeriodStats,
+) -> dict[str, tuple[float | None, float | None, str | None, str | None]]:
+    """(delta, progress_pct, status, trend) per signal; goal fields are None without a goal."""
+    goals = [get_goal(name) for name in names]
+    if settings.kernel_vectorized_features:
+        from app.kernel import features_np
+
+        return features_np.card_signal_math(names, target, baseline, goals)
+
+    out: dict[str, tuple[float | None, float | None, str | None, str | None]] = {}
+    for name, goal in zip(names, goals):
+        current_val = target.values.get(name)
+        baseline_val = baseline.means.get(name)
+        progress_pct = status = trend = None
+        if goal:
+            progress_pct = features.goal_progress_pct(current_val, goal.target_value, goal.target_type)
+            status = features.goal_status(progress_pct)
+            trend = features.trend_from_means(target.means.get(name), baseline_val)
+        out[name] = (features.compute_delta(current_val, baseline_val), progress_pct, status, trend)
+    return out
+
+
 async def _build_card(
     session: AsyncSession,
     card_type: str,
@@ -98,6 +265,8 @@ async def _build_card(
     baseline_start: date,
     tz_name: str,
     device_id: str | None = None,
+    prefetched: SignalSeries | None = None,
+    sections: frozenset[str] | None = None,
 ) -> CardEnvelope:
     tz = _tz(tz_name)
     range_start, range_end = _date_range_utc(target_start, target_end_exclusive, tz)
@@ -106,58 +275,51 @@ async def _build_card(
     if range_start > datetime.now(timezone.utc):
         warnings.append("Requested range is entirely in the future.")
 
-    target_rows = await connector.fetch_daily_rows(session, target_start, target_end_exclusive, device_id)
+    target, baseline = await _fetch_period_stats(
+        session, target_start, target_end_exclusive, baseline_start, device_id, prefetched
+    )
+    metrics.observe_card_rows(card_type, target.row_count + baseline.row_count)
 
-    if not target_rows:
+    if not target.row_count:
         warnings.append("No data found in the requested range.")
-        return CardEnvelope(
+        return _new(
+            CardEnvelope,
             card_type=card_type,
             granularity=granularity,
-            time_range=TimeRange(start=range_start, end=range_end, timezone=tz_name),
+            time_range=_new(TimeRange, start=range_start, end=range_end, timezone=tz_name),
             summary="No data available for this period.",
             warnings=warnings,
-            coverage=Coverage(missing_sources=[], partial_days=[]),
+            coverage=_new(Coverage, missing_sources=[], partial_days=[]),
         )
 
-    baseline_rows = await connector.fetch_daily_rows(session, baseline_start, target_start, device_id)
-
-    target_series = extractor.extract_signal_series(target_rows)
-    baseline_series = extractor.extract_signal_series(baseline_rows)
-
     signals: list[Signal] = []
     evidence_sources: list[EvidenceSource] = []
     signal_coverages: list[SignalCoverage] = []
     drilldowns: list[Drilldown] = []
-    total_rows = len(target_rows)
+    total_rows = target.row_count
     target_days = (target_end_exclusive - target_start).days or 1
 
-    for signal_name in list_signals():
-        cfg = get_signal_config(signal_name)
-        if cfg is None:
-            continue
-
-        vals = target_series.get(signal_name, [])
-        bl_vals = baseline_series.get(signal_name, [])
+    want_evidence = sections is None or "evidence" in sections
+    want_coverage = sections is None or "coverage" in sections
+    want_drilldowns = sections is None or "drilldowns" in sections
 
-        current_val = features.aggregate(vals, cfg.agg)
-        baseline_val = features.trailing_average(bl_vals) if bl_vals else None
-        delta = features.compute_delta(current_val, baseline_val)
+    names = [name for name in list_signals() if get_signal_config(name) is not None]
+    with timing.span("features"):
+        signal_math = _signal_math(names, target, baseline)
+    envelope_started = timing.start()
+    for signal_name in names:
+        cfg = get_signal_config(signal_name)
+        current_val = target.values.get(signal_name)
+        baseline_val = baseline.means.get(signal_name)
+        delta, progress_pct, status, trend = signal_math[signal_name]
 
         goal = get_goal(signal_name)
-        progress_pct = None
-        status = None
-        priority = None
-        trend = None
-        target = None
-        if goal:
-            target = goal.target_value
-            progress_pct = features.goal_progress_pct(current_val, goal.target_value, goal.target_type)
-            status = features.goal_status(progress_pct)
-            priority = goal.priority
-            trend = features.compute_trend(vals, bl_vals)
+        priority = goal.priority if goal else None
+        target_value = goal.target_value if goal else None
 
         signals.append(
-            Signal(
+            _new(
+                Signal,
                 name=signal_name.replace("_", " ").title(),
                 record_type=signal_name,
                 value=current_val,
@@ -165,7 +327,7 @@ async def _build_card(
                 aggregation=cfg.agg,
                 baseline=baseline_val,
                 delta=delta,
-                target=target,
+                target=target_value,
                 target_progress_pct=round(progress_pct, 1) if progress_pct is not None else None,
                 priority=priority,
                 status=status,
@@ -173,38 +335,44 @@ async def _build_card(
             )
         )
 
-        days_with_data = len(vals)
-        completeness = features.coverage_ratio(days_with_data, target_days)
-        signal_coverages.append(SignalCoverage(signal_name=signal_name, completeness=completeness))
-
-        earliest_date = min(row["date"] for row in target_rows) if target_rows else None
-        latest_date = max(row["date"] for row in target_rows) if target_rows else None
-        evidence_sources.append(
-            EvidenceSource(
-                record_type=signal_name,
-                row_count=days_with_data,
-                earliest=datetime.combine(earliest_date, time.min, tzinfo=timezone.utc) if earliest_date else None,
-                latest=datetime.combine(latest_date, time.min, tzinfo=timezone.utc) if latest_date else None,
+        days_with_data = target.counts.get(signal_name, 0)
+        if want_coverage:
+            completeness = features.coverage_ratio(days_with_data, target_days)
+            signal_coverages.append(_new(SignalCoverage, signal_name=signal_name, completeness=completeness))
+
+        if want_evidence:
+            earliest_date = target.earliest
+            latest_date = target.latest
+            evidence_sources.append(
+                _new(
+                    EvidenceSource,
+                    record_type=signal_name,
+                    row_count=days_with_data,
+                    earliest=datetime.combine(earliest_date, time.min, tzinfo=timezone.utc) if earliest_date else None,
+                    latest=datetime.combine(latest_date, time.min, tzinfo=timezone.utc) if latest_date else None,
+                )
             )
-        )
 
-        drilldowns.append(
-            Drilldown(
-                label=f"Signal: {signal_name}",
-                type="records",
-                params={"signal": signal_name, "from": target_start.isoformat(), "to": target_end_exclusive.isoformat()},
+        if want_drilldowns:
+            drilldowns.append(
+                _new(
+                    Drilldown,
+                    label=f"Signal: {signal_name}",
+                    type="records",
+                    params={"signal": signal_name, "from": target_start.isoformat(), "to": target_end_exclusive.isoformat()},
+                )
             )
-        )
 
     # Virtual signal: tracking consistency (T1)
     tc_goal = get_goal("tracking_consistency")
     if tc_goal:
-        tc_value = features.tracking_consistency(target_rows, target_days)
-        tc_bl_value = features.tracking_consistency(baseline_rows, (target_start - baseline_start).days or 1) if baseline_rows else 0.0
+        tc_value = target.tracking
+        tc_bl_value = baseline.tracking
         tc_pct = features.goal_progress_pct(tc_value, tc_goal.target_value, tc_goal.target_type)
-        tc_trend = features.compute_trend([tc_value], [tc_bl_value]) if tc_bl_value > 0 else "flat"
+        tc_trend = features.trend_from_means(tc_value, tc_bl_value) if tc_bl_value > 0 else "flat"
         signals.append(
-            Signal(
+            _new(
+                Signal,
                 name="Tracking Consistency",
                 record_type="tracking_consistency",
                 value=round(tc_value, 2),
@@ -218,12 +386,9 @@ async def _build_card(
             )
         )
 
-    dates_present = [row["date"] for row in target_rows]
-    partial_days = features.detect_partial_days(
-        [datetime.combine(d, time.min, tzinfo=timezone.utc) for d in dates_present]
-    )
+    partial_days = target.partial_days
 
-    missing_sources = [s for s in list_signals() if not target_series.get(s)]
+    missing_sources = [s for s in list_signals() if not target.counts.get(s)]
     if missing_sources:
         warnings.append(f"Missing in target range: {', '.join(missing_sources)}")
 
@@ -233,14 +398,16 @@ async def _build_card(
     n_signals = len([s for s in signals if s.value is not None])
     summary = f"{n_signals} signal(s) computed across {total_rows} records."
 
-    return CardEnvelope(
+    card = _new(
+        CardEnvelope,
         card_type=card_type,
         granularity=granularity,
-        time_range=TimeRange(start=range_start, end=range_end, timezone=tz_name),
+        time_range=_new(TimeRange, start=range_start, end=range_end, timezone=tz_name),
         summary=summary,
         signals=signals,
-        evidence=Evidence(sources=evidence_sources, total_rows=total_rows),
-        coverage=Coverage(
+        evidence=_new(Evidence, sources=evidence_sources, total_rows=total_rows),
+        coverage=_new(
+            Coverage,
             signals=signal_coverages,
             missing_sources=missing_sources,
             partial_days=partial_days,
@@ -249,6 +416,67 @@ async def _build_card(
         drilldowns=drilldowns,
         priority_summary=priority_summary,
     )
+    timing.stop("envelope", envelope_started)
+    return card
+
+
+# (target_start, target_end_exclusive, baseline_start) per card
+
+
+def _daily_period(target_date: date) -> tuple[date, date, date]:
+    baseline_start = target_date - timedelta(days=features.baseline_window("daily"))
+    return target_date, target_date + timedelta(days=1), baseline_start
+
+
+def _weekly_period(week_start: date) -> tuple[date, date, date]:
+    weeks = features.baseline_window("weekly")
+    return week_start, week_start + timedelta(days=7), week_start - timedelta(weeks=weeks)
+
+
+def _monthly_period(year: int, month: int) -> tuple[date, date, date]:
+    first_day = date(year, month, 1)
+    _, last = calendar.monthrange(year, month)
+    months = features.baseline_window("monthly")
+    return first_day, first_day + timedelta(days=last), first_day - timedelta(days=months * 30)
+
+
+CARD_GRANULARITY: dict[str, Granularity] = {
+    "daily_summary": Granularity.daily,
+    "weekly_overview": Granularity.weekly,
+    "monthly_overview": Granularity.monthly,
+}
+
+
+def card_periods(card_type: str, start: date, end: date) -> list[tuple[date, date, date]]:
+    """Consecutive periods of card_type whose start falls in [start, end] (end inclusive).
+
+    Daily: every day. Weekly: weeks starting at start. Monthly: every calendar
+    month from start's month through end's month.
+    """
+    periods: list[tuple[date, date, date]] = []
+    if card_type == "daily_summary":
+        periods = [_daily_period(start + timedelta(days=i)) for i in range((end - start).days + 1)]
+    elif card_type == "weekly_overview":
+        periods = [_weekly_period(start + timedelta(weeks=i)) for i in range((end - start).days // 7 + 1)]
+    elif card_type == "monthly_overview":
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            periods.append(_monthly_period(year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+
+def count_periods(card_type: str, start: date, end: date) -> int:
+    """len(card_periods(card_type, start, end)), computed without building the periods."""
+    if card_type == "daily_summary":
+        n = (end - start).days + 1
+    elif card_type == "weekly_overview":
+        n = (end - start).days // 7 + 1
+    elif card_type == "monthly_overview":
+        n = (end.year - start.year) * 12 + end.month - start.month + 1
+    else:
+        n = 0
+    return max(n, 0)
 
 
 async def build_daily_summary(
@@ -256,17 +484,21 @@ async def build_daily_summary(
     target_date: date,
     tz_name: str = "UTC",
     device_id: str | None = None,
+    prefetched: SignalSeries | None = None,
+    sections: frozenset[str] | None = None,
 ) -> CardEnvelope:
-    baseline_start = target_date - timedelta(days=features.baseline_window("daily"))
+    target_start, target_end_exclusive, baseline_start = _daily_period(target_date)
     return await _build_card(
         session,
         card_type="daily_summary",
         granularity=Granularity.daily,
-        target_start=target_date,
-        target_end_exclusive=target_date + timedelta(days=1),
+        target_start=target_start,
+        target_end_exclusive=target_end_exclusive,
         baseline_start=baseline_start,
         tz_name=tz_name,
         device_id=device_id,
+        prefetched=prefetched,
+        sections=sections,
     )
 
 
@@ -275,18 +507,21 @@ async def build_weekly_overview(
     week_start: date,
     tz_name: str = "UTC",
     device_id: str | None = None,
+    prefetched: SignalSeries | None = None,
+    sections: frozenset[str] | None = None,
 ) -> CardEnvelope:
-    weeks = features.baseline_window("weekly")
-    baseline_start = week_start - timedelta(weeks=weeks)
+    target_start, target_end_exclusive, baseline_start = _weekly_period(week_start)
     return await _build_card(
         session,
         card_type="weekly_overview",
         granularity=Granularity.weekly,
-        target_start=week_start,
-        target_end_exclusive=week_start + timedelta(days=7),
+        target_start=target_start,
+        target_end_exclusive=target_end_exclusive,
         baseline_start=baseline_start,
         tz_name=tz_name,
         device_id=device_id,
+        prefetched=prefetched,
+        sections=sections,
     )
 
 
@@ -296,19 +531,174 @@ async def build_monthly_overview(
     month: int,
     tz_name: str = "UTC",
     device_id: str | None = None,
+    prefetched: SignalSeries | None = None,
+    sections: frozenset[str] | None = None,
 ) -> CardEnvelope:
-    first_day = date(year, month, 1)
-    _, last = calendar.monthrange(year, month)
-    end_exclusive = first_day + timedelta(days=last)
-    months = features.baseline_window("monthly")
-    baseline_start = first_day - timedelta(days=months * 30)
+    target_start, target_end_exclusive, baseline_start = _monthly_period(year, month)
     return await _build_card(
         session,
         card_type="monthly_overview",
         granularity=Granularity.monthly,
-        target_start=first_day,
-        target_end_exclusive=end_exclusive,
+        target_start=target_start,
+        target_end_exclusive=target_end_exclusive,
         baseline_start=baseline_start,
         tz_name=tz_name,
         device_id=device_id,
+        prefetched=prefetched,
+        sections=sections,
     )
+
+
+def card_period(card_type: str, start: date) -> tuple[date, date, date]:
+    """(target_start, target_end_exclusive, baseline_start) of the card build_card builds for start."""
+    if card_type == "daily_summary":
+        return _daily_period(start)
+    if card_type == "weekly_overview":
+        return _weekly_period(start)
+    if card_type == "monthly_overview":
+        return _monthly_period(start.year, start.month)
+    raise ValueError(f"Unknown card type: {card_type}")
+
+
+async def build_card(
+    session: AsyncSession | None,
+    card_type: str,
+    start: date,
+    tz_name: str = "UTC",
+    device_id: str | None = None,
+    prefetched: SignalSeries | None = None,
+    sections: frozenset[str] | None = None,
+) -> CardEnvelope:
+    """Dispatch to the card_type builder for the period containing start.
+
+    session may be None when prefetched covers the card's range. sections
+    (top-level CardEnvelope field names, None for all) lets the builder skip
+    evidence sources, per-signal coverage and drilldowns nobody will render.
+    """
+    if card_type == "daily_summary":
+        return await build_daily_summary(session, start, tz_name, device_id, prefetched, sections)
+    if card_type == "weekly_overview":
+        return await build_weekly_overview(session, start, tz_name, device_id, prefetched, sections)
+    if card_type == "monthly_overview":
+        return await build_monthly_overview(session, start.year, start.month, tz_name, device_id, prefetched, sections)
+    raise ValueError(f"Unknown card type: {card_type}")
+
+
+def _plannable(target_start: date, target_end_exclusive: date) -> bool:
+    """Row-path cards can share a fetch; streamed and SQL-aggregated cards query on their own."""
+    target_days = (target_end_exclusive - target_start).days or 1
+    return settings.kernel_stream_batch_size is None and not _aggregates_in_sql(target_days)
+
+
+async def build_preset_cards(
+    session_factory: async_sessionmaker[AsyncSession],
+    card_types: list[str],
+    start: date,
+    tz_name: str = "UTC",
+    device_id: str | None = None,
+    max_concurrency: int = 4,
+    sections: frozenset[str] | None = None,
+) -> list[CardEnvelope]:
+    """Build a preset's cards concurrently, in card_types order.
+
+    Row-path cards are planned first: their [baseline_start, target_end)
+    ranges are merged into minimal covering intervals (planner.merge_needs),
+    each fetched once, and every card is built from a slice. Other cards
+    query on their own. An AsyncSession is not safe for concurrent use, so
+    every fetch opens one from session_factory; the semaphore caps how many
+    hold a connection at once.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    needs: list[planner.FetchNeed | None] = []
+    for card_type in card_types:
+        target_start, target_end, baseline_start = card_period(card_type, start)
+        plannable = _plannable(target_start, target_end)
+        needs.append(planner.FetchNeed(baseline_start, target_end, device_id) if plannable else None)
+    intervals = planner.merge_needs([n for n in needs if n is not None])
+
+    async def _fetch(interval: planner.FetchNeed) -> SignalSeries:
+        async with semaphore:
+            async with session_factory() as session:
+                return await _fetch_series(session, interval.start, interval.end_exclusive, interval.device_id)
+
+    fetched = dict(zip(intervals, await asyncio.gather(*(_fetch(i) for i in intervals))))
+
+    async def _one(card_type: str, need: planner.FetchNeed | None) -> CardEnvelope:
+        if need is not None:
+            series = fetched[planner.covering(intervals, need)]
+            return await build_card(None, card_type, start, tz_name, device_id, series, sections)
+        async with semaphore:
+            async with session_factory() as session:
+                return await build_card(session, card_type, start, tz_name, device_id, sections=sections)
+
+    return list(await asyncio.gather(*(_one(ct, need) for ct, need in zip(card_types, needs))))
+
+
+async def build_timeseries(
+    session: AsyncSession,
+    card_type: str,
+    start: date,
+    end: date,
+    tz_name: str = "UTC",
+    device_id: str | None = None,
+) -> TimeseriesEnvelope:
+    """Every card_type period starting in [start, end], from one fetch.
+
+    Rows for the whole range plus the leading baseline window are read once;
+    baselines come from day buckets built once (rolling.card_stats), so the
+    cost is one query and O(days) bookkeeping plus one sum() per baseline
+    window (with KERNEL_VECTORIZED_FEATURES, one features_np reduction per
+    window, as the cards use). Per-period values, baselines, deltas and goal
+    fields are exactly the cards' (same summation).
+    """
+    tz = _tz(tz_name)
+    periods = card_periods(card_type, start, end)
+    granularity = CARD_GRANULARITY[card_type]
+    range_start, range_end = _date_range_utc(periods[0][0], periods[-1][1], tz)
+    envelope = TimeseriesEnvelope(
+        card_type=card_type,
+        granularity=granularity,
+        time_range=TimeRange(start=range_start, end=range_end, timezone=tz_name),
+        periods=[p[0] for p in periods],
+    )
+
+    series = await _fetch_series(session, min(p[2] for p in periods), periods[-1][1], device_id)
+    if not len(series):
+        envelope.warnings.append("No data found in the requested range.")
+
+    names = [name for name in list_signals() if get_signal_config(name) is not None]
+    out: dict[str, SignalTimeseries] = {}
+    for name in names:
+        cfg = get_signal_config(name)
+        goal = get_goal(name)
+        out[name] = SignalTimeseries(
+            record_type=name,
+            unit=cfg.unit,
+            aggregation=cfg.agg,
+            target=goal.target_value if goal else None,
+            target_progress_pct=[] if goal else None,
+            status=[] if goal else None,
+            trend=[] if goal else None,
+        )
+
+    with timing.span("reduce"):
+        period_stats = rolling.card_stats(series, periods, settings.kernel_vectorized_features)
+    for (target_start, target_end, _), (target, baseline) in zip(periods, period_stats):
+        target_days = (target_end - target_start).days or 1
+        envelope.row_counts.append(target.row_count)
+        envelope.tracking_consistency.append(round(target.tracking, 2))
+        signal_math = _signal_math(names, target, baseline)
+        for name in names:
+            sig = out[name]
+            delta, progress_pct, status, trend = signal_math[name]
+            sig.values.append(target.values.get(name))
+            sig.baselines.append(baseline.means.get(name))
+            sig.deltas.append(delta)
+            sig.completeness.append(features.coverage_ratio(target.counts.get(name, 0), target_days))
+            if sig.status is not None:
+                sig.target_progress_pct.append(round(progress_pct, 1) if progress_pct is not None else None)
+                sig.status.append(status)
+                sig.trend.append(trend)
+
+    envelope.signals = list(out.values())
+    return envelope
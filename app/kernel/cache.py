@@ -0,0 +1,205 @@
+"""In-process card cache — bounded LRU with TTL, validated by data watermark.
+
+Keyed by (card_type, period, tz, device_id, config version). Every lookup
+first asks connector.fetch_watermark for the card's [baseline_start,
+target_end) range; an entry is served only while that watermark is unchanged
+and it is younger than the TTL, so a hit skips the row fetch, extraction and
+feature math. Sized by KERNEL_CARD_CACHE_SIZE (0 disables the cache).
+Misses for closed periods fall through to the persistent card_store
+(KERNEL_CARD_STORE) before building.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Hashable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import timing
+from app.config import settings
+from app.db import async_session
+from app.kernel import builders, card_store, connector, signal_table
+from app.kernel.goals_config import GOALS_BY_SIGNAL
+from app.kernel.models import CardEnvelope
+from app.kernel.signal_map import SIGNAL_CONFIG
+
+
+def _config_version() -> str:
+    """Digest of the signal and goal config, so a config change never serves old cards."""
+    payload = repr((sorted(SIGNAL_CONFIG.items()), sorted(GOALS_BY_SIGNAL.items())))
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+CONFIG_VERSION = _config_version()
+
+
+@dataclass(slots=True)
+class _Entry:
+    card: CardEnvelope
+    watermark: Any
+    stored_at: float
+
+
+class CardCache:
+    """LRU of built cards; entries expire after ttl_seconds or when their watermark moves."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # misses caused by a moved watermark or an expired TTL
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, watermark: Any) -> CardEnvelope | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.watermark != watermark or self._clock() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            self.stale += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.card
+
+    def put(self, key: Hashable, watermark: Any, card: CardEnvelope) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = _Entry(card, watermark, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+
+card_cache = CardCache(settings.kernel_card_cache_size, settings.kernel_card_cache_ttl_seconds)
+
+
+def config_version() -> str:
+    """CONFIG_VERSION plus the settings that change which rows a card reads."""
+    return f"{CONFIG_VERSION}:{'intraday' if settings.kernel_intraday_snapshots else 'daily'}"
+
+
+def card_key(card_type: str, target_start: date, tz_name: str, device_id: str | None) -> tuple:
+    return (card_type, target_start, tz_name, device_id, config_version())
+
+
+async def get_card(
+    session: AsyncSession,
+    card_type: str,
+    start: date,
+    tz_name: str = "UTC",
+    device_id: str | None = None,
+    cache: CardCache | None = None,
+    sections: frozenset[str] | None = None,
+) -> CardEnvelope:
+    """builders.build_card behind the in-process cache and, for closed periods, the card store.
+
+    In-process hit: one watermark query. Store hit: one primary-key read.
+    Otherwise the card is built and written back to both. sections is passed
+    to the builder only when neither is in use: cached and stored cards are
+    always complete.
+    """
+    cache = card_cache if cache is None else cache
+    target_start, target_end_exclusive, baseline_start = builders.card_period(card_type, start)
+    use_store = settings.kernel_card_store and card_store.is_closed(target_end_exclusive, tz_name)
+    if not cache.enabled and not use_store:
+        return await builders.build_card(session, card_type, start, tz_name, device_id, sections=sections)
+
+    async def _watermark() -> tuple[Any, int]:
+        with timing.span("watermark"):
+            received_at, count = await connector.fetch_watermark(
+                session,
+                baseline_start,
+                target_end_exclusive,
+                device_id,
+                latest_snapshot=settings.kernel_intraday_snapshots,
+            )
+            if received_at is not None and await builders.reads_signal_table(session):
+                # A card built from the signal table lacks rows it has not copied yet: key
+                # it by the table's watermark so the next refresh invalidates it.
+                covered = await signal_table.covered_watermark(session)
+                if covered is None or covered < received_at:
+                    received_at = covered
+            return received_at, count
+
+    key = card_key(card_type, target_start, tz_name, device_id)
+    watermark = None
+    if cache.enabled:
+        watermark = await _watermark()
+        card = cache.get(key, watermark)
+        if card is not None:
+            return card
+
+    card = None
+    if use_store:
+        with timing.span("store"):
+            card = await card_store.load(
+                session,
+                card_type,
+                target_start,
+                tz_name,
+                device_id,
+                config_version(),
+                latest_snapshot=settings.kernel_intraday_snapshots,
+            )
+    if card is None:
+        if watermark is None:
+            watermark = await _watermark()
+        card = await builders.build_card(session, card_type, start, tz_name, device_id)
+        if use_store:
+            with timing.span("store"):
+                await card_store.save(
+                    async_session,
+                    card_type,
+                    target_start,
+                    tz_name,
+                    device_id,
+                    config_version(),
+                    baseline_start,
+                    target_end_exclusive,
+                    watermark[0],
+                    card,
+                )
+    if cache.enabled:
+        cache.put(key, watermark, card)
+    return card
@@ -0,0 +1,200 @@
+"""Persistent store of closed-period cards — kernel_card_store.
+
+A card whose target period has fully elapsed only changes when late data
+arrives, so its CardEnvelope is stored as jsonb keyed by (card_type,
+target_start, tz, device, config version) together with the data watermark
+(max received_at over [baseline_start, target_end)) it was built from. A
+lookup is one primary-key read that also checks no row in that range has been
+received since; a late row makes it a miss, and the rebuilt card replaces it.
+
+    python -m app.kernel.card_store create   # DDL (idempotent)
+    python -m app.kernel.card_store clear    # drop every stored card
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+from datetime import date, datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.kernel.connector import _source_type_sql
+from app.kernel.models import CardEnvelope
+
+logger = logging.getLogger(__name__)
+
+TABLE = "kernel_card_store"
+
+# operations ("load", "save") that have already logged a failure in this process
+_warned: set[str] = set()
+
+
+def create_table_sql() -> list[str]:
+    return [
+        (
+            f"CREATE TABLE IF NOT EXISTS {TABLE} (\n"
+            "    card_type varchar NOT NULL,\n"
+            "    target_start date NOT NULL,\n"
+            "    tz varchar NOT NULL,\n"
+            "    device_key varchar NOT NULL,\n"  # '' = all devices
+            "    config_version varchar NOT NULL,\n"
+            "    range_start date NOT NULL,\n"
+            "    range_end date NOT NULL,\n"
+            "    watermark timestamptz,\n"
+            "    payload jsonb NOT NULL,\n"
+            "    stored_at timestamptz NOT NULL DEFAULT now(),\n"
+            "    PRIMARY KEY (card_type, target_start, tz, device_key, config_version)\n"
+            ")"
+        ),
+    ]
+
+
+_KEY_WHERE = (
+    "s.card_type = :card_type AND s.target_start = :target_start AND s.tz = :tz "
+    "AND s.device_key = :device_key AND s.config_version = :config_version"
+)
+
+def _load_sql(latest_snapshot: bool) -> str:
+    """Stored payload, unless a row the card reads was received after it was built.
+
+    Late rows are limited to the source_types cards read (as fetch_watermark),
+    which also lets the partial source_type indexes serve the check.
+    """
+    return (
+        f"SELECT s.payload FROM {TABLE} AS s WHERE {_KEY_WHERE} "
+        "AND NOT EXISTS ("
+        "SELECT 1 FROM health_connect_daily AS d "
+        "WHERE d.date >= s.range_start AND d.date < s.range_end "
+        f"AND d.{_source_type_sql(latest_snapshot)} "
+        "AND (s.device_key = '' OR d.device_id = s.device_key) "
+        "AND d.received_at > COALESCE(s.watermark, '-infinity'::timestamptz)"
+        ")"
+    )
+
+
+# Compiled once, keyed by latest_snapshot (KERNEL_INTRADAY_SNAPSHOTS)
+LOAD_SQL: dict[bool, str] = {latest_snapshot: _load_sql(latest_snapshot) for latest_snapshot in (False, True)}
+
+SAVE_SQL = (
+    f"INSERT INTO {TABLE} (card_type, target_start, tz, device_key, config_version, "
+    "range_start, range_end, watermark, payload) "
+    "VALUES (:card_type, :target_start, :tz, :device_key, :config_version, "
+    ":range_start, :range_end, :watermark, CAST(:payload AS jsonb)) "
+    "ON CONFLICT (card_type, target_start, tz, device_key, config_version) DO UPDATE SET "
+    "range_start = EXCLUDED.range_start, range_end = EXCLUDED.range_end, "
+    "watermark = EXCLUDED.watermark, payload = EXCLUDED.payload, stored_at = now()"
+)
+
+
+def is_closed(target_end_exclusive: date, tz_name: str, now: datetime | None = None) -> bool:
+    """True once the target period has fully elapsed in tz_name."""
+    tz = ZoneInfo(tz_name)
+    today = (now.astimezone(tz) if now is not None else datetime.now(tz)).date()
+    return target_end_exclusive <= today
+
+
+def _key_params(
+    card_type: str,
+    target_start: date,
+    tz_name: str,
+    device_id: str | None,
+    config_version: str,
+) -> dict[str, Any]:
+    return {
+        "card_type": card_type,
+        "target_start": target_start,
+        "tz": tz_name,
+        "device_key": device_id or "",
+        "config_version": config_version,
+    }
+
+
+def _warn_once(operation: str) -> None:
+    """Log the first failure of each operation; later ones would only repeat it per request."""
+    if operation not in _warned:
+        _warned.add(operation)
+        logger.warning(
+            "%s %s failed; treating it as a miss (run python -m app.kernel.card_store create?)",
+            TABLE, operation, exc_info=True,
+        )
+
+
+def _decode(payload: Any) -> CardEnvelope:
+    if isinstance(payload, (str, bytes)):
+        return CardEnvelope.model_validate_json(payload)
+    return CardEnvelope.model_validate(payload)
+
+
+async def load(
+    session: AsyncSession,
+    card_type: str,
+    target_start: date,
+    tz_name: str,
+    device_id: str | None,
+    config_version: str,
+    latest_snapshot: bool = False,
+) -> CardEnvelope | None:
+    """Stored card, or None when absent, invalidated by late data or the table is missing."""
+    params = _key_params(card_type, target_start, tz_name, device_id, config_version)
+    try:
+        result = await session.execute(text(LOAD_SQL[latest_snapshot]), params)
+        row = result.fetchone()
+    except Exception:
+        _warn_once("load")
+        await session.rollback()
+        return None
+    return _decode(row[0]) if row else None
+
+
+async def save(
+    session_factory: async_sessionmaker[AsyncSession],
+    card_type: str,
+    target_start: date,
+    tz_name: str,
+    device_id: str | None,
+    config_version: str,
+    range_start: date,
+    range_end_exclusive: date,
+    watermark: datetime | None,
+    card: CardEnvelope,
+) -> None:
+    """Upsert card on its own (primary) session. Best effort: a failed write never fails the card."""
+    params = _key_params(card_type, target_start, tz_name, device_id, config_version)
+    params.update(
+        range_start=range_start,
+        range_end=range_end_exclusive,
+        watermark=watermark,
+        payload=card.model_dump_json(),
+    )
+    try:
+        async with session_factory() as session:
+            await session.execute(text(SAVE_SQL), params)
+            await session.commit()
+    except Exception:
+        _warn_once("save")
+
+
+async def _main(command: str) -> None:
+    from app.db import async_session
+
+    async with async_session() as session:
+        if command == "create":
+            for stmt in create_table_sql():
+                await session.execute(text(stmt))
+            await session.commit()
+            print(f"{TABLE}: ready")
+        elif command == "clear":
+            await session.execute(text(f"DELETE FROM {TABLE}"))
+            await session.commit()
+            print(f"{TABLE}: cleared")
+        else:
+            raise SystemExit(f"Unknown command: {command} (expected create or clear)")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "create"))
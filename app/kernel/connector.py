@@ -9,11 +9,184 @@ Table: health_connect_daily
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, Sequence
+from typing import Any, AsyncIterator, Sequence
 
+import asyncpg
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.kernel.extractor import NUMERIC_STRING_PATTERN
+from app.kernel.signal_map import SIGNAL_CONFIG
+
+# Column carrying the manual-tracking flag in projected rows
+MANUAL_TRACKED_COLUMN = "manual_tracked"
+
+
+def jsonb_path_sql(column: str, path: str) -> str:
+    """Compile a dot-path into a JSONB accessor, e.g. raw_data->'body_metrics'->'weight_kg'.
+
+    Numeric parts become array indexes (sleep_sessions.0 -> ->0). The result is
+    a jsonb expression; callers decide how to unwrap it.
+    """
+    expr = column
+    for part in path.split("."):
+        if part.isdigit():
+            expr += f"->{int(part)}"
+        else:
+            expr += "->'" + part.replace("'", "''") + "'"
+    return expr
+
+
+def jsonb_number_sql(column: str, path: str) -> str:
+    """Compile a dot-path into a float8 expression, with extractor._to_float's semantics.
+
+    JSON numbers and numeric strings ("1200") are cast; anything else yields NULL.
+    """
+    node = jsonb_path_sql(column, path)
+    return (
+        f"CASE WHEN jsonb_typeof({node}) = 'number' THEN ({node})::float8 "
+        f"WHEN jsonb_typeof({node}) = 'string' AND ({node} #>> '{{}}') ~* '{NUMERIC_STRING_PATTERN}' "
+        f"THEN ({node} #>> '{{}}')::float8 END"
+    )
+
+
+def _present_sql(node: str) -> str:
+    return f"COALESCE(jsonb_typeof({node}), 'null') <> 'null'"
+
+
+def manual_tracked_sql(
+    tracked_fields: tuple[str, ...] = ("calories_total", "weight_kg"),
+) -> str:
+    """SQL equivalent of features.tracking_consistency's per-row check."""
+    checks: list[str] = []
+    for field in tracked_fields:
+        for path in (field, f"nutrition_summary.{field}", f"body_metrics.{field}"):
+            checks.append(_present_sql(jsonb_path_sql("raw_data", path)))
+    return "(" + " OR ".join(checks) + ")"
+
+
+def _signal_projection_sql() -> str:
+    cols = [
+        f'{jsonb_number_sql(cfg.column, cfg.path)} AS "{name}"'
+        for name, cfg in SIGNAL_CONFIG.items()
+    ]
+    cols.append(f"{manual_tracked_sql()} AS {MANUAL_TRACKED_COLUMN}")
+    return ", ".join(cols)
+
+
+# Compiled once: one float8 column per SIGNAL_CONFIG entry + manual_tracked
+SIGNAL_PROJECTION_SQL = _signal_projection_sql()
+
+# Pre-extracted copy of the projection, one row per (device_id, date); see signal_table
+SIGNAL_TABLE = "health_connect_signals_daily"
+SIGNAL_TABLE_COLUMNS = ", ".join(
+    [*(f'"{name}"' for name in SIGNAL_CONFIG), MANUAL_TRACKED_COLUMN]
+)
+
+
+# SignalConfig.agg -> SQL aggregate over a projected signal column ({col}).
+# "last" is the latest non-null value by date; unknown methods fall back to AVG
+# like features.aggregate.
+_SQL_AGGREGATES: dict[str, str] = {
+    "sum": "SUM({col})",
+    "avg": "AVG({col})",
+    "max": "MAX({col})",
+    "min": "MIN({col})",
+    "last": "(array_agg({col} ORDER BY date DESC) FILTER (WHERE {col} IS NOT NULL))[1]",
+}
+
+
+def sql_aggregate(agg: str, col: str) -> str:
+    return _SQL_AGGREGATES.get(agg, _SQL_AGGREGATES["avg"]).format(col=col)
+
+
+def _period_aggregate_sql() -> str:
+    cols = [
+        "count(*) AS row_count",
+        "min(date) AS earliest",
+        "max(date) AS latest",
+        f"count(*) FILTER (WHERE {MANUAL_TRACKED_COLUMN}) AS tracked_days",
+    ]
+    for name, cfg in SIGNAL_CONFIG.items():
+        col = f'"{name}"'
+        cols.append(f'{sql_aggregate(cfg.agg, col)} AS "{name}__value"')
+        cols.append(f'AVG({col}) AS "{name}__mean"')
+        cols.append(f'count({col}) AS "{name}__n"')
+    return ", ".join(cols)
+
+
+# Compiled once: per-period reductions over the projected signal columns
+PERIOD_AGGREGATE_SQL = _period_aggregate_sql()
+
+
+def _source_type_sql(latest_snapshot: bool) -> str:
+    """Rows a card reads: daily rows only, or daily plus intraday snapshots."""
+    return "source_type IN ('daily', 'intraday')" if latest_snapshot else "source_type = 'daily'"
+
+
+def _daily_query(
+    select_list: str,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None,
+    table: str = "health_connect_daily",
+    latest_snapshot: bool = False,
+) -> tuple[str, dict[str, Any]]:
+    """SELECT select_list over [start, end_exclusive), ordered by date.
+
+    latest_snapshot: one row per (device_id, date) — the daily row if present,
+    otherwise the latest intraday snapshot by collected_at (DISTINCT ON).
+    """
+    query = (
+        f"SELECT {'DISTINCT ON (device_id, date) ' if latest_snapshot else ''}{select_list} "
+        f"FROM {table} "
+        "WHERE date >= :start AND date < :end"
+    )
+    if latest_snapshot or table == "health_connect_daily":
+        query += f" AND {_source_type_sql(latest_snapshot)}"
+    params: dict[str, Any] = {"start": start, "end": end_exclusive}
+
+    if device_id is not None:
+        query += " AND device_id = :device_id"
+        params["device_id"] = device_id
+
+    if latest_snapshot:
+        query += " ORDER BY device_id, date, (source_type = 'daily') DESC, collected_at DESC"
+        return f"SELECT * FROM ({query}) AS latest ORDER BY date", params
+
+    query += " ORDER BY date"
+    return query, params
+
+
+def _native_daily_query(select_list: str, by_device: bool) -> str:
+    """_daily_query with asyncpg positional parameters ($1 start, $2 end, $3 device_id)."""
+    query = (
+        f"SELECT {select_list} "
+        "FROM health_connect_daily "
+        "WHERE date >= $1 AND date < $2 "
+        "AND source_type = 'daily'"
+    )
+    if by_device:
+        query += " AND device_id = $3"
+    return query + " ORDER BY date"
+
+
+# Compiled once, keyed by (projected, by_device)
+_NATIVE_QUERIES: dict[tuple[bool, bool], str] = {
+    (projected, by_device): _native_daily_query(
+        f"device_id, date, {SIGNAL_PROJECTION_SQL}" if projected else "device_id, date, raw_data",
+        by_device,
+    )
+    for projected in (False, True)
+    for by_device in (False, True)
+}
+
+
+async def _fetch(session: AsyncSession, query: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+    result = await session.execute(text(query), params)
+    columns = result.keys()
+    return [dict(zip(columns, row)) for row in result.fetchall()]
+
 
 async def fetch_daily_rows(
     session: AsyncSession,
@@ -28,20 +201,210 @@ async def fetch_daily_rows(
 
     Returns an empty list when nothing is found — never raises.
     """
+    query, params = _daily_query("device_id, date, raw_data", start, end_exclusive, device_id)
+    return await _fetch(session, query, params)
+
+
+async def fetch_latest_snapshot_rows(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+    projected: bool = False,
+) -> Sequence[dict[str, Any]]:
+    """Exactly one row per (device_id, date) for [start, end_exclusive).
+
+    The daily row wins; days without one (typically today) fall back to the
+    latest intraday snapshot. Selected in SQL, so other snapshots never leave
+    the DB. Columns as fetch_daily_rows, or fetch_projected_rows if projected.
+    """
+    select_list = f"device_id, date, {SIGNAL_PROJECTION_SQL}" if projected else "device_id, date, raw_data"
+    query, params = _daily_query(select_list, start, end_exclusive, device_id, latest_snapshot=True)
+    return await _fetch(session, query, params)
+
+
+async def fetch_signal_rows(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+) -> Sequence[dict[str, Any]]:
+    """Like fetch_projected_rows, but reads the pre-extracted signal table.
+
+    No JSON is touched: a narrow range scan over typed columns.
+    """
+    query, params = _daily_query(
+        f"device_id, date, {SIGNAL_TABLE_COLUMNS}", start, end_exclusive, device_id, table=SIGNAL_TABLE
+    )
+    return await _fetch(session, query, params)
+
+
+async def stream_daily_rows(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+    batch_size: int = 500,
+    projected: bool = False,
+    latest_snapshot: bool = False,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield rows for [start, end_exclusive) in date order, batch_size at a time.
+
+    Uses a server-side cursor (AsyncSession.stream + yield_per), so at most one
+    batch is materialised. Same columns as fetch_daily_rows, or as
+    fetch_projected_rows with projected=True.
+    """
+    select_list = f"device_id, date, {SIGNAL_PROJECTION_SQL}" if projected else "device_id, date, raw_data"
+    query, params = _daily_query(select_list, start, end_exclusive, device_id, latest_snapshot=latest_snapshot)
+    result = await session.stream(
+        text(query), params, execution_options={"yield_per": batch_size}
+    )
+    columns = list(result.keys())
+    async for partition in result.partitions(batch_size):
+        yield [dict(zip(columns, row)) for row in partition]
+
+
+async def fetch_projected_rows(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+) -> Sequence[dict[str, Any]]:
+    """Like fetch_daily_rows, but Postgres extracts the signals.
+
+    Columns: device_id, date, one float8 per SIGNAL_CONFIG entry (NULL when
+    missing or non-numeric) and manual_tracked. raw_data never leaves the DB.
+    """
+    query, params = _daily_query(
+        f"device_id, date, {SIGNAL_PROJECTION_SQL}", start, end_exclusive, device_id
+    )
+    return await _fetch(session, query, params)
+
+
+async def fetch_period_aggregates(
+    session: AsyncSession,
+    baseline_start: date,
+    target_start: date,
+    target_end_exclusive: date,
+    device_id: str | None = None,
+    latest_snapshot: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """Aggregate baseline and target periods inside Postgres in one query.
+
+    Returns {"baseline": {...}, "target": {...}}; a period with no rows is absent.
+    Each period carries row_count, earliest, latest, tracked_days and, per
+    signal, "<name>__value" (SignalConfig.agg), "<name>__mean" and "<name>__n"
+    (non-null count). The target period also carries partial_days, matching
+    features.detect_partial_days. Result size is independent of range length.
+    """
+    src, params = _daily_query(
+        f"device_id, date, {SIGNAL_PROJECTION_SQL}, "
+        "CASE WHEN date < :target_start THEN 'baseline' ELSE 'target' END AS period",
+        baseline_start,
+        target_end_exclusive,
+        device_id,
+        latest_snapshot=latest_snapshot,
+    )
+    params["target_start"] = target_start
+    query = (
+        f"WITH src AS ({src}), "
+        "days AS (SELECT date, count(*) AS n FROM src WHERE period = 'target' GROUP BY date), "
+        "med AS (SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY n) AS m FROM days) "
+        f"SELECT period, {PERIOD_AGGREGATE_SQL}, "
+        "CASE WHEN period = 'target' THEN ("
+        "SELECT array_agg(to_char(days.date, 'YYYY-MM-DD') ORDER BY days.date) "
+        "FROM days, med WHERE med.m > 1 AND days.n < med.m"
+        ") END AS partial_days "
+        "FROM src GROUP BY period"
+    )
+    rows = await _fetch(session, query, params)
+    return {row["period"]: row for row in rows}
+
+
+async def fetch_watermark(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+    latest_snapshot: bool = False,
+) -> tuple[Any, int]:
+    """(max(received_at), row count) over [start, end_exclusive) — changes whenever rows do.
+
+    Covers the same source_types as the card reads (_daily_query), so intraday
+    snapshots only move it when latest_snapshot is on. raw_data is never read.
+    """
     query = (
-        "SELECT device_id, date, raw_data "
+        "SELECT max(received_at) AS watermark, count(*) AS row_count "
         "FROM health_connect_daily "
-        "WHERE date >= :start AND date < :end "
-        "AND source_type = 'daily'"
+        f"WHERE date >= :start AND date < :end AND {_source_type_sql(latest_snapshot)}"
     )
     params: dict[str, Any] = {"start": start, "end": end_exclusive}
-
     if device_id is not None:
         query += " AND device_id = :device_id"
         params["device_id"] = device_id
+    rows = await _fetch(session, query, params)
+    if not rows:
+        return None, 0
+    return rows[0]["watermark"], rows[0]["row_count"]
 
-    query += " ORDER BY date"
 
-    result = await session.execute(text(query), params)
-    columns = result.keys()
-    return [dict(zip(columns, row)) for row in result.fetchall()]
+async def fetch_active_devices(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+) -> list[str]:
+    """Distinct device_ids with rows dated in [start, end_exclusive)."""
+    rows = await _fetch(
+        session,
+        "SELECT DISTINCT device_id FROM health_connect_daily "
+        "WHERE date >= :start AND date < :end ORDER BY device_id",
+        {"start": start, "end": end_exclusive},
+    )
+    return [row["device_id"] for row in rows if row["device_id"] is not None]
+
+
+async def fetch_daily_records(
+    pool: asyncpg.Pool,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+    projected: bool = False,
+) -> Sequence[asyncpg.Record]:
+    """fetch_daily_rows / fetch_projected_rows straight through asyncpg.
+
+    Query text is fixed per (projected, device filter), so asyncpg's
+    per-connection statement cache prepares it once per pooled connection.
+    Records are returned as-is: they support row["date"], row.get() and `in`,
+    which is all the extractor and stats layers use.
+    """
+    query = _NATIVE_QUERIES[(projected, device_id is not None)]
+    args = (start, end_exclusive) if device_id is None else (start, end_exclusive, device_id)
+    async with pool.acquire() as conn:
+        return await conn.fetch(query, *args)
+
+
+async def fetch_rows(
+    session: AsyncSession,
+    start: date,
+    end_exclusive: date,
+    device_id: str | None = None,
+    projected: bool = False,
+    pool: asyncpg.Pool | None = None,
+    from_signal_table: bool = False,
+    latest_snapshot: bool = False,
+) -> Sequence[dict[str, Any]]:
+    """Rows for [start, end_exclusive) in one query, from the configured row source.
+
+    With projected=True rows come from fetch_projected_rows. With a pool the
+    native asyncpg path (fetch_daily_records) is used instead of the session.
+    from_signal_table reads fetch_signal_rows (projected shape) and wins over both.
+    latest_snapshot reads fetch_latest_snapshot_rows through the session.
+    """
+    if from_signal_table:
+        return await fetch_signal_rows(session, start, end_exclusive, device_id)
+    if latest_snapshot:
+        return await fetch_latest_snapshot_rows(session, start, end_exclusive, device_id, projected)
+    if pool is not None:
+        return await fetch_daily_records(pool, start, end_exclusive, device_id, projected)
+    fetch = fetch_projected_rows if projected else fetch_daily_rows
+    return await fetch(session, start, end_exclusive, device_id)
@@ -2,76 +2,227 @@
 
 from __future__ import annotations
 
+import re
 from datetime import date
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
-from app.kernel.signal_map import SignalConfig, get_signal_config, list_signals
+from app.kernel.signal_map import SIGNAL_CONFIG, SignalConfig
 
+# One compiled path step: the dict key, and the list index when the key parses as an int
+PathStep = tuple[str, int | None]
+Accessor = Callable[[dict[str, Any]], float | None]
 
-def _resolve_path(data: Any, path: str) -> Any:
-    """Resolve dot-path like 'weight_kg' or '0.duration_minutes' in dicts/lists."""
-    current = data
+
+def compile_path(path: str) -> tuple[PathStep, ...]:
+    """Split a dot-path once into (key, index) steps for _walk_steps."""
+    steps: list[PathStep] = []
     for part in path.split("."):
+        try:
+            index: int | None = int(part)
+        except ValueError:
+            index = None
+        steps.append((part, index))
+    return tuple(steps)
+
+
+def _walk_steps(data: Any, steps: tuple[PathStep, ...]) -> Any:
+    current = data
+    for key, index in steps:
         if isinstance(current, dict):
-            current = current.get(part)
+            current = current.get(key)
         elif isinstance(current, (list, tuple)):
+            if index is None:
+                return None
             try:
-                current = current[int(part)]
-            except (ValueError, IndexError):
+                current = current[index]
+            except IndexError:
                 return None
         else:
             return None
     return current
 
 
+# Numeric JSON strings, in a syntax both float() and Postgres' float8 accept
+# (case-insensitive); connector.jsonb_number_sql applies the same pattern.
+NUMERIC_STRING_PATTERN = r"^\s*([+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?|[+-]?inf(inity)?|nan)\s*$"
+_NUMERIC_STRING = re.compile(NUMERIC_STRING_PATTERN, re.IGNORECASE | re.ASCII)
+
+
 def _to_float(raw: Any) -> float | None:
     if raw is None:
         return None
     if isinstance(raw, (int, float)) and not isinstance(raw, bool):
         return float(raw)
-    if isinstance(raw, str):
-        try:
-            return float(raw)
-        except ValueError:
-            return None
+    if isinstance(raw, str) and _NUMERIC_STRING.match(raw):
+        return float(raw)
     return None
 
 
+@lru_cache(maxsize=None)
+def compile_accessor(config: SignalConfig) -> Accessor:
+    """Row -> float | None for one signal, with its path pre-split."""
+    column = config.column
+    if config.path is None:
+        return lambda row: _to_float(row.get(column))
+
+    steps = compile_path(config.path)
+
+    def accessor(row: dict[str, Any]) -> float | None:
+        col_val = row.get(column)
+        if col_val is None or not isinstance(col_val, (dict, list, tuple)):
+            return None
+        return _to_float(_walk_steps(col_val, steps))
+
+    return accessor
+
+
+# Compiled at import: (signal name, accessor) in SIGNAL_CONFIG order
+SIGNAL_ACCESSORS: tuple[tuple[str, Accessor], ...] = tuple(
+    (name, compile_accessor(cfg)) for name, cfg in SIGNAL_CONFIG.items()
+)
+
+
+class _TrieNode:
+    """One raw_data position shared by every signal path that passes through it."""
+
+    __slots__ = ("children", "indexed", "signals", "tracked")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}  # by dict key
+        self.indexed: list[tuple[str, int]] = []  # (key, index) of children whose key is also a list index
+        self.signals: list[str] = []  # signals whose path ends here
+        self.tracked = False  # a non-None value here marks the row manually tracked
+
+    def child(self, key: str, index: int | None) -> _TrieNode:
+        node = self.children.get(key)
+        if node is None:
+            node = self.children[key] = _TrieNode()
+            if index is not None:
+                self.indexed.append((key, index))
+        return node
+
+
+def _manual_tracked_paths(
+    tracked_fields: tuple[str, ...] = ("calories_total", "weight_kg"),
+) -> list[str]:
+    """Dot-paths checked by features.is_manually_tracked (same as connector.manual_tracked_sql)."""
+    return [
+        path
+        for field in tracked_fields
+        for path in (field, f"nutrition_summary.{field}", f"body_metrics.{field}")
+    ]
+
+
+def compile_trie(
+    configs: dict[str, SignalConfig],
+    tracked_paths: list[str],
+) -> _TrieNode:
+    """Merge every (column, path) into one trie rooted at the row."""
+    root = _TrieNode()
+    for name, cfg in configs.items():
+        node = root.child(cfg.column, None)
+        for key, index in compile_path(cfg.path) if cfg.path is not None else ():
+            node = node.child(key, index)
+        node.signals.append(name)
+    for path in tracked_paths:
+        node = root.child("raw_data", None)
+        for key, index in compile_path(path):
+            node = node.child(key, index)
+        node.tracked = True
+    return root
+
+
+def _walk(node: _TrieNode, value: Any, out: dict[str, float]) -> bool:
+    """Collect the signals of node's children, and below, from value (the data at node).
+
+    Each node is read once, so shared prefixes such as heart_rate_summary are
+    descended once per row. Returns True when a tracked node holds a value.
+    """
+    if isinstance(value, (list, tuple)):
+        n = len(value)
+        value = {key: value[index] for key, index in node.indexed if -n <= index < n}
+    elif not isinstance(value, dict):
+        return False
+    tracked = False
+    for key, child in node.children.items():
+        sub = value.get(key)
+        if sub is None:
+            continue
+        if child.tracked:
+            tracked = True
+        if child.signals:
+            f = float(sub) if type(sub) is float or type(sub) is int else _to_float(sub)
+            if f is not None:
+                for name in child.signals:
+                    out[name] = f
+        if child.children and _walk(child, sub, out):
+            tracked = True
+    return tracked
+
+
+def _extract(root: _TrieNode, row: Any) -> tuple[dict[str, float], bool]:
+    """(values, tracked) for one row: a dict or an asyncpg Record."""
+    if not isinstance(row, dict):
+        row = {column: row.get(column) for column in root.children}
+    out: dict[str, float] = {}
+    tracked = _walk(root, row, out)
+    return out, tracked
+
+
+SIGNAL_TRIE = compile_trie(SIGNAL_CONFIG, _manual_tracked_paths())
+
+
+def extract_row(row: dict[str, Any]) -> tuple[dict[str, float], bool]:
+    """All signal values and the manual-tracking flag in one pass over raw_data.
+
+    Same values as extract_signals_from_row and same flag as
+    features.is_manually_tracked, but each raw_data node is visited once.
+    """
+    out, tracked = _extract(SIGNAL_TRIE, row)
+    if "manual_tracked" in row:
+        tracked = bool(row["manual_tracked"])
+    return out, tracked
+
+
+# compile_accessor by config identity: hashing a frozen SignalConfig on every
+# call costs about as much as walking its path. Entries keep their config alive.
+_ACCESSORS_BY_ID: dict[int, tuple[SignalConfig, Accessor]] = {}
+
+
 def extract_signal(row: dict[str, Any], config: SignalConfig) -> float | None:
     """Extract a single signal value from a health_connect_daily row."""
+    entry = _ACCESSORS_BY_ID.get(id(config))
+    if entry is None or entry[0] is not config:
+        entry = _ACCESSORS_BY_ID[id(config)] = (config, compile_accessor(config))
     try:
-        col_val = row.get(config.column)
-        if config.path is None:
-            raw = col_val
-        else:
-            if col_val is None or not isinstance(col_val, (dict, list)):
-                return None
-            raw = _resolve_path(col_val, config.path)
-        return _to_float(raw)
+        return entry[1](row)
     except Exception:
         return None
 
 
 def extract_signals_from_row(row: dict[str, Any]) -> dict[str, float]:
     """Extract all configured signals from one row. Skips missing values."""
-    out: dict[str, float] = {}
-    for name in list_signals():
-        cfg = get_signal_config(name)
-        if cfg is None:
-            continue
-        val = extract_signal(row, cfg)
-        if val is not None:
-            out[name] = val
-    return out
+    return extract_row(row)[0]
 
 
 def extract_signal_series(
     rows: list[dict[str, Any]],
 ) -> dict[str, list[float]]:
     """Extract per-signal value lists from rows. Rows ordered by date."""
-    series: dict[str, list[float]] = {name: [] for name in list_signals()}
+    series: dict[str, list[float]] = {name: [] for name in SIGNAL_CONFIG}
     for row in rows:
         vals = extract_signals_from_row(row)
         for name, v in vals.items():
             series[name].append(v)
     return series
+
+
+def extract_projected_signals(row: dict[str, Any]) -> dict[str, float]:
+    """extract_signals_from_row for a projected row. Skips missing values."""
+    out: dict[str, float] = {}
+    for name in SIGNAL_CONFIG:
+        val = _to_float(row.get(name))
+        if val is not None:
+            out[name] = val
+    return out
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Sequence
 
 
-def trailing_average(values: list[float], window: int | None = None) -> float | None:
+def trailing_average(values: Sequence[float], window: int | None = None) -> float | None:
     """Average of `values` (or last `window` items). Returns None if empty."""
     if not values:
         return None
@@ -15,8 +16,8 @@ def trailing_average(values: list[float], window: int | None = None) -> float |
     return sum(subset) / len(subset)
 
 
-def aggregate(values: list[float], method: str) -> float | None:
-    """Aggregate a list of floats by method. Returns None if empty."""
+def aggregate(values: Sequence[float], method: str) -> float | None:
+    """Aggregate a sequence of floats (list or array('d')) by method. Returns None if empty."""
     if not values:
         return None
     if method == "sum":
@@ -74,6 +75,11 @@ def detect_partial_days(
         day_key = ts.strftime("%Y-%m-%d")
         day_counts[day_key] = day_counts.get(day_key, 0) + 1
 
+    return partial_days_from_counts(day_counts)
+
+
+def partial_days_from_counts(day_counts: dict[str, int]) -> list[str]:
+    """detect_partial_days on precomputed {ISO-date: record count}."""
     if not day_counts:
         return []
 
@@ -146,6 +152,17 @@ def compute_trend(
         return "flat"
     recent_avg = sum(recent_values) / len(recent_values)
     prior_avg = sum(prior_values) / len(prior_values)
+    return trend_from_means(recent_avg, prior_avg, threshold)
+
+
+def trend_from_means(
+    recent_avg: float | None,
+    prior_avg: float | None,
+    threshold: float = 0.05,
+) -> str:
+    """compute_trend on precomputed window averages. None yields "flat"."""
+    if recent_avg is None or prior_avg is None:
+        return "flat"
     if prior_avg == 0.0:
         return "up" if recent_avg > 0 else "flat"
     ratio = recent_avg / prior_avg
@@ -165,25 +182,30 @@ def tracking_consistency(
 
     A day counts as "tracked" if raw_data contains at least one of the
     tracked_fields with a non-None value. Steps are auto-collected so
-    excluded from tracking.
+    excluded from tracking. Projected rows (see connector.fetch_projected_rows)
+    carry a precomputed "manual_tracked" flag, which is used as-is.
     """
     if expected_days <= 0:
         return 0.0
-    tracked = 0
-    for row in rows:
-        raw = row.get("raw_data") or {}
-        for field in tracked_fields:
-            # Top-level fields
-            if field in raw and raw[field] is not None:
-                tracked += 1
-                break
-            # Check nested: nutrition_summary.calories_total, body_metrics.weight_kg
-            for section in ("nutrition_summary", "body_metrics"):
-                nested = raw.get(section)
-                if isinstance(nested, dict) and field in nested and nested[field] is not None:
-                    tracked += 1
-                    break
-            else:
-                continue
-            break
+    tracked = sum(1 for row in rows if is_manually_tracked(row, tracked_fields))
     return min(tracked / expected_days, 1.0)
+
+
+def is_manually_tracked(
+    row: dict,
+    tracked_fields: tuple[str, ...] = ("calories_total", "weight_kg"),
+) -> bool:
+    """Per-row check behind tracking_consistency."""
+    if "manual_tracked" in row:
+        return bool(row["manual_tracked"])
+    raw = row.get("raw_data") or {}
+    for field in tracked_fields:
+        # Top-level fields
+        if field in raw and raw[field] is not None:
+            return True
+        # Check nested: nutrition_summary.calories_total, body_metrics.weight_kg
+        for section in ("nutrition_summary", "body_metrics"):
+            nested = raw.get(section)
+            if isinstance(nested, dict) and field in nested and nested[field] is not None:
+                return True
+    return False
@@ -0,0 +1,189 @@
+"""Vectorised feature kernels — features.py across all signals at once.
+
+Inputs are signals x rows float64 matrices with a boolean validity mask (see
+SignalSeries); per-signal results are 1-D arrays where NaN stands for None.
+features.py stays the reference implementation; results agree with it up to
+float rounding (numpy sums pairwise, Python 3.12's sum() is compensated).
+
+Requires numpy (pip install -e ".[vectorized]"); only imported when
+KERNEL_VECTORIZED_FEATURES is on.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from app.kernel.goals_config import GoalDefinition
+from app.kernel.series import SignalSeries
+from app.kernel.stats import PeriodStats
+
+
+def matrix(series: SignalSeries, names: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """(values, mask), each len(names) x len(series), straight from the array('d') columns."""
+    n = len(series)
+    values = np.empty((len(names), n), dtype=np.float64)
+    mask = np.empty((len(names), n), dtype=bool)
+    for i, name in enumerate(names):
+        values[i] = np.frombuffer(series.columns[name], dtype=np.float64, count=n)
+        mask[i] = np.frombuffer(series.present[name], dtype=np.uint8, count=n)
+    return values, mask
+
+
+def _masked_sum(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    return np.where(mask, values, 0.0).sum(axis=1)
+
+
+def counts(mask: np.ndarray) -> np.ndarray:
+    return mask.sum(axis=1)
+
+
+def trailing_average(values: np.ndarray, mask: np.ndarray, window: int | None = None) -> np.ndarray:
+    """Mean of each signal's valid values (or its last `window` valid values)."""
+    if window:
+        # rank 1 = latest valid value of the row
+        rank = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+        mask = mask & (rank <= window)
+    n = counts(mask)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, _masked_sum(values, mask) / n, np.nan)
+
+
+def last(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Latest valid value per signal."""
+    if values.shape[1] == 0:
+        return np.full(values.shape[0], np.nan)
+    idx = values.shape[1] - 1 - np.argmax(mask[:, ::-1], axis=1)
+    picked = values[np.arange(values.shape[0]), idx]
+    return np.where(mask.any(axis=1), picked, np.nan)
+
+
+def aggregate(values: np.ndarray, mask: np.ndarray, methods: Sequence[str]) -> np.ndarray:
+    """features.aggregate per signal, methods[i] applying to row i."""
+    n = counts(mask)
+    empty = n == 0
+    total = _masked_sum(values, mask)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / n
+    if values.shape[1]:
+        vmax = np.where(mask, values, -np.inf).max(axis=1)
+        vmin = np.where(mask, values, np.inf).min(axis=1)
+    else:
+        vmax = vmin = np.full(values.shape[0], np.nan)
+    by_method = {"sum": total, "max": vmax, "min": vmin, "last": last(values, mask)}
+    out = np.array([by_method.get(m, mean)[i] for i, m in enumerate(methods)], dtype=np.float64)
+    out[empty] = np.nan
+    return out
+
+
+def compute_delta(current: np.ndarray, baseline: np.ndarray) -> np.ndarray:
+    return current - baseline
+
+
+def compute_delta_pct(current: np.ndarray, baseline: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = ((current - baseline) / np.abs(baseline)) * 100.0
+    return np.where(baseline == 0.0, np.nan, pct)
+
+
+def goal_progress_pct(
+    values: np.ndarray,
+    targets: np.ndarray,
+    target_types: Sequence[str | None],
+) -> np.ndarray:
+    """features.goal_progress_pct per signal; NaN target means no goal."""
+    types = np.array([t or "" for t in target_types])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        minimum = np.minimum(100.0, (values / targets) * 100.0)
+        maximum = np.where(values <= targets, 100.0, np.minimum(100.0, (targets / values) * 100.0))
+        deviation = np.abs(values - targets) / np.abs(targets)
+        exact = np.maximum(0.0, np.minimum(100.0, (1.0 - deviation) * 100.0))
+    out = np.select(
+        [types == "minimum", types == "maximum", types == "exact"],
+        [minimum, maximum, exact],
+        default=np.nan,
+    )
+    return np.where(np.isnan(values) | (targets == 0.0), np.nan, out)
+
+
+def goal_status(progress_pct: np.ndarray) -> np.ndarray:
+    return np.select(
+        [progress_pct >= 100.0, progress_pct >= 50.0],
+        ["green", "yellow"],
+        default="red",
+    )
+
+
+def trend_from_means(recent: np.ndarray, prior: np.ndarray, threshold: float = 0.05) -> np.ndarray:
+    """features.trend_from_means per signal; NaN on either side yields "flat"."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = recent / prior
+    zero_prior = np.where(recent > 0, "up", "flat")
+    by_ratio = np.select(
+        [ratio >= 1.0 + threshold, ratio <= 1.0 - threshold],
+        ["up", "down"],
+        default="flat",
+    )
+    out = np.where(prior == 0.0, zero_prior, by_ratio)
+    return np.where(np.isnan(recent) | np.isnan(prior), "flat", out)
+
+
+def compute_trend(
+    recent_values: np.ndarray,
+    recent_mask: np.ndarray,
+    prior_values: np.ndarray,
+    prior_mask: np.ndarray,
+    threshold: float = 0.05,
+) -> np.ndarray:
+    return trend_from_means(
+        trailing_average(recent_values, recent_mask),
+        trailing_average(prior_values, prior_mask),
+        threshold,
+    )
+
+
+def to_optional(values: np.ndarray) -> list[float | None]:
+    """NaN -> None, numpy scalars -> Python floats."""
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def _column(stats: dict[str, float | None], names: Sequence[str]) -> np.ndarray:
+    return np.array([np.nan if stats.get(n) is None else stats[n] for n in names], dtype=np.float64)
+
+
+def card_signal_math(
+    names: Sequence[str],
+    target: PeriodStats,
+    baseline: PeriodStats,
+    goals: Sequence[GoalDefinition | None],
+) -> dict[str, tuple[float | None, float | None, str | None, str | None]]:
+    """(delta, progress_pct, status, trend) per signal for one card, in one pass of array ops."""
+    current = _column(target.values, names)
+    baseline_means = _column(baseline.means, names)
+    targets = np.array([g.target_value if g else np.nan for g in goals], dtype=np.float64)
+
+    delta = to_optional(compute_delta(current, baseline_means))
+    progress = goal_progress_pct(current, targets, [g.target_type if g else None for g in goals])
+    status = goal_status(progress)
+    trend = trend_from_means(_column(target.means, names), baseline_means)
+    progress_opt = to_optional(progress)
+    return {
+        name: (
+            delta[i],
+            progress_opt[i] if goal else None,
+            str(status[i]) if goal else None,
+            str(trend[i]) if goal else None,
+        )
+        for i, (name, goal) in enumerate(zip(names, goals))
+    }
+
+
+def stats_from_series(series: SignalSeries, names: Sequence[str], methods: Sequence[str]) -> dict[str, list]:
+    """Per-signal value/mean/count columns for stats.stats_from_series(vectorized=True)."""
+    values, mask = matrix(series, names)
+    return {
+        "values": to_optional(aggregate(values, mask, methods)),
+        "means": to_optional(trailing_average(values, mask)),
+        "counts": [int(n) for n in counts(mask)],
+    }
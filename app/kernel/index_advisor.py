@@ -0,0 +1,231 @@
+"""Index advisor for health_connect_daily access patterns.
+
+Card reads always look like
+    WHERE date >= :start AND date < :end AND source_type = 'daily'
+    [AND device_id = :device_id] ORDER BY date
+(or the DISTINCT ON latest-snapshot variant), so this checks pg_indexes for
+matching (partial) indexes, EXPLAINs the connector's actual queries, and can
+create what is missing.
+
+    python -m app.kernel.index_advisor check
+    python -m app.kernel.index_advisor explain [--from 2026-01-01 --to 2026-02-01 --device-id ID]
+    python -m app.kernel.index_advisor apply
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import text
+
+from app.kernel import connector
+
+TABLE = "health_connect_daily"
+
+
+@dataclass(frozen=True, slots=True)
+class IndexRecommendation:
+    name: str
+    columns: tuple[str, ...]
+    where: str | None
+    reason: str
+
+    def ddl(self) -> str:
+        # CONCURRENTLY: never block ingestion writes while building
+        sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} ON {TABLE} ({', '.join(self.columns)})"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+
+RECOMMENDED_INDEXES: list[IndexRecommendation] = [
+    IndexRecommendation(
+        name="health_connect_daily_daily_device_date_idx",
+        columns=("device_id", "date"),
+        where="source_type = 'daily'",
+        reason="per-device card reads (device_id = :device_id AND date range)",
+    ),
+    IndexRecommendation(
+        name="health_connect_daily_daily_date_idx",
+        columns=("date",),
+        where="source_type = 'daily'",
+        reason="all-device card reads (date range only)",
+    ),
+    IndexRecommendation(
+        name="health_connect_daily_snapshot_device_date_idx",
+        columns=("device_id", "date", "collected_at"),
+        where="source_type IN ('daily', 'intraday')",
+        reason="latest-snapshot reads (KERNEL_INTRADAY_SNAPSHOTS, DISTINCT ON device_id, date)",
+    ),
+    IndexRecommendation(
+        name="health_connect_daily_daily_received_at_idx",
+        columns=("received_at",),
+        where="source_type = 'daily'",
+        reason="incremental signal table refresh (received_at > watermark)",
+    ),
+]
+
+_COLUMNS_RE = re.compile(r"USING \w+ \((?P<cols>[^)]*)\)")
+_WHERE_RE = re.compile(r"\bWHERE\b(?P<pred>.*)$", re.IGNORECASE)
+_LITERAL_RE = re.compile(r"'(\w+)'")
+
+
+def index_columns(indexdef: str) -> tuple[str, ...]:
+    """Key columns of a pg_indexes.indexdef, in order."""
+    m = _COLUMNS_RE.search(indexdef)
+    if not m:
+        return ()
+    return tuple(c.strip().split()[0].strip('"') for c in m.group("cols").split(",") if c.strip())
+
+
+def index_predicate(indexdef: str) -> str | None:
+    m = _WHERE_RE.search(indexdef)
+    return m.group("pred").strip() if m else None
+
+
+def covers(indexdef: str, rec: IndexRecommendation) -> bool:
+    """True when an existing index serves rec's query shape.
+
+    The recommended columns must be a prefix of the index's key columns. A
+    partial index only counts if its source_type predicate admits every
+    source_type the query reads; a full index always counts.
+    """
+    cols = index_columns(indexdef)
+    if cols[: len(rec.columns)] != rec.columns:
+        return False
+    predicate = index_predicate(indexdef)
+    if predicate is None:
+        return True
+    if rec.where is None or "source_type" not in predicate:
+        return False
+    wanted = set(_LITERAL_RE.findall(rec.where))
+    # pg renders IN (...) as = ANY (ARRAY['daily'::text, 'intraday'::text])
+    return wanted <= set(_LITERAL_RE.findall(predicate))
+
+
+async def existing_indexes(conn: Any) -> list[tuple[str, str]]:
+    """(indexname, indexdef) for health_connect_daily."""
+    result = await conn.execute(
+        text("SELECT indexname, indexdef FROM pg_indexes WHERE tablename = :table ORDER BY indexname"),
+        {"table": TABLE},
+    )
+    return [(row[0], row[1]) for row in result.fetchall()]
+
+
+async def missing_indexes(conn: Any) -> list[IndexRecommendation]:
+    defs = [indexdef for _, indexdef in await existing_indexes(conn)]
+    return [rec for rec in RECOMMENDED_INDEXES if not any(covers(d, rec) for d in defs)]
+
+
+def connector_queries(
+    start: date,
+    end_exclusive: date,
+    device_id: str,
+) -> dict[str, tuple[str, dict[str, Any]]]:
+    """The statements card reads actually issue, keyed by a short label."""
+    raw = "device_id, date, raw_data"
+    projected = f"device_id, date, {connector.SIGNAL_PROJECTION_SQL}"
+    return {
+        "fetch_daily_rows (all devices)": connector._daily_query(raw, start, end_exclusive, None),
+        "fetch_daily_rows (device)": connector._daily_query(raw, start, end_exclusive, device_id),
+        "fetch_projected_rows (device)": connector._daily_query(projected, start, end_exclusive, device_id),
+        "fetch_latest_snapshot_rows (device)": connector._daily_query(
+            raw, start, end_exclusive, device_id, latest_snapshot=True
+        ),
+    }
+
+
+def _walk(plan: dict[str, Any]):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def summarize_plan(plan: dict[str, Any]) -> dict[str, Any]:
+    """Root node, total cost, indexes used and whether the table is seq-scanned."""
+    nodes = list(_walk(plan))
+    return {
+        "root": plan.get("Node Type"),
+        "total_cost": plan.get("Total Cost"),
+        "indexes": sorted({n["Index Name"] for n in nodes if "Index Name" in n}),
+        "seq_scan": any(
+            n.get("Node Type") == "Seq Scan" and n.get("Relation Name") == TABLE for n in nodes
+        ),
+    }
+
+
+async def explain_connector_queries(
+    conn: Any,
+    start: date,
+    end_exclusive: date,
+    device_id: str,
+) -> dict[str, dict[str, Any]]:
+    out: dict[str, dict[str, Any]] = {}
+    for label, (query, params) in connector_queries(start, end_exclusive, device_id).items():
+        result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params)
+        raw = result.fetchall()[0][0]
+        doc = json.loads(raw) if isinstance(raw, str) else raw
+        out[label] = summarize_plan(doc[0]["Plan"])
+    return out
+
+
+async def apply(conn: Any, recs: list[IndexRecommendation]) -> list[str]:
+    """Create recs. conn must be in autocommit mode (CREATE INDEX CONCURRENTLY)."""
+    created: list[str] = []
+    for rec in recs:
+        await conn.execute(text(rec.ddl()))
+        created.append(rec.name)
+    return created
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from app.db import engine
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        if args.command == "check":
+            for name, indexdef in await existing_indexes(conn):
+                print(f"existing  {name}: {indexdef}")
+            missing = await missing_indexes(conn)
+            for rec in missing:
+                print(f"missing   {rec.name} — {rec.reason}\n          {rec.ddl()}")
+            if not missing:
+                print("all recommended indexes present")
+
+        elif args.command == "explain":
+            end = date.fromisoformat(args.to_date) if args.to_date else date.today() + timedelta(days=1)
+            start = date.fromisoformat(args.from_date) if args.from_date else end - timedelta(days=8)
+            plans = await explain_connector_queries(conn, start, end, args.device_id)
+            for label, summary in plans.items():
+                flag = "SEQ SCAN" if summary["seq_scan"] else "ok"
+                print(
+                    f"{flag:8s}  {label}: {summary['root']} cost={summary['total_cost']} "
+                    f"indexes={', '.join(summary['indexes']) or '-'}"
+                )
+
+        elif args.command == "apply":
+            missing = await missing_indexes(conn)
+            for name in await apply(conn, missing):
+                print(f"created   {name}")
+            if not missing:
+                print("nothing to do")
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.kernel.index_advisor", description=__doc__.split("\n")[0])
+    parser.add_argument("command", choices=["check", "explain", "apply"])
+    parser.add_argument("--from", dest="from_date", help="explain range start (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", help="explain range end, exclusive (YYYY-MM-DD)")
+    parser.add_argument("--device-id", default="00000000-0000-0000-0000-000000000000")
+    return parser
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(_parser().parse_args()))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from enum import Enum
 from typing import Any
 
@@ -90,3 +90,36 @@ class CardEnvelope(BaseModel):
     warnings: list[str] = Field(default_factory=list)
     drilldowns: list[Drilldown] = Field(default_factory=list)
     priority_summary: dict[str, PriorityStatus] | None = None
+
+
+class SignalTimeseries(BaseModel):
+    """One signal across consecutive cards; lists are aligned with TimeseriesEnvelope.periods."""
+
+    record_type: str
+    unit: str | None = None
+    aggregation: str = "avg"
+    values: list[float | None] = Field(default_factory=list)
+    baselines: list[float | None] = Field(default_factory=list)
+    deltas: list[float | None] = Field(default_factory=list)
+    completeness: list[float] = Field(default_factory=list)
+    # Goal fields, only for goal-bearing signals (as on Signal)
+    target: float | None = None
+    target_progress_pct: list[float | None] | None = None
+    status: list[str] | None = None
+    trend: list[str] | None = None
+
+
+class TimeseriesEnvelope(BaseModel):
+    """Compact series of cards of one type — one entry per period."""
+
+    schema_version: str = "v0"
+    card_type: str
+    granularity: Granularity
+    time_range: TimeRange
+    generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    periods: list[date] = Field(default_factory=list)  # period start dates
+    row_counts: list[int] = Field(default_factory=list)
+    tracking_consistency: list[float] = Field(default_factory=list)
+    signals: list[SignalTimeseries] = Field(default_factory=list)
+    warnings: list[str] = Field(default_factory=list)
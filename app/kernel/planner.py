@@ -0,0 +1,45 @@
+"""Fetch planning for multi-card requests.
+
+Each card needs rows for [baseline_start, target_end_exclusive). Cards of one
+preset overlap heavily (a daily card's range sits inside the weekly card's,
+which sits inside the monthly card's), so the needs are merged per device
+into minimal covering intervals, each fetched once; builders then slice the
+shared series.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+
+@dataclass(frozen=True, slots=True)
+class FetchNeed:
+    start: date
+    end_exclusive: date
+    device_id: str | None = None
+
+
+def merge_needs(needs: list[FetchNeed]) -> list[FetchNeed]:
+    """Union of needs as disjoint intervals (overlapping or touching ranges merge), per device."""
+    merged: list[FetchNeed] = []
+    for need in sorted(needs, key=lambda n: (n.device_id or "", n.device_id is not None, n.start)):
+        last = merged[-1] if merged else None
+        if last is not None and last.device_id == need.device_id and need.start <= last.end_exclusive:
+            if need.end_exclusive > last.end_exclusive:
+                merged[-1] = FetchNeed(last.start, need.end_exclusive, last.device_id)
+        else:
+            merged.append(need)
+    return merged
+
+
+def covering(intervals: list[FetchNeed], need: FetchNeed) -> FetchNeed:
+    """The merged interval containing need."""
+    for interval in intervals:
+        if (
+            interval.device_id == need.device_id
+            and interval.start <= need.start
+            and need.end_exclusive <= interval.end_exclusive
+        ):
+            return interval
+    raise KeyError(need)
@@ -0,0 +1,154 @@
+"""Background pre-warm of the current period's cards.
+
+An asyncio task started from the FastAPI lifespan (KERNEL_PREWARM). Shortly
+after local midnight in DEFAULT_TZ, and whenever an ingestion burst has
+settled (the recent received_at watermark moved, then held for one poll), it
+builds each active device's cards through cache.get_card, so they land in
+the in-process cache and, for closed periods, the card store. The first
+dashboard load of a new day then hits a warm card instead of a cold build.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.kernel import builders, cache, card_store, connector
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm_targets(today: date) -> list[tuple[str, date]]:
+    """(card_type, start) pairs warmed for the local day `today`.
+
+    Today's daily card (also goals/progress), yesterday's now-closed daily card
+    and the weekly card for the ISO week containing today.
+    """
+    return [
+        ("daily_summary", today),
+        ("daily_summary", today - timedelta(days=1)),
+        ("weekly_overview", today - timedelta(days=today.weekday())),
+    ]
+
+
+def next_run_after_midnight(now: datetime, delay_seconds: float) -> datetime:
+    """The first local midnight after now, plus delay_seconds (now must be tz-aware)."""
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+    return midnight + timedelta(seconds=delay_seconds)
+
+
+def is_kept(card_type: str, start: date, tz_name: str) -> bool:
+    """True when get_card keeps the card: the cache is on, or the period is closed and the store is on."""
+    if cache.card_cache.enabled:
+        return True
+    _, target_end_exclusive, _ = builders.card_period(card_type, start)
+    return settings.kernel_card_store and card_store.is_closed(target_end_exclusive, tz_name)
+
+
+class PrewarmScheduler:
+    """Warms cards after local midnight and after each settled ingestion burst."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        tz_name: str,
+        poll_seconds: float = 60.0,
+        midnight_delay_seconds: float = 120.0,
+        active_days: int = 7,
+    ) -> None:
+        self.session_factory = session_factory
+        self.tz_name = tz_name
+        self.poll_seconds = poll_seconds
+        self.midnight_delay_seconds = midnight_delay_seconds
+        self.active_days = active_days
+        self.runs = 0
+        self.cards_warmed = 0
+        self._task: asyncio.Task | None = None
+
+    def _today(self) -> date:
+        return datetime.now(ZoneInfo(self.tz_name)).date()
+
+    async def warm(self, reason: str = "manual") -> int:
+        """Build every active device's cards (plus the all-devices cards). Returns cards warmed.
+
+        Targets neither the cache nor the store would keep are skipped.
+        """
+        started = time.perf_counter()
+        today = self._today()
+        warmed = 0
+        start, end_exclusive = today - timedelta(days=self.active_days), today + timedelta(days=1)
+        targets = [t for t in prewarm_targets(today) if is_kept(*t, self.tz_name)]
+        async with self.session_factory() as session:
+            devices = await connector.fetch_active_devices(session, start, end_exclusive)
+            for device_id in [None, *devices]:
+                for card_type, card_start in targets:
+                    await cache.get_card(session, card_type, card_start, self.tz_name, device_id)
+                    warmed += 1
+        self.runs += 1
+        self.cards_warmed += warmed
+        logger.info(
+            "prewarm (%s): %d card(s) for %d device(s) in %.2fs",
+            reason, warmed, len(devices), time.perf_counter() - started,
+        )
+        return warmed
+
+    async def _watermark(self) -> Any:
+        today = self._today()
+        start, end_exclusive = today - timedelta(days=self.active_days), today + timedelta(days=1)
+        async with self.session_factory() as session:
+            return await connector.fetch_watermark(
+                session, start, end_exclusive, latest_snapshot=settings.kernel_intraday_snapshots
+            )
+
+    async def _safe_warm(self, reason: str) -> None:
+        try:
+            await self.warm(reason)
+        except Exception:
+            logger.exception("prewarm (%s) failed", reason)
+
+    async def run(self) -> None:
+        tz = ZoneInfo(self.tz_name)
+        next_midnight = next_run_after_midnight(datetime.now(tz), self.midnight_delay_seconds)
+        seen: Any = None
+        warmed: Any = None
+        while True:
+            until_midnight = (next_midnight - datetime.now(tz)).total_seconds()
+            await asyncio.sleep(max(0.0, min(self.poll_seconds, until_midnight)))
+
+            if datetime.now(tz) >= next_midnight:
+                await self._safe_warm("midnight")
+                warmed = seen
+                next_midnight = next_run_after_midnight(datetime.now(tz), self.midnight_delay_seconds)
+                continue
+
+            try:
+                watermark = await self._watermark()
+            except Exception:
+                logger.exception("prewarm watermark check failed")
+                continue
+            # a burst has settled once the watermark holds still for a whole poll
+            if watermark == seen and watermark != warmed:
+                await self._safe_warm("ingestion")
+                warmed = watermark
+            seen = watermark
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,85 @@
+"""Response rendering from precompiled TypeAdapters.
+
+Returning a model from a FastAPI route re-validates it against
+response_model before serialising. Kernel envelopes are built by the kernel
+itself, so the fast path (KERNEL_FAST_RENDER) dumps them straight to JSON
+bytes with adapters compiled once at import. The bytes are identical to
+FastAPI's own rendering (same pydantic-core serializer, same options).
+
+Sparse responses (`fields=`) use the same adapters with an include map, e.g.
+`fields=signals.value,priority_summary,warnings`. Identity fields (id,
+schema_version, card_type, granularity, time_range, generated_at) are always
+kept.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.kernel.models import (
+    CardEnvelope,
+    Coverage,
+    Drilldown,
+    Evidence,
+    PriorityStatus,
+    Signal,
+    TimeRange,
+    TimeseriesEnvelope,
+)
+
+CARD = TypeAdapter(CardEnvelope)
+CARDS = TypeAdapter(list[CardEnvelope])
+TIMESERIES = TypeAdapter(TimeseriesEnvelope)
+
+IDENTITY_FIELDS = ("id", "schema_version", "card_type", "granularity", "time_range", "generated_at")
+
+# section -> (item model, whether the section is a list/dict of items)
+_SUBFIELDS: dict[str, tuple[type[BaseModel], bool]] = {
+    "signals": (Signal, True),
+    "drilldowns": (Drilldown, True),
+    "priority_summary": (PriorityStatus, True),
+    "evidence": (Evidence, False),
+    "coverage": (Coverage, False),
+    "time_range": (TimeRange, False),
+}
+
+
+def parse_fields(value: str) -> dict[str, Any]:
+    """Pydantic include map for a comma-separated `fields=` value (`section` or `section.attr`).
+
+    Raises ValueError for names that are not CardEnvelope fields.
+    """
+    whole: set[str] = set(IDENTITY_FIELDS)
+    partial: dict[str, set[str]] = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        section, _, attr = item.partition(".")
+        if section not in CardEnvelope.model_fields:
+            raise ValueError(f"Unknown field: {item}")
+        if not attr:
+            whole.add(section)
+            continue
+        item_model = _SUBFIELDS.get(section, (None, False))[0]
+        if item_model is None or attr not in item_model.model_fields:
+            raise ValueError(f"Unknown field: {item}")
+        partial.setdefault(section, set()).add(attr)
+
+    include: dict[str, Any] = {name: True for name in whole}
+    for section, attrs in partial.items():
+        if section not in whole:
+            include[section] = {"__all__": attrs} if _SUBFIELDS[section][1] else attrs
+    return include
+
+
+def sections(include: dict[str, Any] | None) -> frozenset[str] | None:
+    """Top-level CardEnvelope sections an include map keeps (None: all of them)."""
+    return None if include is None else frozenset(include)
+
+
+def json_response(adapter: TypeAdapter, value: Any, include: Any = None) -> Response:
+    return Response(
+        content=adapter.dump_json(value, include=include, by_alias=True),
+        media_type="application/json",
+    )
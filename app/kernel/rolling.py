@@ -0,0 +1,200 @@
+"""Baselines for many consecutive cards from one series (builders.build_timeseries).
+
+N consecutive cards each need a baseline over the features.baseline_window
+periods before them. The series is bucketed per day once; baseline row
+counts and tracking come from prefix sums, min/max from monotonic deques and
+"last" from a last-present-day index, so those cost O(days + N) in total.
+
+Sums and means are not taken from prefix-sum differences, which round
+differently from a card's sum(values). Each window's values are one
+contiguous slice of the signal's values in row order, summed with sum() as
+the card sums them: O(window) per baseline, O(N x window) in total, but one
+C-level pass per window instead of a per-card reduction. Target periods are
+reduced exactly as a single card would (stats.stats_from_series on the
+slice), so every value, baseline and delta matches the per-card result bit
+for bit. Baseline partial_days is left empty: cards never read it.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import date
+from itertools import accumulate
+
+from app.kernel import features, stats
+from app.kernel.series import SignalSeries
+from app.kernel.signal_map import SIGNAL_CONFIG, list_signals
+from app.kernel.stats import PeriodStats
+
+
+class _SignalDays:
+    """Per-day buckets and prefix counts for one signal."""
+
+    __slots__ = ("values", "counts", "mins", "maxs", "lasts", "prefix_count", "last_day")
+
+    def __init__(self, days: int) -> None:
+        self.values: list[float] = []  # present values in row order
+        self.counts = [0] * days
+        self.mins: list[float | None] = [None] * days
+        self.maxs: list[float | None] = [None] * days
+        self.lasts: list[float | None] = [None] * days
+
+    def add(self, d: int, v: float) -> None:
+        self.values.append(v)
+        self.counts[d] += 1
+        if self.mins[d] is None or v < self.mins[d]:
+            self.mins[d] = v
+        if self.maxs[d] is None or v > self.maxs[d]:
+            self.maxs[d] = v
+        self.lasts[d] = v
+
+    def finish(self) -> None:
+        # values[prefix_count[lo]:prefix_count[hi]] are the values of days [lo, hi)
+        self.prefix_count = [0, *accumulate(self.counts)]
+        # last_day[k]: latest day index < k with a value, else -1
+        self.last_day = [-1] * (len(self.counts) + 1)
+        for d, n in enumerate(self.counts):
+            self.last_day[d + 1] = d if n else self.last_day[d]
+
+
+def sliding_extreme(
+    day_values: list[float | None],
+    windows: list[tuple[int, int]],
+    largest: bool,
+) -> list[float | None]:
+    """max (or min) of day_values[lo:hi] per window, ignoring None.
+
+    Windows must have non-decreasing lo and hi; a monotonic deque makes the
+    whole sequence O(days + windows).
+    """
+    dq: deque[int] = deque()
+    out: list[float | None] = []
+    nxt = 0
+    for lo, hi in windows:
+        while nxt < hi:
+            v = day_values[nxt]
+            if v is not None:
+                while dq and (day_values[dq[-1]] <= v if largest else day_values[dq[-1]] >= v):
+                    dq.pop()
+                dq.append(nxt)
+            nxt += 1
+        while dq and dq[0] < lo:
+            dq.popleft()
+        out.append(day_values[dq[0]] if dq else None)
+    return out
+
+
+class RollingStats:
+    """Day buckets of a SignalSeries over [origin, end_exclusive)."""
+
+    def __init__(self, series: SignalSeries, origin: date, end_exclusive: date) -> None:
+        self.origin = origin.toordinal()
+        days = max((end_exclusive - origin).days, 0)
+        self.signals = {name: _SignalDays(days) for name in SIGNAL_CONFIG}
+        rows = [0] * days
+        tracked = [0] * days
+
+        lo, hi = series.bounds(origin, end_exclusive)
+        for i in range(lo, hi):
+            d = series.ordinals[i] - self.origin
+            rows[d] += 1
+            tracked[d] += series.tracked[i]
+            for name, acc in self.signals.items():
+                if series.present[name][i]:
+                    acc.add(d, series.columns[name][i])
+
+        for acc in self.signals.values():
+            acc.finish()
+        self.prefix_rows = [0, *accumulate(rows)]
+        self.prefix_tracked = [0, *accumulate(tracked)]
+        self.first_row_day = [days] * (days + 1)  # earliest day >= k with rows
+        self.last_row_day = [-1] * (days + 1)  # latest day < k with rows
+        for d in range(days - 1, -1, -1):
+            self.first_row_day[d] = d if rows[d] else self.first_row_day[d + 1]
+        for d in range(days):
+            self.last_row_day[d + 1] = d if rows[d] else self.last_row_day[d]
+
+    def _index(self, day: date) -> int:
+        return day.toordinal() - self.origin
+
+    def window_stats(self, windows: list[tuple[date, date]], expected_days: list[int]) -> list[PeriodStats]:
+        """PeriodStats (without partial_days) for each [start, end_exclusive) window.
+
+        Windows must be ordered with non-decreasing start and end.
+        """
+        bounds = [(self._index(s), self._index(e)) for s, e in windows]
+        extremes = {
+            name: (
+                sliding_extreme(acc.mins, bounds, largest=False),
+                sliding_extreme(acc.maxs, bounds, largest=True),
+            )
+            for name, acc in self.signals.items()
+        }
+
+        out: list[PeriodStats] = []
+        for w, (lo, hi) in enumerate(bounds):
+            row_count = self.prefix_rows[hi] - self.prefix_rows[lo]
+            result = PeriodStats(row_count=row_count)
+            if row_count:
+                result.earliest = date.fromordinal(self.origin + self.first_row_day[lo])
+                result.latest = date.fromordinal(self.origin + self.last_row_day[hi])
+                result.tracking = features.coverage_ratio(
+                    self.prefix_tracked[hi] - self.prefix_tracked[lo], expected_days[w]
+                )
+            for name in list_signals():
+                acc = self.signals[name]
+                first, end = acc.prefix_count[lo], acc.prefix_count[hi]
+                n = end - first
+                result.counts[name] = n
+                if not n:
+                    result.values[name] = result.means[name] = None
+                    continue
+                # same summation as features.aggregate / trailing_average on the card's slice
+                total = sum(acc.values[first:end])
+                mean = total / n
+                result.means[name] = mean
+                agg = SIGNAL_CONFIG[name].agg
+                if agg == "sum":
+                    result.values[name] = total
+                elif agg == "min":
+                    result.values[name] = extremes[name][0][w]
+                elif agg == "max":
+                    result.values[name] = extremes[name][1][w]
+                elif agg == "last":
+                    result.values[name] = acc.lasts[acc.last_day[hi]]
+                else:
+                    result.values[name] = mean
+            out.append(result)
+        return out
+
+
+def card_stats(
+    series: SignalSeries,
+    periods: list[tuple[date, date, date]],
+    vectorized: bool = False,
+) -> list[tuple[PeriodStats, PeriodStats]]:
+    """(target, baseline) stats per (target_start, target_end_exclusive, baseline_start).
+
+    Periods must be in chronological order (as consecutive cards are).
+    vectorized reduces every window with features_np, as cards do under
+    KERNEL_VECTORIZED_FEATURES: NumPy sums round differently from sum(), so
+    the day buckets are not used.
+    """
+    if not periods:
+        return []
+    targets = [
+        stats.stats_from_series(series.slice(start, end), (end - start).days or 1, vectorized)
+        for start, end, _ in periods
+    ]
+    baseline_windows = [(baseline_start, start) for start, _, baseline_start in periods]
+    baseline_days = [(end - start).days or 1 for start, end in baseline_windows]
+    if vectorized:
+        baselines = [
+            stats.stats_from_series(series.slice(start, end), days, True)
+            for (start, end), days in zip(baseline_windows, baseline_days)
+        ]
+    else:
+        origin = min(p[2] for p in periods)
+        end = max(p[1] for p in periods)
+        baselines = RollingStats(series, origin, end).window_stats(baseline_windows, baseline_days)
+    return list(zip(targets, baselines))
@@ -4,19 +4,23 @@ from __future__ import annotations
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app import timing
 from app.auth import verify_api_key
 from app.config import settings
-from app.db import get_session
-from app.kernel import builders
+from app.db import get_session, get_session_factory
+from app.kernel import builders, cache, render
 from app.kernel.goals_config import list_goals
-from app.kernel.models import CardEnvelope
+from app.kernel.models import CardEnvelope, TimeseriesEnvelope
 from app.kernel.presets import get_preset, list_presets
 
 router = APIRouter(prefix="/kernel", tags=["kernel"])
 
+# Upper bound on periods per /kernel/timeseries request (two years of daily cards)
+MAX_TIMESERIES_PERIODS = 731
+
 # Mapping card_type string → builder callable
 CARD_BUILDERS = {
     "daily_summary",
@@ -32,12 +36,28 @@ def _parse_date(value: str, name: str) -> date:
         raise HTTPException(status_code=422, detail=f"Invalid date for '{name}': {value}")
 
 
+FIELDS_DESCRIPTION = (
+    "Comma-separated CardEnvelope fields to return, e.g. signals.value,priority_summary,warnings "
+    "(omit for the full envelope)"
+)
+
+
+def _parse_fields(value: str | None) -> dict | None:
+    if value is None:
+        return None
+    try:
+        return render.parse_fields(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 # ---------------------------------------------------------------------------
 # /kernel/cards/{card_type}
 # ---------------------------------------------------------------------------
 
 
 @router.get("/cards/{card_type}", response_model=CardEnvelope)
+@timing.timed("handler")
 async def get_card(
     card_type: str,
     session: AsyncSession = Depends(get_session),
@@ -46,24 +66,70 @@ async def get_card(
     to_date: str = Query(..., alias="to", description="End date (YYYY-MM-DD)"),
     tz: str = Query(default=None, description="Timezone (e.g. US/Eastern)"),
     device_id: str | None = Query(default=None, description="Filter by device (omit for all devices)"),
-) -> CardEnvelope:
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> CardEnvelope | Response:
     if card_type not in CARD_BUILDERS:
         raise HTTPException(status_code=404, detail=f"Unknown card type: {card_type}")
 
     tz_name = tz or settings.default_tz
     start = _parse_date(from_date, "from")
     _parse_date(to_date, "to")  # validate
+    include = _parse_fields(fields)
+
+    card = await cache.get_card(session, card_type, start, tz_name, device_id, sections=render.sections(include))
+    if include is not None or settings.kernel_fast_render:
+        return render.json_response(render.CARD, card, include)
+    return card
 
-    if card_type == "daily_summary":
-        return await builders.build_daily_summary(session, start, tz_name, device_id)
 
-    if card_type == "weekly_overview":
-        return await builders.build_weekly_overview(session, start, tz_name, device_id)
+@router.get("/cache")
+async def cache_stats(
+    _: str = Depends(verify_api_key),
+) -> dict:
+    """Card cache size and hit/miss counters for this process."""
+    return cache.card_cache.stats()
 
-    if card_type == "monthly_overview":
-        return await builders.build_monthly_overview(session, start.year, start.month, tz_name, device_id)
 
-    raise HTTPException(status_code=404, detail=f"Unknown card type: {card_type}")
+# ---------------------------------------------------------------------------
+# /kernel/timeseries/{card_type}
+# ---------------------------------------------------------------------------
+
+
+@router.get("/timeseries/{card_type}", response_model=TimeseriesEnvelope)
+@timing.timed("handler")
+async def get_timeseries(
+    card_type: str,
+    session: AsyncSession = Depends(get_session),
+    _: str = Depends(verify_api_key),
+    from_date: str = Query(..., alias="from", description="First period start (YYYY-MM-DD)"),
+    to_date: str = Query(..., alias="to", description="Last period start, inclusive (YYYY-MM-DD)"),
+    tz: str = Query(default=None, description="Timezone (e.g. US/Eastern)"),
+    device_id: str | None = Query(default=None, description="Filter by device (omit for all devices)"),
+) -> TimeseriesEnvelope | Response:
+    """One compact series of card_type periods from `from` through `to`, built from a single fetch."""
+    if card_type not in CARD_BUILDERS:
+        raise HTTPException(status_code=404, detail=f"Unknown card type: {card_type}")
+
+    tz_name = tz or settings.default_tz
+    start = _parse_date(from_date, "from")
+    end = _parse_date(to_date, "to")
+    if end < start:
+        raise HTTPException(status_code=422, detail="'to' must not be before 'from'")
+    if builders.count_periods(card_type, start, end) > MAX_TIMESERIES_PERIODS:
+        raise HTTPException(
+            status_code=422, detail=f"Range spans more than {MAX_TIMESERIES_PERIODS} periods"
+        )
+
+    try:
+        envelope = await builders.build_timeseries(session, card_type, start, end, tz_name, device_id)
+    except OverflowError:
+        # baseline windows before date.min, or period ends after date.max
+        raise HTTPException(
+            status_code=422, detail="Range is too close to the earliest or latest supported date"
+        )
+    if settings.kernel_fast_render:
+        return render.json_response(render.TIMESERIES, envelope)
+    return envelope
 
 
 # ---------------------------------------------------------------------------
@@ -98,15 +164,17 @@ async def preset_detail(
 
 
 @router.get("/presets/{preset_id}/run", response_model=list[CardEnvelope])
+@timing.timed("handler")
 async def preset_run(
     preset_id: str,
-    session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
     _: str = Depends(verify_api_key),
     from_date: str = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
     to_date: str = Query(..., alias="to", description="End date (YYYY-MM-DD)"),
     tz: str = Query(default=None, description="Timezone"),
     device_id: str | None = Query(default=None, description="Filter by device (omit for all devices)"),
-) -> list[CardEnvelope]:
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION + ", applied to every card"),
+) -> list[CardEnvelope] | Response:
     preset = get_preset(preset_id)
     if preset is None:
         raise HTTPException(status_code=404, detail=f"Unknown preset: {preset_id}")
@@ -114,18 +182,22 @@ async def preset_run(
     tz_name = tz or settings.default_tz
     start = _parse_date(from_date, "from")
     _parse_date(to_date, "to")  # validate
-
-    results: list[CardEnvelope] = []
-    for ct in preset.card_types:
-        if ct == "daily_summary":
-            results.append(await builders.build_daily_summary(session, start, tz_name, device_id))
-        elif ct == "weekly_overview":
-            results.append(await builders.build_weekly_overview(session, start, tz_name, device_id))
-        elif ct == "monthly_overview":
-            results.append(
-                await builders.build_monthly_overview(session, start.year, start.month, tz_name, device_id)
-            )
-    return results
+    include = _parse_fields(fields)
+
+    cards = await builders.build_preset_cards(
+        session_factory,
+        [ct for ct in preset.card_types if ct in CARD_BUILDERS],
+        start,
+        tz_name,
+        device_id,
+        max_concurrency=settings.kernel_preset_max_concurrency,
+        sections=render.sections(include),
+    )
+    if include is not None:
+        return render.json_response(render.CARDS, cards, {"__all__": include})
+    if settings.kernel_fast_render:
+        return render.json_response(render.CARDS, cards)
+    return cards
 
 
 # ---------------------------------------------------------------------------
@@ -152,6 +224,7 @@ async def goals_list(
 
 
 @router.get("/goals/progress")
+@timing.timed("handler")
 async def goals_progress(
     session: AsyncSession = Depends(get_session),
     _: str = Depends(verify_api_key),
@@ -167,7 +240,7 @@ async def goals_progress(
     tz_name = tz or settings.default_tz
     start = _parse_date(from_date, "from")
 
-    envelope = await builders.build_daily_summary(session, start, tz_name, device_id)
+    envelope = await cache.get_card(session, "daily_summary", start, tz_name, device_id)
 
     goal_signals = [
         {
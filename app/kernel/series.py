@@ -0,0 +1,137 @@
+"""Date-aligned columnar signal series.
+
+One entry per row in date order: a sorted ordinal date index, one float64
+array('d') column per signal (NaN where missing) and a presence mask per
+signal (one byte per row). Range lookups bisect the date index, so slicing
+a baseline or window is index arithmetic rather than a rescan, and values
+stay unboxed until a reduction needs them.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from datetime import date
+from itertools import compress, groupby
+from typing import Any, Iterable
+
+from app.kernel import extractor, features
+from app.kernel.signal_map import SIGNAL_CONFIG
+
+_NAN = float("nan")
+
+
+class SignalSeries:
+    """Columnar view of health_connect_daily rows (raw or projected)."""
+
+    __slots__ = ("ordinals", "columns", "present", "tracked")
+
+    def __init__(
+        self,
+        ordinals: array,
+        columns: dict[str, array],
+        present: dict[str, bytearray],
+        tracked: bytearray,
+    ) -> None:
+        self.ordinals = ordinals  # array('l') of date.toordinal(), non-decreasing
+        self.columns = columns
+        self.present = present
+        self.tracked = tracked  # manual-tracking flag per row
+
+    @classmethod
+    def empty(cls) -> SignalSeries:
+        return cls(
+            array("l"),
+            {name: array("d") for name in SIGNAL_CONFIG},
+            {name: bytearray() for name in SIGNAL_CONFIG},
+            bytearray(),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict[str, Any]], projected: bool = False) -> SignalSeries:
+        """Extract rows into columns; rows are sorted by date if they are not already."""
+        rows = list(rows)
+        if any(rows[i]["date"] > rows[i + 1]["date"] for i in range(len(rows) - 1)):
+            rows.sort(key=lambda r: r["date"])
+
+        out = cls.empty()
+        names = list(SIGNAL_CONFIG)
+        for row in rows:
+            if projected:
+                values = extractor.extract_projected_signals(row)
+                tracked = features.is_manually_tracked(row)
+            else:
+                values, tracked = extractor.extract_row(row)
+            out.ordinals.append(row["date"].toordinal())
+            out.tracked.append(tracked)
+            for name in names:
+                v = values.get(name)
+                out.columns[name].append(_NAN if v is None else v)
+                out.present[name].append(v is not None)
+        return out
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    @property
+    def earliest(self) -> date | None:
+        return date.fromordinal(self.ordinals[0]) if self.ordinals else None
+
+    @property
+    def latest(self) -> date | None:
+        return date.fromordinal(self.ordinals[-1]) if self.ordinals else None
+
+    def dates(self) -> list[date]:
+        return [date.fromordinal(o) for o in self.ordinals]
+
+    def bounds(self, start: date | None, end_exclusive: date | None) -> tuple[int, int]:
+        """Row index range [lo, hi) covering [start, end_exclusive)."""
+        lo = 0 if start is None else bisect_left(self.ordinals, start.toordinal())
+        hi = len(self.ordinals) if end_exclusive is None else bisect_left(self.ordinals, end_exclusive.toordinal())
+        return lo, max(lo, hi)
+
+    def take(self, lo: int, hi: int) -> SignalSeries:
+        return SignalSeries(
+            self.ordinals[lo:hi],
+            {name: col[lo:hi] for name, col in self.columns.items()},
+            {name: mask[lo:hi] for name, mask in self.present.items()},
+            self.tracked[lo:hi],
+        )
+
+    def slice(self, start: date | None = None, end_exclusive: date | None = None) -> SignalSeries:
+        return self.take(*self.bounds(start, end_exclusive))
+
+    def split_at(self, pivot: date) -> tuple[SignalSeries, SignalSeries]:
+        """(rows before pivot, rows on/after pivot)."""
+        i = bisect_left(self.ordinals, pivot.toordinal())
+        return self.take(0, i), self.take(i, len(self))
+
+    def values(self, name: str) -> array:
+        """Present values of one signal, in date order."""
+        return array("d", compress(self.columns[name], self.present[name]))
+
+    def count(self, name: str) -> int:
+        return self.present[name].count(1)
+
+    def last(self, name: str) -> float | None:
+        """Latest present value by date (not merely the last row)."""
+        i = self.present[name].rfind(1)
+        return self.columns[name][i] if i >= 0 else None
+
+    def mean(self, name: str) -> float | None:
+        return features.trailing_average(self.values(name))
+
+    def aggregate(self, name: str, method: str) -> float | None:
+        if method == "last":
+            return self.last(name)
+        return features.aggregate(self.values(name), method)
+
+    def tracked_days(self) -> int:
+        return self.tracked.count(1)
+
+    def day_counts(self) -> dict[str, int]:
+        """{ISO date: rows on that date}."""
+        return {
+            date.fromordinal(o).isoformat(): sum(1 for _ in group)
+            for o, group in groupby(self.ordinals)
+        }
@@ -0,0 +1,173 @@
+"""Pre-extracted signal table — health_connect_signals_daily.
+
+One row per (device_id, date) with one float8 column per SIGNAL_CONFIG entry
+and manual_tracked, i.e. exactly the shape of connector.fetch_projected_rows.
+Refreshed incrementally from health_connect_daily by received_at watermark;
+cards read it (connector.fetch_signal_rows) while the last refresh is recent
+enough.
+
+    python -m app.kernel.signal_table create    # DDL (idempotent)
+    python -m app.kernel.signal_table refresh   # incremental upsert
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.kernel.connector import MANUAL_TRACKED_COLUMN, SIGNAL_PROJECTION_SQL, SIGNAL_TABLE
+from app.kernel.signal_map import SIGNAL_CONFIG
+
+TABLE = SIGNAL_TABLE
+STATE_TABLE = "health_connect_signals_daily_state"
+
+# Re-scan this far behind the watermark so rows committed late by concurrent
+# ingestion transactions are not skipped. Upserts are idempotent.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# How long a state lookup is reused before asking the DB again
+_STATE_TTL_SECONDS = 30.0
+# (looked up at, refreshed_at, watermark)
+_state_cache: tuple[float, datetime | None, datetime | None] | None = None
+
+_SIGNAL_COLUMNS = [f'"{name}"' for name in SIGNAL_CONFIG]
+
+
+def create_table_sql() -> list[str]:
+    """DDL for the signal table and its single-row refresh state."""
+    signal_cols = ",\n".join(f"    {col} double precision" for col in _SIGNAL_COLUMNS)
+    return [
+        (
+            f"CREATE TABLE IF NOT EXISTS {TABLE} (\n"
+            "    device_id varchar NOT NULL,\n"
+            "    date date NOT NULL,\n"
+            f"{signal_cols},\n"
+            f"    {MANUAL_TRACKED_COLUMN} boolean NOT NULL DEFAULT false,\n"
+            "    received_at timestamptz NOT NULL,\n"
+            "    PRIMARY KEY (device_id, date)\n"
+            ")"
+        ),
+        f"CREATE INDEX IF NOT EXISTS {TABLE}_date_idx ON {TABLE} (date)",
+        (
+            f"CREATE TABLE IF NOT EXISTS {STATE_TABLE} (\n"
+            "    id smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1),\n"
+            "    watermark timestamptz,\n"
+            "    refreshed_at timestamptz\n"
+            ")"
+        ),
+        f"INSERT INTO {STATE_TABLE} (id) VALUES (1) ON CONFLICT (id) DO NOTHING",
+    ]
+
+
+def _refresh_sql() -> str:
+    cols = ", ".join(_SIGNAL_COLUMNS)
+    updates = ", ".join(
+        f"{col} = EXCLUDED.{col}" for col in [*_SIGNAL_COLUMNS, MANUAL_TRACKED_COLUMN, "received_at"]
+    )
+    # Latest daily row per (device_id, date) among rows received since the watermark
+    return (
+        "WITH fresh AS ("
+        f"SELECT DISTINCT ON (device_id, date) device_id, date, {SIGNAL_PROJECTION_SQL}, received_at "
+        "FROM health_connect_daily "
+        "WHERE source_type = 'daily' AND (CAST(:since AS timestamptz) IS NULL OR received_at > :since) "
+        "ORDER BY device_id, date, received_at DESC"
+        "), upserted AS ("
+        f"INSERT INTO {TABLE} (device_id, date, {cols}, {MANUAL_TRACKED_COLUMN}, received_at) "
+        f"SELECT device_id, date, {cols}, {MANUAL_TRACKED_COLUMN}, received_at FROM fresh "
+        f"ON CONFLICT (device_id, date) DO UPDATE SET {updates} "
+        f"WHERE {TABLE}.received_at <= EXCLUDED.received_at "
+        "RETURNING 1"
+        ") "
+        "SELECT (SELECT count(*) FROM upserted) AS upserted, "
+        "(SELECT max(received_at) FROM fresh) AS watermark"
+    )
+
+
+REFRESH_SQL = _refresh_sql()
+
+
+async def create_table(session: AsyncSession) -> None:
+    for stmt in create_table_sql():
+        await session.execute(text(stmt))
+    await session.commit()
+
+
+async def refresh(session: AsyncSession) -> int:
+    """Upsert rows received since the stored watermark. Returns rows upserted."""
+    global _state_cache
+    result = await session.execute(text(f"SELECT watermark FROM {STATE_TABLE} WHERE id = 1"))
+    row = result.fetchone()
+    watermark = row[0] if row else None
+    since = watermark - REFRESH_OVERLAP if watermark is not None else None
+
+    result = await session.execute(text(REFRESH_SQL), {"since": since})
+    upserted, new_watermark = result.fetchone()
+
+    await session.execute(
+        text(
+            f"UPDATE {STATE_TABLE} SET watermark = GREATEST(watermark, CAST(:wm AS timestamptz)), "
+            "refreshed_at = now() WHERE id = 1"
+        ),
+        {"wm": new_watermark},
+    )
+    await session.commit()
+    covered = max((wm for wm in (watermark, new_watermark) if wm is not None), default=None)
+    _state_cache = (time.monotonic(), datetime.now(timezone.utc), covered)
+    return upserted
+
+
+async def _state(session: AsyncSession) -> tuple[datetime | None, datetime | None]:
+    """(refreshed_at, watermark) of the last refresh, looked up at most every few seconds per process.
+
+    A missing table or state row means (None, None), never an error.
+    """
+    global _state_cache
+    now = time.monotonic()
+    if _state_cache is None or now - _state_cache[0] > _STATE_TTL_SECONDS:
+        try:
+            result = await session.execute(text(f"SELECT refreshed_at, watermark FROM {STATE_TABLE} WHERE id = 1"))
+            row = result.fetchone()
+        except Exception:
+            await session.rollback()
+            row = None
+        _state_cache = (now, *(row if row else (None, None)))
+    return _state_cache[1], _state_cache[2]
+
+
+async def is_fresh(session: AsyncSession, max_staleness_seconds: float) -> bool:
+    """True when the last refresh is within max_staleness_seconds."""
+    refreshed_at, _ = await _state(session)
+    if refreshed_at is None:
+        return False
+    age = datetime.now(timezone.utc) - refreshed_at
+    return age.total_seconds() <= max_staleness_seconds
+
+
+async def covered_watermark(session: AsyncSession) -> datetime | None:
+    """Latest received_at the table has copied; rows received after it are not in it yet."""
+    _, watermark = await _state(session)
+    return watermark
+
+
+async def _main(command: str) -> None:
+    from app.db import async_session
+
+    async with async_session() as session:
+        if command == "create":
+            await create_table(session)
+            print(f"{TABLE}: ready")
+        elif command == "refresh":
+            started = time.perf_counter()
+            n = await refresh(session)
+            print(f"{TABLE}: {n} row(s) upserted in {time.perf_counter() - started:.2f}s")
+        else:
+            raise SystemExit(f"Unknown command: {command} (expected create or refresh)")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "refresh"))
@@ -0,0 +1,204 @@
+"""Per-period reductions — what a card is assembled from.
+
+PeriodAccumulator folds rows one at a time in bounded memory (per signal
+O(1), per day one counter), so the same code serves in-memory row lists,
+streamed batches and long export/backfill jobs. Results match
+features.aggregate / trailing_average / tracking_consistency exactly.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, AsyncIterator, Iterable
+
+from app.kernel import extractor, features
+from app.kernel.series import SignalSeries
+from app.kernel.signal_map import SIGNAL_CONFIG, list_signals
+
+
+@dataclass(slots=True)
+class PeriodStats:
+    """Per-period reductions a card is assembled from (row path or SQL path)."""
+
+    row_count: int = 0
+    earliest: date | None = None
+    latest: date | None = None
+    tracking: float = 0.0  # tracking_consistency ratio
+    partial_days: list[str] = field(default_factory=list)
+    values: dict[str, float | None] = field(default_factory=dict)  # per SignalConfig.agg
+    means: dict[str, float | None] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+class SignalAccumulator:
+    """Running state for one signal — equivalent to features.aggregate on the full list."""
+
+    __slots__ = ("agg", "count", "_total", "_compensation", "min", "max", "last")
+
+    def __init__(self, agg: str) -> None:
+        self.agg = agg
+        self.count = 0
+        self._total = 0.0
+        self._compensation = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.last: float | None = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        # Neumaier-compensated, step for step as sum() over floats (Python >= 3.12)
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.last = value
+
+    @property
+    def total(self) -> float:
+        c = self._compensation
+        return self._total + c if c and math.isfinite(c) else self._total
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    @property
+    def value(self) -> float | None:
+        if not self.count:
+            return None
+        if self.agg == "sum":
+            return self.total
+        if self.agg == "max":
+            return self.max
+        if self.agg == "min":
+            return self.min
+        if self.agg == "last":
+            return self.last
+        # avg and unknown methods
+        return self.mean
+
+
+class PeriodAccumulator:
+    """Fold health_connect_daily rows (raw or projected) into PeriodStats."""
+
+    def __init__(self, projected: bool = False) -> None:
+        self.projected = projected
+        self.row_count = 0
+        self.tracked_days = 0
+        self.earliest: date | None = None
+        self.latest: date | None = None
+        self.day_counts: dict[str, int] = {}
+        self.signals = {name: SignalAccumulator(cfg.agg) for name, cfg in SIGNAL_CONFIG.items()}
+
+    def add(self, row: dict[str, Any]) -> None:
+        self.row_count += 1
+        d = row["date"]
+        if self.earliest is None or d < self.earliest:
+            self.earliest = d
+        if self.latest is None or d > self.latest:
+            self.latest = d
+        day_key = d.isoformat()
+        self.day_counts[day_key] = self.day_counts.get(day_key, 0) + 1
+        if self.projected:
+            values = extractor.extract_projected_signals(row)
+            tracked = features.is_manually_tracked(row)
+        else:
+            values, tracked = extractor.extract_row(row)
+        if tracked:
+            self.tracked_days += 1
+        for name, v in values.items():
+            self.signals[name].add(v)
+
+    def add_many(self, rows: Iterable[dict[str, Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def stats(self, expected_days: int) -> PeriodStats:
+        out = PeriodStats(row_count=self.row_count, earliest=self.earliest, latest=self.latest)
+        if self.row_count:
+            out.tracking = features.coverage_ratio(self.tracked_days, expected_days)
+            out.partial_days = features.partial_days_from_counts(self.day_counts)
+        for name in list_signals():
+            acc = self.signals[name]
+            out.values[name] = acc.value
+            out.means[name] = acc.mean
+            out.counts[name] = acc.count
+        return out
+
+
+def stats_from_rows(
+    rows: Iterable[dict[str, Any]],
+    expected_days: int,
+    projected: bool = False,
+) -> PeriodStats:
+    acc = PeriodAccumulator(projected)
+    acc.add_many(rows)
+    return acc.stats(expected_days)
+
+
+def stats_from_series(
+    series: SignalSeries,
+    expected_days: int,
+    vectorized: bool = False,
+) -> PeriodStats:
+    """PeriodStats from a (sliced) SignalSeries — same result as stats_from_rows.
+
+    vectorized reduces all signals at once with features_np (needs numpy).
+    """
+    out = PeriodStats(row_count=len(series), earliest=series.earliest, latest=series.latest)
+    if len(series):
+        out.tracking = features.coverage_ratio(series.tracked_days(), expected_days)
+        out.partial_days = features.partial_days_from_counts(series.day_counts())
+    if vectorized:
+        from app.kernel import features_np
+
+        names = list_signals()
+        cols = features_np.stats_from_series(series, names, [SIGNAL_CONFIG[n].agg for n in names])
+        out.values = dict(zip(names, cols["values"]))
+        out.means = dict(zip(names, cols["means"]))
+        out.counts = dict(zip(names, cols["counts"]))
+        return out
+    for name in list_signals():
+        values = series.values(name)
+        out.values[name] = series.aggregate(name, SIGNAL_CONFIG[name].agg)
+        out.means[name] = features.trailing_average(values)
+        out.counts[name] = len(values)
+    return out
+
+
+async def stats_from_stream(
+    batches: AsyncIterator[list[dict[str, Any]]],
+    expected_days: int,
+    projected: bool = False,
+) -> PeriodStats:
+    """Consume connector.stream_daily_rows batch by batch; only one batch is held at a time."""
+    acc = PeriodAccumulator(projected)
+    async for batch in batches:
+        acc.add_many(batch)
+    return acc.stats(expected_days)
+
+
+def stats_from_aggregate(agg: dict[str, Any] | None, expected_days: int) -> PeriodStats:
+    """PeriodStats from one connector.fetch_period_aggregates period row."""
+    if not agg:
+        return PeriodStats()
+    out = PeriodStats(
+        row_count=agg["row_count"],
+        earliest=agg["earliest"],
+        latest=agg["latest"],
+        tracking=features.coverage_ratio(agg["tracked_days"], expected_days),
+        partial_days=list(agg.get("partial_days") or []),
+    )
+    for name in list_signals():
+        out.values[name] = agg.get(f"{name}__value")
+        out.means[name] = agg.get(f"{name}__mean")
+        out.counts[name] = agg.get(f"{name}__n") or 0
+    return out
@@ -1,10 +1,50 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app import metrics
+from app.config import settings
+from app.db import async_session, close_pg_pool, engine, read_engine
+from app.kernel.cache import card_cache
+from app.kernel.prewarm import PrewarmScheduler
 from app.kernel.router import router as kernel_router
+from app.timing import ServerTimingMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = None
+    if settings.kernel_prewarm and not card_cache.enabled and not settings.kernel_card_store:
+        logger.warning("KERNEL_PREWARM ignored: enable KERNEL_CARD_CACHE_SIZE or KERNEL_CARD_STORE to keep warmed cards")
+    elif settings.kernel_prewarm:
+        scheduler = PrewarmScheduler(
+            async_session,
+            settings.default_tz,
+            poll_seconds=settings.kernel_prewarm_poll_seconds,
+            midnight_delay_seconds=settings.kernel_prewarm_midnight_delay_seconds,
+            active_days=settings.kernel_prewarm_active_days,
+        )
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    await close_pg_pool()
 
-app = FastAPI(title="ContextKernel", version="0.1.0")
+
+app = FastAPI(title="ContextKernel", version="0.1.0", lifespan=lifespan)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)  # outermost: shares its timing collector
 app.include_router(kernel_router)
 
+if settings.kernel_metrics:
+    metrics.instrument_engine(engine, "primary")
+    if read_engine is not None:
+        metrics.instrument_engine(read_engine, "replica")
+
 
 @app.get("/")
 async def root() -> dict:
@@ -12,11 +52,14 @@ async def root() -> dict:
         "status": "ok",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
         "kernel": {
             "presets": "/kernel/presets",
             "presets_detail": "/kernel/presets/{id}",
             "presets_run": "/kernel/presets/{id}/run",
             "cards": "/kernel/cards/{type}",
+            "timeseries": "/kernel/timeseries/{type}",
+            "cache": "/kernel/cache",
             "goals": "/kernel/goals",
             "goals_progress": "/kernel/goals/progress",
         },
@@ -26,3 +69,11 @@ async def root() -> dict:
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus text exposition (KERNEL_METRICS)."""
+    if not settings.kernel_metrics:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (KERNEL_METRICS)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,272 @@
+"""In-process Prometheus metrics (KERNEL_METRICS), served at /metrics in text format.
+
+Fixed-bucket histograms behind a dict lookup and a bisect,
+no client library. MetricsMiddleware records per-route latency and response
+bytes, plus the request's timing stages (fetch, extract, features, ...; see
+app.timing) per card_type. Builders report rows per card, SQLAlchemy cursor
+events report DB query time, and pool and card-cache numbers are read at
+scrape time.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import timing
+from app.config import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 7, 14, 31, 62, 93, 186, 366, 731, 1461, 3653)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[Any], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Fixed upper bounds; per label set: per-bucket counts (made cumulative on render), sum, count."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[Labels, list] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, labels: Labels = ()) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, n) in self._series.items():
+            cumulative = 0
+            for bound, c in zip((*self.buckets, float("inf")), counts):
+                cumulative += c
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {n}")
+        return lines
+
+
+class CallbackMetric:
+    """Values read at scrape time: collect() -> {label values: value}."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: str,
+        labelnames: Labels,
+        collect: Callable[[], dict[Labels, float]],
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.collect().items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "kernel_request_duration_seconds",
+    "HTTP request latency by route template and card_type.",
+    ("method", "route", "card_type", "status"),
+)
+RESPONSE_BYTES = Histogram(
+    "kernel_response_bytes",
+    "HTTP response body size by route template.",
+    ("route",),
+    BYTE_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "kernel_stage_duration_seconds",
+    "Time per request stage (fetch, extract, reduce, features, envelope, handler, render, ...).",
+    ("stage", "card_type"),
+)
+CARD_ROWS = Histogram(
+    "kernel_card_rows",
+    "Rows read per built card (target + baseline).",
+    ("card_type",),
+    ROW_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "kernel_db_query_duration_seconds",
+    "SQLAlchemy statement execution time by engine.",
+    ("engine",),
+)
+
+
+def _pool_connections() -> dict[Labels, float]:
+    from app import db
+
+    out: dict[Labels, float] = {}
+    for label, engine in (("primary", db.engine), ("replica", db.read_engine)):
+        pool = engine.pool if engine is not None else None
+        if pool is not None and hasattr(pool, "checkedout"):
+            out[(label, "in_use")] = pool.checkedout()
+            out[(label, "idle")] = pool.checkedin()
+    native = db._pg_pool
+    if native is not None:
+        idle = native.get_idle_size()
+        out[("asyncpg", "in_use")] = native.get_size() - idle
+        out[("asyncpg", "idle")] = idle
+    return out
+
+
+def _card_cache() -> dict[Labels, float]:
+    from app.kernel.cache import card_cache
+
+    return {
+        ("hit",): card_cache.hits,
+        ("miss",): card_cache.misses,
+        ("stale",): card_cache.stale,
+        ("eviction",): card_cache.evictions,
+    }
+
+
+REGISTRY: list[Histogram | CallbackMetric] = [
+    REQUEST_SECONDS,
+    RESPONSE_BYTES,
+    STAGE_SECONDS,
+    CARD_ROWS,
+    DB_QUERY_SECONDS,
+    CallbackMetric(
+        "kernel_db_pool_connections",
+        "Connections per pool by state.",
+        "gauge",
+        ("engine", "state"),
+        _pool_connections,
+    ),
+    CallbackMetric(
+        "kernel_card_cache_events_total",
+        "In-process card cache hits, misses (stale: the subset dropped for a moved watermark or TTL) and LRU evictions.",
+        "counter",
+        ("event",),
+        _card_cache,
+    ),
+]
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def observe_card_rows(card_type: str, rows: int) -> None:
+    if settings.kernel_metrics:
+        CARD_ROWS.observe(rows, (card_type,))
+
+
+def instrument_engine(engine: Any, label: str) -> None:
+    """Time every statement on an AsyncEngine via cursor-execute events."""
+    from sqlalchemy import event
+
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("kernel_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["kernel_query_started"].pop()
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, (label,))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # failed statements never reach after_cursor_execute
+        stack = context.connection.info.get("kernel_query_started") if context.connection else None
+        if stack:
+            stack.pop()
+
+
+def _card_type_label(scope: Scope) -> str:
+    """Known card types only; anything else in the path would mint a new series per request."""
+    from app.kernel.router import CARD_BUILDERS
+
+    card_type = scope.get("path_params", {}).get("card_type")
+    if card_type is None:
+        return ""
+    return card_type if card_type in CARD_BUILDERS else "other"
+
+
+class MetricsMiddleware:
+    """Per-request latency, response bytes and stage timings while KERNEL_METRICS is on."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.kernel_metrics:
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = timing.install()
+        started = time.perf_counter()
+        status = 500
+        body_bytes = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            timing.uninstall(token)
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            card_type = _card_type_label(scope)
+            REQUEST_SECONDS.observe(elapsed, (scope["method"], route_path, card_type, str(status)))
+            RESPONSE_BYTES.observe(body_bytes, (route_path,))
+            for stage, seconds in timings.stages.items():
+                if stage != "total":
+                    STAGE_SECONDS.observe(seconds, (stage, card_type))
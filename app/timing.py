@@ -0,0 +1,148 @@
+"""Per-request stage timings, emitted as a Server-Timing header (KERNEL_SERVER_TIMING).
+
+ServerTimingMiddleware installs a Timings collector in a context variable for
+each request; span()/start()/stop() add elapsed time per stage name to it.
+Without a collector (the default) they reduce to one ContextVar lookup, and
+the middleware passes requests straight through. Durations of the same stage
+accumulate, so concurrent work (preset cards) can sum to more than wall time.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class Timings:
+    """Seconds spent per stage, in first-seen order."""
+
+    __slots__ = ("stages",)
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def milliseconds(self) -> dict[str, float]:
+        return {name: round(seconds * 1000.0, 3) for name, seconds in self.stages.items()}
+
+    def header(self) -> str:
+        """Server-Timing value, e.g. 'fetch;dur=12.30, extract;dur=1.05'."""
+        return ", ".join(f"{name};dur={seconds * 1000.0:.2f}" for name, seconds in self.stages.items())
+
+
+_current: ContextVar[Timings | None] = ContextVar("timings", default=None)
+
+
+def current() -> Timings | None:
+    return _current.get()
+
+
+def install() -> tuple[Timings, Token | None]:
+    """The request's collector, created unless an outer middleware already installed one."""
+    existing = _current.get()
+    if existing is not None:
+        return existing, None
+    timings = Timings()
+    return timings, _current.set(timings)
+
+
+def uninstall(token: Token | None) -> None:
+    if token is not None:
+        _current.reset(token)
+
+
+def start() -> float:
+    return time.perf_counter() if _current.get() is not None else 0.0
+
+
+def stop(name: str, started: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, time.perf_counter() - started)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    started = start()
+    try:
+        yield
+    finally:
+        stop(name, started)
+
+
+def timed(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Record an async function's duration as stage `name` (signature preserved for FastAPI)."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            started = start()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                stop(name, started)
+
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """Adds Server-Timing and logs stage timings per HTTP request while KERNEL_SERVER_TIMING is on.
+
+    "render" is total minus "handler": request validation plus response
+    serialisation (FastAPI renders the body before the response starts).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.kernel_server_timing:
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = install()
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - started
+                if "handler" in timings.stages:
+                    timings.add("render", max(0.0, total - timings.stages["handler"]))
+                timings.add("total", total)
+                MutableHeaders(scope=message).append("Server-Timing", timings.header())
+                _log(scope, message["status"], timings)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            uninstall(token)
+
+
+def _log(scope: Scope, status: int, timings: Timings) -> None:
+    stages = timings.milliseconds()
+    logger.info(
+        "%s %s %d %s",
+        scope["method"],
+        scope["path"],
+        status,
+        " ".join(f"{name}_ms={ms}" for name, ms in stages.items()),
+        extra={"method": scope["method"], "path": scope["path"], "status": status, "timings_ms": stages},
+    )
@@ -0,0 +1,100 @@
+"""Benchmark per-row signal extraction on a realistic raw_data row.
+
+Compares the original extractor (a dot-path split and resolved per signal per
+row, reproduced below as the reference), precompiled per-signal accessors
+(extractor.SIGNAL_ACCESSORS) and the single-pass trie extractor
+(extractor.extract_row). The first two also run features.is_manually_tracked.
+
+    python -m benchmarks.bench_extract [rows]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from datetime import date
+from typing import Any
+
+from app.kernel import extractor, features
+from app.kernel.signal_map import SIGNAL_CONFIG, get_signal_config, list_signals
+from benchmarks.bench_json_decode import RAW_DATA
+
+ROW = {"device_id": "d4593c8e-26ff-4f3f-b056-fc2bb715fbc2", "date": date(2026, 2, 17), "raw_data": RAW_DATA}
+
+
+# The extractor before precompiled paths, as shipped
+def _resolve_path(data: Any, path: str) -> Any:
+    current = data
+    for part in path.split("."):
+        if isinstance(current, dict):
+            current = current.get(part)
+        elif isinstance(current, (list, tuple)):
+            try:
+                current = current[int(part)]
+            except (ValueError, IndexError):
+                return None
+        else:
+            return None
+    return current
+
+
+def _original_signal(row: dict[str, Any], config) -> float | None:
+    try:
+        col_val = row.get(config.column)
+        if config.path is None:
+            raw = col_val
+        else:
+            if col_val is None or not isinstance(col_val, (dict, list)):
+                return None
+            raw = _resolve_path(col_val, config.path)
+        return extractor._to_float(raw)
+    except Exception:
+        return None
+
+
+def _original(row):
+    out = {}
+    for name in list_signals():
+        cfg = get_signal_config(name)
+        if cfg is None:
+            continue
+        val = _original_signal(row, cfg)
+        if val is not None:
+            out[name] = val
+    return out, features.is_manually_tracked(row)
+
+
+def _per_signal(row):
+    out = {}
+    for name, accessor in extractor.SIGNAL_ACCESSORS:
+        val = accessor(row)
+        if val is not None:
+            out[name] = val
+    return out, features.is_manually_tracked(row)
+
+
+def _time(extract, rows: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rows):
+        extract(ROW)
+    return time.perf_counter() - start
+
+
+def main(rows: int = 100_000) -> None:
+    candidates = {
+        "original (path split per row)": _original,
+        "per-signal accessors": _per_signal,
+        "single-pass trie": extractor.extract_row,
+    }
+    expected = _original(ROW)
+    baseline = None
+    print(f"{rows} rows x {len(SIGNAL_CONFIG)} signals")
+    for label, extract in candidates.items():
+        assert extract(ROW) == expected, label
+        elapsed = _time(extract, rows)
+        baseline = baseline or elapsed
+        print(f"{label:32s} {elapsed * 1e6 / rows:7.2f} us/row  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
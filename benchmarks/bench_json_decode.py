@@ -0,0 +1,94 @@
+"""Benchmark jsonb decoding of realistic raw_data documents.
+
+Compares SQLAlchemy's default asyncpg codec (bytes -> str -> json.loads) with
+the codecs app.db registers for each KERNEL_JSON_DECODER value. The payload
+mirrors the sample row in db-findings.md.
+
+    python -m benchmarks.bench_json_decode [rows]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+
+from app.db import json_loader
+
+RAW_DATA = {
+    "date": "2026-02-17",
+    "schema_version": 1,
+    "source": {
+        "device_id": "d4593c8e-26ff-4f3f-b056-fc2bb715fbc2",
+        "collected_at": "2026-02-17T16:11:04Z",
+    },
+    "steps_total": 534,
+    "distance_meters": 233.74,
+    "total_calories_burned": 1565.07,
+    "body_metrics": {
+        "weight_kg": 129.97,
+        "body_fat_percentage": 40.8,
+        "body_water_percentage": 32.2,
+        "bmr_kcal": None,
+        "height_cm": 193,
+    },
+    "heart_rate_summary": {"avg_hr": 60, "max_hr": 112, "min_hr": 49, "resting_hr": 60},
+    "sleep_sessions": [
+        {
+            "start_time": "2026-02-17T03:13:00Z",
+            "end_time": "2026-02-17T08:53:00Z",
+            "duration_minutes": 340,
+        }
+    ],
+    "nutrition_summary": {
+        "calories_total": 380,
+        "protein_grams": 4.0,
+        "carbohydrates_grams": 54.0,
+        "total_fat_grams": 18.0,
+        "fiber_grams": 2.0,
+        "sugar_grams": 34.0,
+    },
+    "exercise_sessions": None,
+    "oxygen_saturation_percentage": 97.5,
+}
+
+# jsonb binary wire format: \x01 version byte + JSON text
+WIRE_VALUE = b"\x01" + json.dumps(RAW_DATA).encode()
+
+
+def _sqlalchemy_default(bin_value: bytes):
+    return json.loads(bin_value[1:].decode())
+
+
+def _codec(name: str):
+    loads = json_loader(name)
+    return lambda bin_value: loads(bin_value[1:])
+
+
+def _time(decode, rows: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rows):
+        decode(WIRE_VALUE)
+    return time.perf_counter() - start
+
+
+def main(rows: int = 100_000) -> None:
+    candidates = {"sqlalchemy default": _sqlalchemy_default}
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            candidates[f"KERNEL_JSON_DECODER={name}"] = _codec(name)
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    expected = _sqlalchemy_default(WIRE_VALUE)
+    baseline = None
+    print(f"{rows} rows x {len(WIRE_VALUE)} bytes")
+    for label, decode in candidates.items():
+        assert decode(WIRE_VALUE) == expected, label
+        elapsed = _time(decode, rows)
+        baseline = baseline or elapsed
+        print(f"{label:32s} {elapsed * 1e6 / rows:7.2f} us/row  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
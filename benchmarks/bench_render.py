@@ -0,0 +1,83 @@
+"""Benchmark card envelope construction and JSON rendering.
+
+Builds a monthly_overview card from 120 days of the sample raw_data row, then
+times envelope construction (validated vs model_construct) and rendering
+(FastAPI's default validate-then-dump_json path vs the precompiled
+TypeAdapter used by KERNEL_FAST_RENDER, and orjson when installed).
+
+    python -m benchmarks.bench_render [iterations]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from app.kernel import render
+from app.kernel.builders import build_card
+from app.kernel.models import CardEnvelope
+from app.kernel.series import SignalSeries
+from benchmarks.bench_json_decode import RAW_DATA
+
+MONTH = date(2026, 2, 1)
+ROWS = [
+    {"device_id": "d4593c8e-26ff-4f3f-b056-fc2bb715fbc2", "date": MONTH - timedelta(days=i), "raw_data": RAW_DATA}
+    for i in range(-27, 93)
+]
+
+
+SERIES = SignalSeries.from_rows(ROWS)
+LOOP = asyncio.new_event_loop()
+
+
+def _build(fast: bool) -> CardEnvelope:
+    with patch("app.kernel.builders.settings.kernel_fast_render", fast):
+        return LOOP.run_until_complete(build_card(None, "monthly_overview", MONTH, prefetched=SERIES))
+
+
+def _time(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return time.perf_counter() - start
+
+
+def _report(title: str, candidates: dict, iterations: int) -> None:
+    print(title)
+    baseline = None
+    for label, func in candidates.items():
+        elapsed = _time(func, iterations)
+        baseline = baseline or elapsed
+        print(f"  {label:40s} {elapsed * 1e6 / iterations:8.2f} us  {baseline / elapsed:5.2f}x")
+
+
+def main(iterations: int = 2_000) -> None:
+    card = _build(False)
+
+    _report(
+        "build (monthly_overview, 120 rows)",
+        {"validated models": lambda: _build(False), "KERNEL_FAST_RENDER (model_construct)": lambda: _build(True)},
+        max(1, iterations // 10),
+    )
+
+    expected = render.CARD.dump_json(card, by_alias=True)
+    candidates = {
+        "FastAPI default (validate + dump_json)": lambda: render.CARD.dump_json(
+            render.CARD.validate_python(card, from_attributes=True), by_alias=True
+        ),
+        "KERNEL_FAST_RENDER (TypeAdapter)": lambda: render.CARD.dump_json(card, by_alias=True),
+    }
+    try:
+        import orjson
+
+        candidates["orjson(model_dump)"] = lambda: orjson.dumps(card.model_dump(mode="json", by_alias=True))
+    except ImportError:
+        print("orjson: not installed, skipped")
+    _report(f"render ({len(expected)} bytes)", candidates, iterations)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
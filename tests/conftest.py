@@ -7,7 +7,7 @@ from typing import Any
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from app.db import get_session
+from app.db import get_session, get_session_factory
 from app.main import app
 
 
@@ -24,6 +24,9 @@ class FakeSession:
     async def execute(self, stmt, params=None):
         return FakeResult(self._rows)
 
+    async def stream(self, stmt, params=None, **kwargs):
+        return FakeStreamResult(self._rows)
+
     async def __aenter__(self):
         return self
 
@@ -43,6 +46,13 @@ class FakeResult:
         return [tuple(r[k] for k in self._keys) for r in self._rows]
 
 
+class FakeStreamResult(FakeResult):
+    async def partitions(self, size):
+        rows = self.fetchall()
+        for i in range(0, len(rows), size):
+            yield rows[i:i + size]
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -60,6 +70,7 @@ def override_session(fake_session):
         yield fake_session
 
     app.dependency_overrides[get_session] = _override
+    app.dependency_overrides[get_session_factory] = lambda: (lambda: fake_session)
     yield fake_session
     app.dependency_overrides.clear()
 
@@ -90,3 +101,11 @@ def make_daily_row(
         "nutrition_summary": nutrition_summary or {},
     }
     return {"device_id": device_id, "date": d, "raw_data": raw}
+
+
+def fake_fetch(rows: list[dict[str, Any]]):
+    """Build a fetch_daily_rows stand-in that honours [start, end_exclusive) and date order."""
+    async def _fetch(session, start, end_exclusive, device_id=None):
+        return sorted((r for r in rows if start <= r["date"] < end_exclusive), key=lambda r: r["date"])
+
+    return _fetch
@@ -2,19 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
 from datetime import date, timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.kernel.builders import (
+    build_card,
     build_daily_summary,
     build_monthly_overview,
+    build_preset_cards,
+    build_timeseries,
     build_weekly_overview,
+    card_periods,
+    count_periods,
 )
 from app.kernel.models import Granularity
+from app.kernel.signal_map import list_signals
 
-from tests.conftest import make_daily_row
+from tests.conftest import FakeSession, fake_fetch, make_daily_row
 
 
 def _target_rows(d: date, steps_total: int = 2530, avg_hr: int = 76) -> list[dict]:
@@ -49,12 +57,8 @@ class TestBuildDailySummary:
             for i in range(1, 8)
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return baseline_rows
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows + baseline_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         assert env.card_type == "daily_summary"
@@ -69,12 +73,8 @@ class TestBuildDailySummary:
         session = AsyncMock()
         target_rows = _target_rows(date(2026, 2, 15), avg_hr=72)
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         hr_sig = next((s for s in env.signals if s.record_type == "avg_hr"), None)
@@ -84,6 +84,46 @@ class TestBuildDailySummary:
         assert hr_sig.delta is None
 
 
+    @pytest.mark.asyncio
+    async def test_single_fetch_covers_baseline_and_target(self):
+        session = AsyncMock()
+        target_rows = _target_rows(date(2026, 2, 15), steps_total=2530)
+        baseline_rows = [make_daily_row(date(2026, 2, 10), steps_total=8000)]
+
+        fetch = AsyncMock(side_effect=fake_fetch(target_rows + baseline_rows))
+        with patch("app.kernel.builders.connector.fetch_daily_rows", fetch):
+            env = await build_daily_summary(session, date(2026, 2, 15))
+
+        fetch.assert_awaited_once()
+        _, start, end_exclusive, _ = fetch.await_args.args
+        assert start == date(2026, 2, 8)
+        assert end_exclusive == date(2026, 2, 16)
+        steps_sig = next(s for s in env.signals if s.record_type == "steps_total")
+        assert steps_sig.value == 2530.0
+        assert steps_sig.baseline == 8000.0
+        assert env.evidence.total_rows == 1
+
+
+    @pytest.mark.asyncio
+    async def test_projected_mode(self):
+        session = AsyncMock()
+        rows = [
+            {"device_id": "d", "date": date(2026, 2, 14), "steps_total": 8000.0, "manual_tracked": False},
+            {"device_id": "d", "date": date(2026, 2, 15), "steps_total": 2530.0, "manual_tracked": True},
+        ]
+        with (
+            patch("app.kernel.builders.settings.kernel_signal_projection", True),
+            patch("app.kernel.builders.connector.fetch_projected_rows", side_effect=fake_fetch(rows)),
+        ):
+            env = await build_daily_summary(session, date(2026, 2, 15))
+
+        steps_sig = next(s for s in env.signals if s.record_type == "steps_total")
+        assert steps_sig.value == 2530.0
+        assert steps_sig.baseline == 8000.0
+        tc = next(s for s in env.signals if s.record_type == "tracking_consistency")
+        assert tc.value == 1.0
+
+
 class TestBuildWeeklyOverview:
     @pytest.mark.asyncio
     async def test_zero_data(self):
@@ -98,12 +138,8 @@ class TestBuildWeeklyOverview:
         session = AsyncMock()
         rows = _target_rows(date(2026, 2, 10), steps_total=5000)
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 9):
-                return rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_weekly_overview(session, date(2026, 2, 9))
 
         assert len(env.coverage.signals) >= 1
@@ -126,14 +162,398 @@ class TestBuildMonthlyOverview:
             make_daily_row(date(2026, 2, 11), steps_total=300),
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 1):
-                return rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_monthly_overview(session, 2026, 2)
 
         steps_sig = next((s for s in env.signals if s.record_type == "steps_total"), None)
         assert steps_sig is not None
         assert steps_sig.value == 700.0  # sum
+
+
+class TestStreamingPath:
+    @pytest.mark.asyncio
+    async def test_matches_list_path(self):
+        rows = [
+            make_daily_row(date(2026, 2, 15) - timedelta(days=i), steps_total=1000 * i)
+            for i in range(0, 8)
+        ]
+        session = FakeSession(sorted(rows, key=lambda r: r["date"]))
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)):
+            list_env = await build_daily_summary(session, date(2026, 2, 15))
+        with patch("app.kernel.builders.settings.kernel_stream_batch_size", 3):
+            stream_env = await build_daily_summary(session, date(2026, 2, 15))
+
+        exclude = {"id", "generated_at"}
+        assert stream_env.model_dump(exclude=exclude) == list_env.model_dump(exclude=exclude)
+
+
+    @pytest.mark.asyncio
+    async def test_float_values_match_list_path(self):
+        rng = random.Random(3)
+        rows = [
+            make_daily_row(
+                date(2026, 1, 1) + timedelta(days=i),
+                steps_total=rng.uniform(0, 15000),
+                heart_rate_summary={"avg_hr": rng.uniform(55, 90)},
+            )
+            for i in range(120)
+        ]
+        session = FakeSession(rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)):
+            list_env = await build_monthly_overview(session, 2026, 4)
+        with patch("app.kernel.builders.settings.kernel_stream_batch_size", 7):
+            stream_env = await build_monthly_overview(session, 2026, 4)
+
+        exclude = {"id", "generated_at"}
+        assert stream_env.model_dump(exclude=exclude) == list_env.model_dump(exclude=exclude)
+
+
+class TestNativeBackend:
+    @pytest.mark.asyncio
+    async def test_uses_asyncpg_pool(self):
+        rows = _target_rows(date(2026, 2, 15), steps_total=2530)
+        fetch_records = AsyncMock(return_value=rows)
+        with (
+            patch("app.kernel.builders.settings.kernel_connector_backend", "asyncpg"),
+            patch("app.kernel.builders.get_pg_pool", AsyncMock(return_value=object())),
+            patch("app.kernel.builders.connector.fetch_daily_records", fetch_records),
+            patch("app.kernel.builders.connector.fetch_daily_rows") as fetch_rows,
+        ):
+            env = await build_daily_summary(AsyncMock(), date(2026, 2, 15))
+
+        fetch_records.assert_awaited_once()
+        fetch_rows.assert_not_called()
+        steps_sig = next(s for s in env.signals if s.record_type == "steps_total")
+        assert steps_sig.value == 2530.0
+
+
+class TestSignalTablePath:
+    @pytest.mark.asyncio
+    async def test_reads_signal_table_when_fresh(self):
+        rows = [
+            {"device_id": "d", "date": date(2026, 2, 14), "steps_total": 8000.0, "manual_tracked": False},
+            {"device_id": "d", "date": date(2026, 2, 15), "steps_total": 2530.0, "manual_tracked": True},
+        ]
+        with (
+            patch("app.kernel.builders.settings.kernel_signal_table", True),
+            patch("app.kernel.builders.signal_table.is_fresh", AsyncMock(return_value=True)),
+            patch("app.kernel.builders.connector.fetch_signal_rows", side_effect=fake_fetch(rows)),
+            patch("app.kernel.builders.connector.fetch_daily_rows") as fetch_rows,
+        ):
+            env = await build_daily_summary(AsyncMock(), date(2026, 2, 15))
+
+        fetch_rows.assert_not_called()
+        steps_sig = next(s for s in env.signals if s.record_type == "steps_total")
+        assert steps_sig.value == 2530.0
+        assert steps_sig.baseline == 8000.0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_stale(self):
+        rows = _target_rows(date(2026, 2, 15), steps_total=2530)
+        with (
+            patch("app.kernel.builders.settings.kernel_signal_table", True),
+            patch("app.kernel.builders.signal_table.is_fresh", AsyncMock(return_value=False)),
+            patch("app.kernel.builders.connector.fetch_signal_rows") as fetch_table,
+            patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)),
+        ):
+            env = await build_daily_summary(AsyncMock(), date(2026, 2, 15))
+
+        fetch_table.assert_not_called()
+        assert next(s for s in env.signals if s.record_type == "steps_total").value == 2530.0
+
+
+class TestSqlAggregationPath:
+    """SQL-side aggregation must reproduce the row path's card."""
+
+    _rows = [
+        make_daily_row(date(2026, 1, 20), steps_total=6000, body_metrics={"weight_kg": 131.0}),
+        make_daily_row(date(2026, 2, 10), steps_total=400, body_metrics={"weight_kg": 130.5}),
+        make_daily_row(date(2026, 2, 11), steps_total=300, nutrition_summary={"calories_total": 1800}),
+    ]
+
+    @staticmethod
+    def _aggregates() -> dict:
+        def period(row_count, earliest, latest, tracked_days, **signals):
+            out = {
+                "row_count": row_count,
+                "earliest": earliest,
+                "latest": latest,
+                "tracked_days": tracked_days,
+                "partial_days": None,
+            }
+            for name in list_signals():
+                value, mean, n = signals.get(name, (None, None, 0))
+                out[f"{name}__value"] = value
+                out[f"{name}__mean"] = mean
+                out[f"{name}__n"] = n
+            return out
+
+        return {
+            "baseline": period(
+                1, date(2026, 1, 20), date(2026, 1, 20), 1,
+                steps_total=(6000.0, 6000.0, 1), weight_kg=(131.0, 131.0, 1),
+            ),
+            "target": period(
+                2, date(2026, 2, 10), date(2026, 2, 11), 2,
+                steps_total=(700.0, 350.0, 2),
+                weight_kg=(130.5, 130.5, 1),
+                calories_total=(1800.0, 1800.0, 1),
+            ),
+        }
+
+    @staticmethod
+    def _comparable(env) -> dict:
+        return env.model_dump(exclude={"id", "generated_at"})
+
+    @pytest.mark.asyncio
+    async def test_matches_row_path(self):
+        session = AsyncMock()
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(self._rows)):
+            row_env = await build_monthly_overview(session, 2026, 2)
+
+        fetch_aggs = AsyncMock(return_value=self._aggregates())
+        with (
+            patch("app.kernel.builders.settings.kernel_sql_aggregation_min_days", 28),
+            patch("app.kernel.builders.connector.fetch_period_aggregates", fetch_aggs),
+        ):
+            sql_env = await build_monthly_overview(session, 2026, 2)
+
+        fetch_aggs.assert_awaited_once()
+        assert self._comparable(sql_env) == self._comparable(row_env)
+
+    @pytest.mark.asyncio
+    async def test_short_range_keeps_row_path(self):
+        session = AsyncMock()
+        fetch_aggs = AsyncMock(return_value={})
+        with (
+            patch("app.kernel.builders.settings.kernel_sql_aggregation_min_days", 28),
+            patch("app.kernel.builders.connector.fetch_period_aggregates", fetch_aggs),
+            patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]),
+        ):
+            await build_daily_summary(session, date(2026, 2, 15))
+        fetch_aggs.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_no_target_period(self):
+        session = AsyncMock()
+        with (
+            patch("app.kernel.builders.settings.kernel_sql_aggregation_min_days", 28),
+            patch("app.kernel.builders.connector.fetch_period_aggregates", return_value={}),
+        ):
+            env = await build_monthly_overview(session, 2026, 2)
+        assert any("No data" in w for w in env.warnings)
+
+
+class TestVectorizedFeatures:
+    @pytest.mark.asyncio
+    async def test_matches_python_features(self):
+        pytest.importorskip("numpy")
+        # binary-exact values, so pairwise and compensated sums agree exactly
+        rows = [
+            make_daily_row(
+                date(2026, 2, 15) - timedelta(days=i),
+                steps_total=1000 * i + 7,
+                body_metrics={"weight_kg": 130.5 - i * 0.25},
+                nutrition_summary={"calories_total": 2000 + 50 * i},
+            )
+            for i in range(0, 8)
+        ]
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)):
+            python_env = await build_daily_summary(FakeSession(), date(2026, 2, 15))
+            with patch("app.kernel.builders.settings.kernel_vectorized_features", True):
+                numpy_env = await build_daily_summary(FakeSession(), date(2026, 2, 15))
+
+        exclude = {"id", "generated_at"}
+        assert numpy_env.model_dump(exclude=exclude) == python_env.model_dump(exclude=exclude)
+
+
+class TestTimeseries:
+    def _rows(self) -> list[dict]:
+        return [
+            make_daily_row(
+                date(2026, 1, 1) + timedelta(days=i),
+                steps_total=500 * (i % 9),
+                body_metrics={"weight_kg": 131.0 - i * 0.125} if i % 4 else {},
+                nutrition_summary={"calories_total": 1800 + 40 * (i % 5)} if i % 3 else {},
+            )
+            for i in range(70)
+            if i % 10 != 4
+        ]
+
+    @pytest.mark.asyncio
+    async def test_matches_individual_cards_with_one_fetch(self):
+        rows = self._rows()
+        calls = []
+        base_fetch = fake_fetch(rows)
+
+        async def fetch(session, start, end_exclusive, device_id=None):
+            calls.append((start, end_exclusive))
+            return await base_fetch(session, start, end_exclusive, device_id)
+
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
+            ts = await build_timeseries(FakeSession(), "daily_summary", date(2026, 2, 1), date(2026, 2, 14))
+            assert calls == [(date(2026, 1, 25), date(2026, 2, 15))]
+            cards = [await build_daily_summary(FakeSession(), d) for d in ts.periods]
+
+        assert len(ts.periods) == 14
+        by_name = {s.record_type: s for s in ts.signals}
+        for i, card in enumerate(cards):
+            assert ts.row_counts[i] == card.evidence.total_rows
+            for sig in card.signals:
+                if sig.record_type == "tracking_consistency":
+                    assert ts.tracking_consistency[i] == sig.value
+                    continue
+                series = by_name[sig.record_type]
+                assert series.values[i] == sig.value
+                assert series.baselines[i] == sig.baseline
+                assert series.deltas[i] == sig.delta
+                if series.status is not None:
+                    assert series.target == sig.target
+                    assert series.target_progress_pct[i] == sig.target_progress_pct
+                    assert (series.status[i], series.trend[i]) == (sig.status, sig.trend)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("card_type", "start", "end"),
+        [
+            ("daily_summary", date(2026, 2, 1), date(2026, 7, 15)),
+            ("weekly_overview", date(2026, 3, 2), date(2026, 7, 6)),
+            ("monthly_overview", date(2026, 4, 1), date(2026, 7, 1)),
+        ],
+    )
+    @pytest.mark.parametrize("vectorized", [False, True])
+    async def test_random_floats_match_cards_exactly(self, card_type, start, end, vectorized):
+        if vectorized:
+            pytest.importorskip("numpy")
+        rng = random.Random(7)
+        rows = []
+        for i in range(200):
+            d = date(2026, 1, 1) + timedelta(days=i)
+            for device in ("phone", "watch")[: rng.randint(1, 2)]:
+                rows.append(
+                    make_daily_row(
+                        d,
+                        device_id=device,
+                        steps_total=rng.uniform(0, 15000),
+                        body_metrics={"weight_kg": rng.uniform(120, 135)},
+                        heart_rate_summary={"avg_hr": rng.uniform(55, 90), "min_hr": rng.uniform(40, 60)},
+                        nutrition_summary={"calories_total": rng.uniform(1500, 3000)},
+                    )
+                )
+
+        with (
+            patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)),
+            patch("app.kernel.builders.settings.kernel_vectorized_features", vectorized),
+        ):
+            ts = await build_timeseries(FakeSession(), card_type, start, end)
+            cards = [await build_card(FakeSession(), card_type, d) for d in ts.periods]
+
+        by_name = {s.record_type: s for s in ts.signals}
+        for i, card in enumerate(cards):
+            for sig in card.signals:
+                if sig.record_type in by_name:
+                    series = by_name[sig.record_type]
+                    assert (series.values[i], series.baselines[i], series.deltas[i]) == (
+                        sig.value, sig.baseline, sig.delta,
+                    ), (ts.periods[i], sig.record_type)
+
+    @pytest.mark.parametrize("card_type", ["daily_summary", "weekly_overview", "monthly_overview"])
+    def test_count_periods_matches_card_periods(self, card_type):
+        start = date(2026, 1, 30)
+        for end in (start - timedelta(days=40), start, date(2026, 2, 5), date(2026, 3, 1), date(2027, 12, 31)):
+            assert count_periods(card_type, start, end) == len(card_periods(card_type, start, end))
+
+    @pytest.mark.asyncio
+    async def test_weekly_and_monthly_periods(self):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(self._rows())):
+            weekly = await build_timeseries(FakeSession(), "weekly_overview", date(2026, 1, 5), date(2026, 2, 1))
+            monthly = await build_timeseries(FakeSession(), "monthly_overview", date(2026, 1, 15), date(2026, 3, 2))
+        assert weekly.periods == [date(2026, 1, 5) + timedelta(weeks=i) for i in range(4)]
+        assert monthly.periods == [date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)]
+        assert sum(monthly.row_counts) == len(self._rows())
+
+    @pytest.mark.asyncio
+    async def test_no_data(self):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]):
+            ts = await build_timeseries(FakeSession(), "daily_summary", date(2026, 2, 1), date(2026, 2, 3))
+        assert ts.row_counts == [0, 0, 0]
+        assert ts.warnings == ["No data found in the requested range."]
+        assert all(v is None for s in ts.signals for v in s.values)
+
+
+class TestPresetCards:
+    @pytest.mark.asyncio
+    async def test_concurrent_cards_own_sessions_in_order(self):
+        opened: list[FakeSession] = []
+        active = 0
+        peak = 0
+
+        def factory():
+            session = FakeSession()
+            opened.append(session)
+            return session
+
+        async def build_card(session, card_type, start, tz_name, device_id, prefetched=None, sections=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return card_type, session
+
+        card_types = ["daily_summary", "weekly_overview", "monthly_overview", "daily_summary"]
+        # streamed cards are not planned: each queries on its own session
+        with (
+            patch("app.kernel.builders.settings.kernel_stream_batch_size", 100),
+            patch("app.kernel.builders.build_card", build_card),
+        ):
+            results = await build_preset_cards(factory, card_types, date(2026, 2, 15), max_concurrency=2)
+
+        assert [ct for ct, _ in results] == card_types
+        assert len({id(session) for _, session in results}) == 4
+        assert len(opened) == 4
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_builds_real_cards(self):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]):
+            cards = await build_preset_cards(FakeSession, ["daily_summary", "monthly_overview"], date(2026, 2, 15))
+        assert [c.card_type for c in cards] == ["daily_summary", "monthly_overview"]
+
+
+class TestPresetPlanner:
+    @pytest.mark.asyncio
+    async def test_overlapping_cards_share_one_fetch(self):
+        rows = [
+            make_daily_row(date(2026, 1, 1) + timedelta(days=i), steps_total=100 * i, body_metrics={"weight_kg": 130.5})
+            for i in range(0, 150)
+        ]
+        calls = []
+        base_fetch = fake_fetch(rows)
+
+        async def fetch(session, start, end_exclusive, device_id=None):
+            calls.append((start, end_exclusive))
+            return await base_fetch(session, start, end_exclusive, device_id)
+
+        card_types = ["daily_summary", "weekly_overview", "monthly_overview"]
+        start = date(2026, 3, 9)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
+            planned = await build_preset_cards(FakeSession, card_types, start)
+            assert calls == [(date(2025, 12, 1), date(2026, 4, 1))]
+            single = [await build_card(FakeSession(), ct, start) for ct in card_types]
+
+        exclude = {"id", "generated_at"}
+        assert [c.model_dump(exclude=exclude) for c in planned] == [c.model_dump(exclude=exclude) for c in single]
+
+    @pytest.mark.asyncio
+    async def test_sql_aggregated_cards_fetch_separately(self):
+        fetch_aggs = AsyncMock(return_value={})
+        with (
+            patch("app.kernel.builders.settings.kernel_sql_aggregation_min_days", 28),
+            patch("app.kernel.builders.connector.fetch_period_aggregates", fetch_aggs),
+            patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]) as fetch_rows,
+        ):
+            await build_preset_cards(FakeSession, ["daily_summary", "monthly_overview"], date(2026, 3, 9))
+        assert fetch_rows.call_count == 1
+        assert fetch_aggs.call_count == 1
@@ -0,0 +1,191 @@
+"""Tests for the in-process card cache."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.kernel.cache import CardCache, card_key, get_card
+from app.kernel.models import CardEnvelope, Granularity, TimeRange
+
+from tests.conftest import FakeSession
+
+WATERMARK = (datetime(2026, 3, 1, 8, tzinfo=timezone.utc), 12)
+
+
+def _card(card_type: str = "daily_summary") -> CardEnvelope:
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    return CardEnvelope(card_type=card_type, granularity=Granularity.daily, time_range=TimeRange(start=now, end=now))
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCardCache:
+    def test_hit_requires_same_watermark(self):
+        cache = CardCache(8, 60)
+        card = _card()
+        cache.put("k", WATERMARK, card)
+        assert cache.get("k", WATERMARK) is card
+        assert cache.get("k", (WATERMARK[0], 13)) is None
+        assert cache.get("k", WATERMARK) is None  # stale entry was dropped
+        assert (cache.hits, cache.misses, cache.stale) == (1, 2, 1)
+
+    def test_ttl_expiry(self):
+        clock = _Clock()
+        cache = CardCache(8, 60, clock=clock)
+        cache.put("k", WATERMARK, _card())
+        clock.now = 60.0
+        assert cache.get("k", WATERMARK) is not None
+        clock.now = 60.5
+        assert cache.get("k", WATERMARK) is None
+
+    def test_lru_eviction(self):
+        cache = CardCache(2, 60)
+        cache.put("a", WATERMARK, _card())
+        cache.put("b", WATERMARK, _card())
+        cache.get("a", WATERMARK)  # "b" is now least recently used
+        cache.put("c", WATERMARK, _card())
+        assert cache.get("b", WATERMARK) is None
+        assert cache.get("a", WATERMARK) is not None
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_disabled_stores_nothing(self):
+        cache = CardCache(0, 60)
+        cache.put("k", WATERMARK, _card())
+        assert len(cache) == 0
+        assert cache.stats()["hit_ratio"] is None
+
+    def test_key_includes_timezone_and_device(self):
+        key = card_key("daily_summary", date(2026, 3, 2), "UTC", None)
+        assert key != card_key("daily_summary", date(2026, 3, 2), "US/Eastern", None)
+        assert key != card_key("daily_summary", date(2026, 3, 2), "UTC", "watch")
+
+
+class TestGetCard:
+    @pytest.mark.asyncio
+    async def test_hit_skips_build(self):
+        cache = CardCache(8, 60)
+        build = AsyncMock(side_effect=lambda *a: _card(a[1]))
+        watermark = AsyncMock(return_value=WATERMARK)
+        with (
+            patch("app.kernel.cache.builders.build_card", build),
+            patch("app.kernel.cache.connector.fetch_watermark", watermark),
+        ):
+            first = await get_card(FakeSession(), "monthly_overview", date(2026, 3, 4), cache=cache)
+            second = await get_card(FakeSession(), "monthly_overview", date(2026, 3, 20), cache=cache)
+        assert second is first
+        assert build.call_count == 1
+        # any start within the month maps to one card; both lookups validate its full range
+        assert watermark.await_args_list[1].args[1:] == (date(2025, 12, 1), date(2026, 4, 1), None)
+        assert watermark.await_args_list[1].kwargs == {"latest_snapshot": False}
+        assert watermark.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_new_rows_rebuild(self):
+        cache = CardCache(8, 60)
+        build = AsyncMock(side_effect=lambda *a: _card(a[1]))
+        watermark = AsyncMock(side_effect=[WATERMARK, (WATERMARK[0], 13)])
+        with (
+            patch("app.kernel.cache.builders.build_card", build),
+            patch("app.kernel.cache.connector.fetch_watermark", watermark),
+        ):
+            first = await get_card(FakeSession(), "daily_summary", date(2026, 3, 4), cache=cache)
+            second = await get_card(FakeSession(), "daily_summary", date(2026, 3, 4), cache=cache)
+        assert second is not first
+        assert build.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_builds_without_watermark(self):
+        build = AsyncMock(return_value=_card())
+        watermark = AsyncMock()
+        with (
+            patch("app.kernel.cache.builders.build_card", build),
+            patch("app.kernel.cache.connector.fetch_watermark", watermark),
+        ):
+            await get_card(FakeSession(), "daily_summary", date(2026, 3, 4), cache=CardCache(0, 60))
+        assert build.call_count == 1
+        assert watermark.call_count == 0
+
+
+class TestCardStore:
+    @pytest.mark.asyncio
+    async def test_closed_period_served_from_store(self):
+        stored = _card("monthly_overview")
+        build = AsyncMock()
+        watermark = AsyncMock()
+        with (
+            patch("app.kernel.cache.settings.kernel_card_store", True),
+            patch("app.kernel.cache.builders.build_card", build),
+            patch("app.kernel.cache.connector.fetch_watermark", watermark),
+            patch("app.kernel.cache.card_store.load", AsyncMock(return_value=stored)) as load,
+        ):
+            card = await get_card(FakeSession(), "monthly_overview", date(2020, 2, 1), cache=CardCache(0, 60))
+        assert card is stored
+        assert load.call_count == 1
+        assert load.await_args.kwargs == {"latest_snapshot": False}
+        # a store hit is the single lookup: no watermark query, no build
+        assert watermark.call_count == build.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_store_miss_builds_and_saves(self):
+        build = AsyncMock(return_value=_card("monthly_overview"))
+        save = AsyncMock()
+        with (
+            patch("app.kernel.cache.settings.kernel_card_store", True),
+            patch("app.kernel.cache.builders.build_card", build),
+            patch("app.kernel.cache.connector.fetch_watermark", AsyncMock(return_value=WATERMARK)),
+            patch("app.kernel.cache.card_store.load", AsyncMock(return_value=None)),
+            patch("app.kernel.cache.card_store.save", save),
+        ):
+            await get_card(FakeSession(), "monthly_overview", date(2020, 2, 1), cache=CardCache(0, 60))
+        assert build.call_count == 1
+        args = save.await_args.args
+        assert args[6:9] == (date(2019, 11, 3), date(2020, 3, 1), WATERMARK[0])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "covered, expected",
+        [
+            (None, None),
+            (WATERMARK[0] - timedelta(minutes=10), WATERMARK[0] - timedelta(minutes=10)),
+            (WATERMARK[0] + timedelta(minutes=10), WATERMARK[0]),
+        ],
+    )
+    async def test_signal_table_card_keyed_by_what_it_copied(self, covered, expected):
+        # rows received after the signal table's last refresh are missing from the card,
+        # so it must not be stored under a watermark that already counts them
+        save = AsyncMock()
+        cache = CardCache(8, 60)
+        with (
+            patch("app.kernel.cache.settings.kernel_card_store", True),
+            patch("app.kernel.cache.builders.build_card", AsyncMock(return_value=_card("monthly_overview"))),
+            patch("app.kernel.cache.builders.reads_signal_table", AsyncMock(return_value=True)),
+            patch("app.kernel.cache.signal_table.covered_watermark", AsyncMock(return_value=covered)),
+            patch("app.kernel.cache.connector.fetch_watermark", AsyncMock(return_value=WATERMARK)),
+            patch("app.kernel.cache.card_store.load", AsyncMock(return_value=None)),
+            patch("app.kernel.cache.card_store.save", save),
+        ):
+            card = await get_card(FakeSession(), "monthly_overview", date(2020, 2, 1), cache=cache)
+        assert save.await_args.args[8] == expected
+        cached = cache.get(card_key("monthly_overview", date(2020, 2, 1), "UTC", None), (expected, WATERMARK[1]))
+        assert cached is card
+
+    @pytest.mark.asyncio
+    async def test_open_period_skips_store(self):
+        load = AsyncMock()
+        with (
+            patch("app.kernel.cache.settings.kernel_card_store", True),
+            patch("app.kernel.cache.builders.build_card", AsyncMock(return_value=_card())),
+            patch("app.kernel.cache.card_store.load", load),
+        ):
+            await get_card(FakeSession(), "daily_summary", date(2999, 1, 1), cache=CardCache(0, 60))
+        assert load.call_count == 0
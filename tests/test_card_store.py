@@ -0,0 +1,150 @@
+"""Tests for the persistent closed-period card store (SQL shape + load/save logic)."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.kernel import card_store
+from app.kernel.models import CardEnvelope, Granularity, TimeRange
+
+
+def _card() -> CardEnvelope:
+    start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    return CardEnvelope(
+        card_type="monthly_overview",
+        granularity=Granularity.monthly,
+        time_range=TimeRange(start=start, end=datetime(2026, 3, 1, tzinfo=timezone.utc)),
+        summary="February",
+    )
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def fetchone(self):
+        return self._row
+
+
+class _Session:
+    def __init__(self, row=None, fail: bool = False):
+        self.row = row
+        self.fail = fail
+        self.statements: list[tuple[str, dict]] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((str(stmt), params))
+        if self.fail:
+            raise RuntimeError("relation does not exist")
+        return _Result(self.row)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class TestSql:
+    def test_primary_key(self):
+        ddl = card_store.create_table_sql()[0]
+        assert "PRIMARY KEY (card_type, target_start, tz, device_key, config_version)" in ddl
+        assert "payload jsonb NOT NULL" in ddl
+
+    @pytest.mark.parametrize("latest_snapshot", [False, True])
+    def test_load_checks_late_rows(self, latest_snapshot):
+        sql = card_store.LOAD_SQL[latest_snapshot]
+        assert "NOT EXISTS" in sql
+        assert "d.received_at > COALESCE(s.watermark" in sql
+        assert "d.date >= s.range_start AND d.date < s.range_end" in sql
+
+    def test_late_rows_match_the_watermark_source_types(self):
+        # daily mode: a late intraday snapshot must not invalidate a stored card
+        assert "d.source_type = 'daily'" in card_store.LOAD_SQL[False]
+        assert "d.source_type IN ('daily', 'intraday')" in card_store.LOAD_SQL[True]
+
+    def test_save_upserts(self):
+        assert "ON CONFLICT (card_type, target_start, tz, device_key, config_version) DO UPDATE" in card_store.SAVE_SQL
+
+
+class TestIsClosed:
+    def test_elapsed_period(self):
+        now = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+        assert card_store.is_closed(date(2026, 3, 1), "UTC", now)
+        assert not card_store.is_closed(date(2026, 3, 2), "UTC", now)
+
+    def test_uses_card_timezone(self):
+        # 03:00 UTC on March 1st is still February 28th in New York
+        now = datetime(2026, 3, 1, 3, tzinfo=timezone.utc)
+        assert card_store.is_closed(date(2026, 3, 1), "UTC", now)
+        assert not card_store.is_closed(date(2026, 3, 1), "America/New_York", now)
+
+
+class TestLoadSave:
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        writer = _Session()
+        card = _card()
+        await card_store.save(
+            lambda: writer, "monthly_overview", date(2026, 2, 1), "UTC", None, "v1",
+            date(2025, 11, 1), date(2026, 3, 1), None, card,
+        )
+        _, params = writer.statements[0]
+        assert params["device_key"] == ""
+        assert writer.commits == 1
+
+        loaded = await card_store.load(
+            _Session(row=(params["payload"],)), "monthly_overview", date(2026, 2, 1), "UTC", None, "v1"
+        )
+        assert loaded == card
+
+    @pytest.mark.asyncio
+    async def test_decoded_jsonb_payload(self):
+        card = _card()
+        loaded = await card_store.load(
+            _Session(row=(card.model_dump(mode="json"),)), "monthly_overview", date(2026, 2, 1), "UTC", None, "v1"
+        )
+        assert loaded == card
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("latest_snapshot", [False, True])
+    async def test_load_uses_read_mode(self, latest_snapshot):
+        session = _Session()
+        await card_store.load(
+            session, "monthly_overview", date(2026, 2, 1), "UTC", None, "v1", latest_snapshot=latest_snapshot
+        )
+        assert session.statements[0][0] == card_store.LOAD_SQL[latest_snapshot]
+
+    @pytest.mark.asyncio
+    async def test_miss(self):
+        assert await card_store.load(_Session(), "monthly_overview", date(2026, 2, 1), "UTC", "watch", "v1") is None
+
+    @pytest.mark.asyncio
+    async def test_missing_table_is_a_miss(self, monkeypatch, caplog):
+        monkeypatch.setattr(card_store, "_warned", set())
+        for _ in range(2):
+            session = _Session(fail=True)
+            assert await card_store.load(session, "monthly_overview", date(2026, 2, 1), "UTC", None, "v1") is None
+            assert session.rollbacks == 1
+        warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+        assert len(warnings) == 1  # once per process, not per request
+        assert "kernel_card_store load failed" in warnings[0].getMessage()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_never_raises(self, monkeypatch, caplog):
+        monkeypatch.setattr(card_store, "_warned", set())
+        await card_store.save(
+            lambda: _Session(fail=True), "monthly_overview", date(2026, 2, 1), "UTC", None, "v1",
+            date(2025, 11, 1), date(2026, 3, 1), None, _card(),
+        )
+        assert "kernel_card_store save failed" in caplog.text
@@ -0,0 +1,267 @@
+"""Tests for the database connector helpers (no real Postgres)."""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+
+import pytest
+
+from app.kernel import connector
+from app.kernel.extractor import NUMERIC_STRING_PATTERN, extract_row
+from app.kernel.signal_map import SIGNAL_CONFIG
+
+from tests.conftest import FakeSession, make_daily_row
+
+
+class TestJsonbPathSql:
+    def test_top_level(self):
+        assert connector.jsonb_path_sql("raw_data", "steps_total") == "raw_data->'steps_total'"
+
+    def test_nested(self):
+        expr = connector.jsonb_path_sql("raw_data", "body_metrics.weight_kg")
+        assert expr == "raw_data->'body_metrics'->'weight_kg'"
+
+    def test_array_index(self):
+        expr = connector.jsonb_path_sql("raw_data", "sleep_sessions.0.duration_minutes")
+        assert expr == "raw_data->'sleep_sessions'->0->'duration_minutes'"
+
+    def test_quotes_escaped(self):
+        assert connector.jsonb_path_sql("raw_data", "it's") == "raw_data->'it''s'"
+
+    def test_number_expression_guards_type(self):
+        expr = connector.jsonb_number_sql("raw_data", "steps_total")
+        assert "jsonb_typeof(raw_data->'steps_total') = 'number'" in expr
+        assert expr.endswith("::float8 END")
+
+    def test_number_expression_casts_numeric_strings(self):
+        expr = connector.jsonb_number_sql("raw_data", "steps_total")
+        assert "jsonb_typeof(raw_data->'steps_total') = 'string'" in expr
+        assert f"(raw_data->'steps_total' #>> '{{}}') ~* '{NUMERIC_STRING_PATTERN}'" in expr
+
+    @pytest.mark.parametrize(
+        "raw",
+        [1200, 12.5, "1200", " 12.5 ", "-3", "1e3", ".5", "5.", "Infinity", "NaN",
+         "", "abc", "12 steps", "1_000", "0x10", "+nan", "١٢", True, None, [1], {"v": 1}],
+    )
+    def test_projection_agrees_with_extract_row(self, raw):
+        # What the CASE expression yields for this JSON value, evaluated the way Postgres would
+        if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+            projected = float(raw)
+        elif isinstance(raw, str) and re.match(NUMERIC_STRING_PATTERN, raw, re.IGNORECASE | re.ASCII):
+            projected = float(raw)
+        else:
+            projected = None
+        extracted = extract_row({"raw_data": {"steps_total": raw}, "source": {}})[0].get("steps_total")
+        assert extracted == projected or (extracted != extracted and projected != projected)  # NaN
+
+
+class TestSignalProjection:
+    def test_every_signal_projected(self):
+        for name in SIGNAL_CONFIG:
+            assert f'AS "{name}"' in connector.SIGNAL_PROJECTION_SQL
+        assert "AS manual_tracked" in connector.SIGNAL_PROJECTION_SQL
+
+    @pytest.mark.asyncio
+    async def test_fetch_projected_rows_selects_projection(self):
+        captured: dict = {}
+
+        class _Session(FakeSession):
+            async def execute(self, stmt, params=None):
+                captured["sql"] = str(stmt)
+                return await super().execute(stmt, params)
+
+        await connector.fetch_projected_rows(_Session(), date(2026, 2, 1), date(2026, 3, 1))
+        assert connector.SIGNAL_PROJECTION_SQL in captured["sql"]
+        assert "SELECT device_id, date, raw_data" not in captured["sql"]
+
+
+class TestPeriodAggregates:
+    def test_sql_aggregates_per_method(self):
+        assert connector.sql_aggregate("sum", '"x"') == 'SUM("x")'
+        assert connector.sql_aggregate("min", '"x"') == 'MIN("x")'
+        assert "ORDER BY date DESC" in connector.sql_aggregate("last", '"x"')
+        assert connector.sql_aggregate("median", '"x"') == 'AVG("x")'
+
+    def test_every_signal_aggregated(self):
+        for name in SIGNAL_CONFIG:
+            for suffix in ("value", "mean", "n"):
+                assert f'AS "{name}__{suffix}"' in connector.PERIOD_AGGREGATE_SQL
+
+    @pytest.mark.asyncio
+    async def test_rows_keyed_by_period(self):
+        session = FakeSession([
+            {"period": "baseline", "row_count": 3},
+            {"period": "target", "row_count": 2},
+        ])
+        aggs = await connector.fetch_period_aggregates(
+            session, date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)
+        )
+        assert aggs["baseline"]["row_count"] == 3
+        assert aggs["target"]["row_count"] == 2
+
+
+class TestFetchRows:
+    @pytest.mark.asyncio
+    async def test_one_query_over_range(self):
+        rows = [make_daily_row(date(2026, 2, d)) for d in (8, 12, 15)]
+        session = FakeSession(rows)
+        fetched = await connector.fetch_rows(session, date(2026, 2, 8), date(2026, 2, 16))
+        assert [r["date"].day for r in fetched] == [8, 12, 15]
+
+
+    @pytest.mark.asyncio
+    async def test_latest_snapshot_ignores_pool(self):
+        rows = [make_daily_row(date(2026, 2, d)) for d in (8, 15)]
+        session = _RecordingSession(rows)
+        fetched = await connector.fetch_rows(
+            session, date(2026, 2, 8), date(2026, 2, 16), pool=object(), latest_snapshot=True
+        )
+        assert len(fetched) == 2
+        assert "DISTINCT ON (device_id, date)" in str(session.statements[0])
+
+
+class _RecordingSession(FakeSession):
+    def __init__(self, rows=None):
+        super().__init__(rows)
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return await super().execute(stmt, params)
+
+
+class TestLatestSnapshotQuery:
+    def test_prefers_daily_then_latest_intraday(self):
+        query, params = connector._daily_query(
+            "device_id, date, raw_data", date(2026, 2, 1), date(2026, 2, 8), "dev-1", latest_snapshot=True
+        )
+        assert query.startswith("SELECT * FROM (SELECT DISTINCT ON (device_id, date) device_id, date, raw_data ")
+        assert "source_type IN ('daily', 'intraday')" in query
+        assert "AND device_id = :device_id" in query
+        assert "ORDER BY device_id, date, (source_type = 'daily') DESC, collected_at DESC" in query
+        assert query.endswith(") AS latest ORDER BY date")
+        assert params["device_id"] == "dev-1"
+
+    def test_default_reads_daily_only(self):
+        query, _ = connector._daily_query("date", date(2026, 2, 1), date(2026, 2, 8), None)
+        assert "DISTINCT ON" not in query
+        assert "source_type = 'daily'" in query
+
+
+class TestStreamDailyRows:
+    @pytest.mark.asyncio
+    async def test_yields_batches(self):
+        rows = [make_daily_row(date(2026, 2, d)) for d in range(1, 6)]
+        batches = [
+            batch
+            async for batch in connector.stream_daily_rows(
+                FakeSession(rows), date(2026, 2, 1), date(2026, 2, 6), batch_size=2
+            )
+        ]
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[0][0]["date"] == date(2026, 2, 1)
+        assert "raw_data" in batches[0][0]
+
+    @pytest.mark.asyncio
+    async def test_empty(self):
+        batches = [
+            batch
+            async for batch in connector.stream_daily_rows(
+                FakeSession(), date(2026, 2, 1), date(2026, 2, 6)
+            )
+        ]
+        assert batches == []
+
+
+class TestFetchWatermark:
+    @pytest.mark.asyncio
+    async def test_reads_max_received_at_for_device(self):
+        session = _RecordingSession([{"watermark": "2026-02-05T08:00:00Z", "row_count": 4}])
+        result = await connector.fetch_watermark(session, date(2026, 2, 1), date(2026, 2, 6), "watch")
+        assert result == ("2026-02-05T08:00:00Z", 4)
+        sql = str(session.statements[0])
+        assert "max(received_at)" in sql
+        assert "device_id = :device_id" in sql
+        assert "raw_data" not in sql
+        assert "source_type = 'daily'" in sql
+
+    @pytest.mark.asyncio
+    async def test_snapshot_mode_includes_intraday(self):
+        session = _RecordingSession([{"watermark": None, "row_count": 0}])
+        await connector.fetch_watermark(session, date(2026, 2, 1), date(2026, 2, 6), latest_snapshot=True)
+        assert "source_type IN ('daily', 'intraday')" in str(session.statements[0])
+
+    @pytest.mark.asyncio
+    async def test_no_rows(self):
+        assert await connector.fetch_watermark(FakeSession(), date(2026, 2, 1), date(2026, 2, 6)) == (None, 0)
+
+
+class TestFetchActiveDevices:
+    @pytest.mark.asyncio
+    async def test_distinct_non_null_devices(self):
+        session = _RecordingSession([{"device_id": "phone"}, {"device_id": None}, {"device_id": "watch"}])
+        devices = await connector.fetch_active_devices(session, date(2026, 2, 1), date(2026, 2, 8))
+        assert devices == ["phone", "watch"]
+        assert "SELECT DISTINCT device_id" in str(session.statements[0])
+
+
+class _FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls: list[tuple] = []
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        return self.rows
+
+
+class _FakePool:
+    def __init__(self, rows=None):
+        self.conn = _FakeConnection(rows or [])
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *args):
+                pass
+
+        return _Acquire()
+
+
+class TestFetchDailyRecords:
+    def test_native_queries_use_positional_params(self):
+        for (projected, by_device), query in connector._NATIVE_QUERIES.items():
+            assert "date >= $1 AND date < $2" in query
+            assert ("device_id = $3" in query) is by_device
+            assert (connector.SIGNAL_PROJECTION_SQL in query) is projected
+
+    @pytest.mark.asyncio
+    async def test_args_without_device(self):
+        pool = _FakePool()
+        await connector.fetch_daily_records(pool, date(2026, 2, 1), date(2026, 2, 8))
+        query, args = pool.conn.calls[0]
+        assert query == connector._NATIVE_QUERIES[(False, False)]
+        assert args == (date(2026, 2, 1), date(2026, 2, 8))
+
+    @pytest.mark.asyncio
+    async def test_args_with_device(self):
+        pool = _FakePool()
+        await connector.fetch_daily_records(
+            pool, date(2026, 2, 1), date(2026, 2, 8), device_id="dev", projected=True
+        )
+        query, args = pool.conn.calls[0]
+        assert query == connector._NATIVE_QUERIES[(True, True)]
+        assert args == (date(2026, 2, 1), date(2026, 2, 8), "dev")
+
+    @pytest.mark.asyncio
+    async def test_fetch_rows_prefers_pool(self):
+        rows = [make_daily_row(date(2026, 2, d)) for d in (8, 15)]
+        pool = _FakePool(rows)
+        fetched = await connector.fetch_rows(FakeSession(), date(2026, 2, 8), date(2026, 2, 16), pool=pool)
+        assert len(pool.conn.calls) == 1
+        assert [r["date"].day for r in fetched] == [8, 15]
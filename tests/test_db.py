@@ -0,0 +1,163 @@
+"""Tests for json/jsonb codec setup in app.db (no real Postgres)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+from app import db
+from app.db import json_loader, register_json_codecs
+
+DOC = {"steps_total": 534, "body_metrics": {"weight_kg": 129.97, "bmr_kcal": None}, "sleep_sessions": []}
+TEXT = json.dumps(DOC).encode()
+
+
+class _CodecConnection:
+    def __init__(self):
+        self.codecs: dict[str, dict] = {}
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+
+class TestJsonLoader:
+    def test_stdlib(self):
+        assert json_loader("json")(TEXT) == DOC
+
+    @pytest.mark.parametrize("name", ["orjson", "msgspec"])
+    def test_optional_decoders_match_stdlib(self, name):
+        pytest.importorskip(name)
+        assert json_loader(name)(TEXT) == json_loader("json")(TEXT)
+
+    def test_unknown_raises(self):
+        with pytest.raises(ValueError):
+            json_loader("yaml")
+
+
+class TestRegisterJsonCodecs:
+    @pytest.mark.asyncio
+    async def test_binary_codecs_roundtrip(self):
+        conn = _CodecConnection()
+        await register_json_codecs(conn, json_loader("json"), dumps=json.dumps)
+
+        jsonb = conn.codecs["jsonb"]
+        assert jsonb["format"] == "binary"
+        assert jsonb["schema"] == "pg_catalog"
+        wire = jsonb["encoder"](DOC)
+        assert wire == b"\x01" + json.dumps(DOC).encode()
+        assert jsonb["decoder"](wire) == DOC
+
+        assert conn.codecs["json"]["decoder"](TEXT) == DOC
+
+    @pytest.mark.asyncio
+    async def test_default_dumps_passes_serialised_values(self):
+        conn = _CodecConnection()
+        await register_json_codecs(conn, json_loader("json"))
+        assert conn.codecs["jsonb"]["encoder"]('{"a": 1}') == b'\x01{"a": 1}'
+
+
+def _request(method: str, path: str) -> Request:
+    return Request({"type": "http", "method": method, "path": path, "headers": [], "query_string": b""})
+
+
+class _Factory:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self.name
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class TestReadReplicaRouting:
+    @pytest.fixture(autouse=True)
+    def _replica(self, monkeypatch):
+        monkeypatch.setattr(db, "async_session", _Factory("primary"))
+        monkeypatch.setattr(db, "read_session", _Factory("replica"))
+        monkeypatch.setattr(db, "read_engine", object())
+        monkeypatch.setattr(db, "_replica_checked_at", None)
+        monkeypatch.setattr(db.settings, "database_read_max_lag_seconds", 30.0)
+
+    @staticmethod
+    async def _session_for(method: str, path: str) -> str:
+        gen = db.get_session(_request(method, path))
+        session = await gen.__anext__()
+        await gen.aclose()
+        return session
+
+    @pytest.mark.asyncio
+    async def test_kernel_get_uses_replica(self, monkeypatch):
+        monkeypatch.setattr(db, "replica_lag_seconds", lambda: _async(1.5))
+        assert await self._session_for("GET", "/kernel/cards/daily_summary") == "replica"
+
+    @pytest.mark.asyncio
+    async def test_session_factory_follows_routing(self, monkeypatch):
+        monkeypatch.setattr(db, "replica_lag_seconds", lambda: _async(0.0))
+        replica = await db.get_session_factory(_request("GET", "/kernel/presets/daily_brief/run"))
+        primary = await db.get_session_factory(_request("GET", "/health"))
+        assert (replica.name, primary.name) == ("replica", "primary")
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back(self, monkeypatch):
+        monkeypatch.setattr(db, "replica_lag_seconds", lambda: _async(120.0))
+        assert await self._session_for("GET", "/kernel/cards/daily_summary") == "primary"
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back(self, monkeypatch):
+        monkeypatch.setattr(db, "replica_lag_seconds", lambda: _async(None))
+        assert await self._session_for("GET", "/kernel/presets/daily_brief/run") == "primary"
+
+    @pytest.mark.asyncio
+    async def test_non_kernel_routes_use_primary(self, monkeypatch):
+        monkeypatch.setattr(db, "replica_lag_seconds", lambda: _async(0.0))
+        assert await self._session_for("GET", "/health") == "primary"
+        assert await self._session_for("POST", "/kernel/cards/daily_summary") == "primary"
+
+    @pytest.mark.asyncio
+    async def test_lag_check_cached(self, monkeypatch):
+        calls = []
+
+        def _lag():
+            calls.append(1)
+            return _async(0.0)
+
+        monkeypatch.setattr(db, "replica_lag_seconds", _lag)
+        await db.replica_usable()
+        await db.replica_usable()
+        assert len(calls) == 1
+
+
+class _HangingEngine:
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        await asyncio.sleep(60)
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class TestReplicaLagProbe:
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_times_out(self, monkeypatch):
+        monkeypatch.setattr(db, "read_engine", _HangingEngine())
+        monkeypatch.setattr(db, "_LAG_PROBE_TIMEOUT_SECONDS", 0.01)
+        assert await asyncio.wait_for(db.replica_lag_seconds(), 1.0) is None
+
+    @pytest.mark.asyncio
+    async def test_no_replica(self, monkeypatch):
+        monkeypatch.setattr(db, "read_engine", None)
+        assert await db.replica_lag_seconds() is None
+
+
+async def _async(value):
+    return value
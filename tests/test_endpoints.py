@@ -42,6 +42,59 @@ class TestCardsEndpoint:
         assert resp.json()["card_type"] == "monthly_overview"
 
 
+class TestTimeseriesEndpoint:
+    @pytest.mark.asyncio
+    async def test_daily_series_200(self, client):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]) as fetch:
+            resp = await client.get("/kernel/timeseries/daily_summary?from=2026-02-01&to=2026-02-07")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["card_type"] == "daily_summary"
+        assert len(body["periods"]) == 7
+        assert fetch.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_card_type_404(self, client):
+        resp = await client.get("/kernel/timeseries/nonexistent?from=2026-02-01&to=2026-02-07")
+        assert resp.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_reversed_range_422(self, client):
+        resp = await client.get("/kernel/timeseries/daily_summary?from=2026-02-07&to=2026-02-01")
+        assert resp.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_too_many_periods_422(self, client):
+        resp = await client.get("/kernel/timeseries/daily_summary?from=2020-01-01&to=2026-01-01")
+        assert resp.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_huge_range_rejected_before_building_periods(self, client):
+        with patch("app.kernel.builders.card_periods", side_effect=AssertionError("built periods")):
+            for card_type in ("daily_summary", "weekly_overview", "monthly_overview"):
+                resp = await client.get(f"/kernel/timeseries/{card_type}?from=0001-01-08&to=9999-12-30")
+                assert resp.status_code == 422
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "query",
+        ["from=0001-01-02&to=0001-01-20", "from=9999-12-20&to=9999-12-31"],
+    )
+    async def test_date_overflow_422(self, client, query):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]):
+            resp = await client.get(f"/kernel/timeseries/daily_summary?{query}")
+        assert resp.status_code == 422
+
+
+class TestCacheEndpoint:
+    @pytest.mark.asyncio
+    async def test_cache_stats(self, client):
+        resp = await client.get("/kernel/cache")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert {"enabled", "entries", "hits", "misses", "hit_ratio"} <= body.keys()
+
+
 class TestPresetsEndpoints:
     @pytest.mark.asyncio
     async def test_list_presets(self, client):
@@ -2,8 +2,18 @@
 
 from datetime import date
 
-from app.kernel.extractor import extract_signal, extract_signals_from_row, extract_signal_series
-from app.kernel.signal_map import get_signal_config
+from app.kernel.extractor import (
+    SIGNAL_ACCESSORS,
+    SIGNAL_TRIE,
+    compile_accessor,
+    compile_path,
+    extract_row,
+    extract_signal,
+    extract_signal_series,
+    extract_signals_from_row,
+)
+from app.kernel.features import is_manually_tracked
+from app.kernel.signal_map import SIGNAL_CONFIG, SignalConfig, get_signal_config
 
 
 def _row(raw: dict) -> dict:
@@ -101,3 +111,99 @@ class TestExtractSignalSeries:
         series = extract_signal_series([])
         for name, vals in series.items():
             assert vals == []
+
+
+class TestCompiledPaths:
+    def test_compile_path_types_steps(self):
+        assert compile_path("sleep_sessions.0.duration_minutes") == (
+            ("sleep_sessions", None), ("0", 0), ("duration_minutes", None),
+        )
+
+    def test_accessor_per_signal_in_config_order(self):
+        assert [name for name, _ in SIGNAL_ACCESSORS] == list(SIGNAL_CONFIG)
+        row = _row({"steps_total": 2530, "heart_rate_summary": {"avg_hr": 61}})
+        values = {name: v for name, acc in SIGNAL_ACCESSORS if (v := acc(row)) is not None}
+        assert values == extract_row(row)[0]
+
+    def test_accessor_compiled_once(self):
+        cfg = get_signal_config("avg_hr")
+        assert compile_accessor(cfg) is compile_accessor(cfg)
+        row = _row({"heart_rate_summary": {"avg_hr": 61}})
+        assert compile_accessor(cfg)(row) == extract_signal(row, cfg) == 61.0
+
+    def test_numeric_key_in_dict(self):
+        cfg = SignalConfig(column="raw_data", path="zones.0", agg="avg")
+        assert extract_signal(_row({"zones": {"0": 12}}), cfg) == 12.0
+        assert extract_signal(_row({"zones": [7]}), cfg) == 7.0
+
+    def test_negative_and_out_of_range_index(self):
+        cfg = SignalConfig(column="raw_data", path="sleep_sessions.-1.duration_minutes", agg="avg")
+        assert extract_signal(_row({"sleep_sessions": [{"duration_minutes": 1}, {"duration_minutes": 2}]}), cfg) == 2.0
+        assert extract_signal(_row({"sleep_sessions": []}), cfg) is None
+
+    def test_non_numeric_step_into_list(self):
+        cfg = SignalConfig(column="raw_data", path="sleep_sessions.first", agg="avg")
+        assert extract_signal(_row({"sleep_sessions": [{"first": 1}]}), cfg) is None
+
+    def test_string_and_bool_values(self):
+        row = _row({"steps_total": "1200", "heart_rate_summary": {"avg_hr": True}})
+        assert extract_signals_from_row(row) == {"steps_total": 1200.0}
+
+
+def _per_signal(row: dict) -> dict:
+    out = {}
+    for name, cfg in SIGNAL_CONFIG.items():
+        val = extract_signal(row, cfg)
+        if val is not None:
+            out[name] = val
+    return out
+
+
+class TestSinglePassExtraction:
+    PAYLOADS = [
+        {},
+        {"steps_total": 10, "weight_kg": None},
+        {"weight_kg": 80},
+        {"body_metrics": {"weight_kg": "81.5", "body_fat_percentage": None}},
+        {"body_metrics": [1, 2]},
+        {"nutrition_summary": {"calories_total": 0, "protein_grams": 90.5}},
+        {"nutrition_summary": {"weight_kg": 70}},
+        {"heart_rate_summary": {"avg_hr": 60, "max_hr": 110, "min_hr": True, "resting_hr": "x"}},
+        {"heart_rate_summary": "n/a"},
+        {"sleep_sessions": []},
+        {"sleep_sessions": [None]},
+        {"sleep_sessions": [{"duration_minutes": 420}, {"duration_minutes": 30}]},
+        {"sleep_sessions": {"0": {"duration_minutes": 300}}},
+    ]
+
+    def test_matches_per_signal_and_tracking_check(self):
+        for raw in self.PAYLOADS:
+            row = _row(raw)
+            assert extract_row(row) == (_per_signal(row), is_manually_tracked(row)), raw
+
+    def test_non_dict_raw_data(self):
+        assert extract_row({"raw_data": None}) == ({}, False)
+        assert extract_row({"raw_data": [1, 2]}) == ({}, False)
+
+    def test_record_like_row(self):
+        class _Record:  # asyncpg Records support .get and `in` but are not dicts
+            def __init__(self, data):
+                self._data = data
+
+            def __contains__(self, key):
+                return key in self._data
+
+            def get(self, key, default=None):
+                return self._data.get(key, default)
+
+        row = _row({"steps_total": 10, "body_metrics": {"weight_kg": 80}})
+        assert extract_row(_Record(row)) == extract_row(row) == ({"steps_total": 10.0, "weight_kg": 80.0}, True)
+
+    def test_projected_flag_wins(self):
+        assert extract_row({"manual_tracked": True}) == ({}, True)
+
+    def test_shared_prefix_is_one_node(self):
+        raw_data = SIGNAL_TRIE.children["raw_data"]
+        heart_rate = raw_data.children["heart_rate_summary"]
+        assert {"avg_hr", "max_hr", "min_hr"} <= set(heart_rate.children)
+        assert raw_data.children["body_metrics"].children["weight_kg"].tracked
@@ -0,0 +1,166 @@
+"""Vectorised feature kernels checked against the pure-Python reference."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.kernel import features, features_np  # noqa: E402
+from app.kernel.goals_config import get_goal  # noqa: E402
+from app.kernel.series import SignalSeries  # noqa: E402
+from app.kernel.signal_map import SIGNAL_CONFIG, list_signals  # noqa: E402
+from app.kernel.stats import stats_from_series  # noqa: E402
+
+from tests.conftest import make_daily_row  # noqa: E402
+
+METHODS = ["sum", "avg", "max", "min", "last", "unknown"]
+
+
+def _random_matrix(seed: int, signals: int = 6, days: int = 40):
+    rng = random.Random(seed)
+    lists = [
+        [rng.uniform(-50, 5000) if rng.random() < 0.7 else None for _ in range(days)]
+        for _ in range(signals)
+    ]
+    values = np.array([[np.nan if v is None else v for v in row] for row in lists])
+    mask = ~np.isnan(values)
+    present = [[v for v in row if v is not None] for row in lists]
+    # one all-missing signal
+    values[-1] = np.nan
+    mask[-1] = False
+    present[-1] = []
+    return values, mask, present
+
+
+def _opt(v):
+    return None if np.isnan(v) else float(v)
+
+
+def _close(got, expected):
+    """Equal up to float rounding (pairwise vs compensated summation)."""
+    if expected is None:
+        return got is None
+    return got == pytest.approx(expected, rel=1e-12)
+
+
+class TestReductions:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_aggregate_matches_reference(self, seed):
+        values, mask, present = _random_matrix(seed)
+        methods = [METHODS[i % len(METHODS)] for i in range(len(present))]
+        got = features_np.aggregate(values, mask, methods)
+        for i, method in enumerate(methods):
+            assert _close(_opt(got[i]), features.aggregate(present[i], method))
+
+    @pytest.mark.parametrize("window", [None, 1, 7])
+    def test_trailing_average_matches_reference(self, window):
+        values, mask, present = _random_matrix(11)
+        got = features_np.trailing_average(values, mask, window)
+        for i, vals in enumerate(present):
+            assert _close(_opt(got[i]), features.trailing_average(vals, window))
+
+    def test_empty_matrix(self):
+        values = np.empty((3, 0))
+        mask = np.empty((3, 0), dtype=bool)
+        assert np.isnan(features_np.aggregate(values, mask, ["sum", "max", "last"])).all()
+        assert np.isnan(features_np.trailing_average(values, mask)).all()
+
+
+class TestCardMath:
+    CASES = [
+        (None, 100.0), (0.0, 100.0), (50.0, 0.0), (80.0, 100.0), (150.0, 100.0),
+        (100.0, 100.0), (-20.0, 100.0), (104.0, 100.0), (96.0, 100.0), (None, None),
+    ]
+
+    def test_delta_and_pct(self):
+        current = np.array([_nan(c) for c, _ in self.CASES])
+        baseline = np.array([_nan(b) for _, b in self.CASES])
+        deltas = features_np.compute_delta(current, baseline)
+        pcts = features_np.compute_delta_pct(current, baseline)
+        for i, (c, b) in enumerate(self.CASES):
+            assert _opt(deltas[i]) == features.compute_delta(c, b)
+            assert _opt(pcts[i]) == features.compute_delta_pct(c, b)
+
+    @pytest.mark.parametrize("target_type", ["minimum", "maximum", "exact", "other"])
+    def test_goal_progress_and_status(self, target_type):
+        values = np.array([_nan(c) for c, _ in self.CASES])
+        targets = np.array([100.0, 0.0, 2300.0, 1.0, 10000.0, 100.0, 100.0, 7.5, 96.0, 50.0])
+        got = features_np.goal_progress_pct(values, targets, [target_type] * len(values))
+        status = features_np.goal_status(got)
+        for i, (v, _) in enumerate(self.CASES):
+            expected = features.goal_progress_pct(v, float(targets[i]), target_type)
+            assert _opt(got[i]) == expected
+            assert status[i] == features.goal_status(expected)
+
+    def test_trend(self):
+        recent = np.array([_nan(c) for c, _ in self.CASES])
+        prior = np.array([_nan(b) for _, b in self.CASES])
+        got = features_np.trend_from_means(recent, prior)
+        for i, (c, b) in enumerate(self.CASES):
+            assert got[i] == features.trend_from_means(c, b)
+
+    def test_compute_trend(self):
+        values, mask, present = _random_matrix(3)
+        got = features_np.compute_trend(values[:, 20:], mask[:, 20:], values[:, :20], mask[:, :20])
+        for i in range(len(present)):
+            recent = [v for v, m in zip(values[i, 20:], mask[i, 20:]) if m]
+            prior = [v for v, m in zip(values[i, :20], mask[i, :20]) if m]
+            assert got[i] == features.compute_trend(recent, prior)
+
+
+def _nan(v):
+    return np.nan if v is None else v
+
+
+class TestSeriesIntegration:
+    def _series(self) -> SignalSeries:
+        rng = random.Random(7)
+        rows = [
+            make_daily_row(
+                date(2026, 1, 1) + timedelta(days=i),
+                steps_total=rng.randint(0, 20000),
+                body_metrics={"weight_kg": rng.uniform(120, 135)} if i % 3 else {},
+                heart_rate_summary={"avg_hr": rng.randint(55, 90), "max_hr": rng.randint(100, 170)},
+                nutrition_summary={"calories_total": rng.uniform(1500, 3000)} if i % 2 else {},
+            )
+            for i in range(60)
+        ]
+        return SignalSeries.from_rows(rows)
+
+    def test_stats_from_series_vectorized(self):
+        series = self._series()
+        got = stats_from_series(series, 60, vectorized=True)
+        expected = stats_from_series(series, 60)
+        assert got.counts == expected.counts
+        assert (got.row_count, got.tracking, got.partial_days) == (
+            expected.row_count, expected.tracking, expected.partial_days,
+        )
+        for name in list_signals():
+            assert _close(got.values[name], expected.values[name])
+            assert _close(got.means[name], expected.means[name])
+
+    def test_card_signal_math_matches_reference(self):
+        baseline, target = self._series().split_at(date(2026, 2, 20))
+        t, b = stats_from_series(target, 9), stats_from_series(baseline, 50)
+        names = list_signals()
+        goals = [get_goal(n) for n in names]
+        got = features_np.card_signal_math(names, t, b, goals)
+        for name, goal in zip(names, goals):
+            delta, progress, status, trend = got[name]
+            assert delta == features.compute_delta(t.values[name], b.means[name])
+            if goal is None:
+                assert (progress, status, trend) == (None, None, None)
+                continue
+            expected = features.goal_progress_pct(t.values[name], goal.target_value, goal.target_type)
+            assert progress == expected
+            assert status == features.goal_status(expected)
+            assert trend == features.trend_from_means(t.means[name], b.means[name])
+
+    def test_matrix_shape(self):
+        series = self._series()
+        values, mask = features_np.matrix(series, list(SIGNAL_CONFIG))
+        assert values.shape == mask.shape == (len(SIGNAL_CONFIG), len(series))
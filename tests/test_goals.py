@@ -12,10 +12,11 @@ from app.kernel.features import (
     goal_progress_pct,
     goal_status,
     tracking_consistency,
+    trend_from_means,
 )
 from app.kernel.goals_config import GOALS_BY_SIGNAL, get_goal, list_goals
 from app.kernel.builders import build_daily_summary
-from tests.conftest import make_daily_row
+from tests.conftest import fake_fetch, make_daily_row
 
 
 # ---------------------------------------------------------------------------
@@ -135,6 +136,17 @@ class TestComputeTrend:
         assert compute_trend([5, 5], [0, 0]) == "up"
 
 
+class TestTrendFromMeans:
+    def test_matches_compute_trend(self):
+        assert trend_from_means(110.0, 100.0) == compute_trend([110.0], [100.0]) == "up"
+        assert trend_from_means(90.0, 100.0) == "down"
+        assert trend_from_means(101.0, 100.0) == "flat"
+
+    def test_missing_mean_is_flat(self):
+        assert trend_from_means(None, 100.0) == "flat"
+        assert trend_from_means(100.0, None) == "flat"
+
+
 # ---------------------------------------------------------------------------
 # Tracking consistency
 # ---------------------------------------------------------------------------
@@ -175,6 +187,13 @@ class TestTrackingConsistency:
     def test_zero_expected(self):
         assert tracking_consistency([], expected_days=0) == 0.0
 
+    def test_projected_manual_tracked_flag(self):
+        rows = [
+            {"date": date(2026, 2, 15), "manual_tracked": True},
+            {"date": date(2026, 2, 16), "manual_tracked": False},
+        ]
+        assert tracking_consistency(rows, expected_days=2) == 0.5
+
 
 # ---------------------------------------------------------------------------
 # Builder integration — goals appear on signals + priority_summary
@@ -196,12 +215,8 @@ class TestBuilderGoalIntegration:
             for i in range(1, 8)
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return baseline_rows
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows + baseline_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         steps = next((s for s in env.signals if s.record_type == "steps_total"), None)
@@ -222,12 +237,8 @@ class TestBuilderGoalIntegration:
             )
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         cals = next((s for s in env.signals if s.record_type == "calories_total"), None)
@@ -245,12 +256,8 @@ class TestBuilderGoalIntegration:
             )
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         tc = next((s for s in env.signals if s.record_type == "tracking_consistency"), None)
@@ -269,12 +276,8 @@ class TestBuilderGoalIntegration:
             )
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         assert env.priority_summary is not None
@@ -301,12 +304,8 @@ class TestBuilderGoalIntegration:
             )
         ]
 
-        async def _fetch(sess, start, end_exclusive, device_id=None):
-            if start >= date(2026, 2, 15):
-                return target_rows
-            return []
-
-        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=_fetch):
+        fetch = fake_fetch(target_rows)
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fetch):
             env = await build_daily_summary(session, date(2026, 2, 15))
 
         hr = next((s for s in env.signals if s.record_type == "avg_hr"), None)
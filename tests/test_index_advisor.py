@@ -0,0 +1,108 @@
+"""Tests for the health_connect_daily index advisor (no real Postgres)."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.kernel import index_advisor
+from app.kernel.index_advisor import RECOMMENDED_INDEXES, covers, index_columns, index_predicate
+
+from tests.conftest import FakeSession
+
+DEVICE_DATE = RECOMMENDED_INDEXES[0]
+DATE_ONLY = RECOMMENDED_INDEXES[1]
+SNAPSHOT = RECOMMENDED_INDEXES[2]
+
+PARTIAL_DEF = (
+    "CREATE INDEX hcd_dev_date ON public.health_connect_daily USING btree (device_id, date) "
+    "WHERE ((source_type)::text = 'daily'::text)"
+)
+FULL_DEF = "CREATE INDEX hcd_dev_date_type ON public.health_connect_daily USING btree (device_id, date, source_type)"
+PKEY_DEF = "CREATE UNIQUE INDEX health_connect_daily_pkey ON public.health_connect_daily USING btree (id)"
+INTRADAY_DEF = (
+    "CREATE INDEX hcd_intraday ON public.health_connect_daily USING btree (device_id, date) "
+    "WHERE ((source_type)::text = 'intraday'::text)"
+)
+SNAPSHOT_DEF = (
+    "CREATE INDEX hcd_snapshot ON public.health_connect_daily USING btree (device_id, date, collected_at) "
+    "WHERE ((source_type)::text = ANY ((ARRAY['daily'::character varying, 'intraday'::character varying])::text[]))"
+)
+
+
+class TestParsing:
+    def test_columns(self):
+        assert index_columns(PARTIAL_DEF) == ("device_id", "date")
+        assert index_columns('CREATE INDEX x ON t USING btree ("date" DESC)') == ("date",)
+
+    def test_predicate(self):
+        assert index_predicate(PARTIAL_DEF) == "((source_type)::text = 'daily'::text)"
+        assert index_predicate(FULL_DEF) is None
+
+
+class TestCovers:
+    def test_matching_partial_index(self):
+        assert covers(PARTIAL_DEF, DEVICE_DATE)
+
+    def test_full_index_with_prefix(self):
+        assert covers(FULL_DEF, DEVICE_DATE)
+
+    def test_wrong_leading_column(self):
+        assert not covers(PARTIAL_DEF, DATE_ONLY)
+        assert not covers(PKEY_DEF, DEVICE_DATE)
+
+    def test_other_predicate(self):
+        assert not covers(INTRADAY_DEF, DEVICE_DATE)
+
+    def test_snapshot_index_needs_both_source_types(self):
+        assert covers(SNAPSHOT_DEF, SNAPSHOT)
+        assert covers(SNAPSHOT_DEF, DEVICE_DATE)
+        daily_only = PARTIAL_DEF.replace("(device_id, date)", "(device_id, date, collected_at)")
+        assert not covers(daily_only, SNAPSHOT)
+
+
+class TestMissingIndexes:
+    @pytest.mark.asyncio
+    async def test_reports_uncovered(self):
+        session = FakeSession([
+            {"indexname": "health_connect_daily_pkey", "indexdef": PKEY_DEF},
+            {"indexname": "hcd_dev_date", "indexdef": PARTIAL_DEF},
+        ])
+        missing = await index_advisor.missing_indexes(session)
+        assert DEVICE_DATE not in missing
+        assert DATE_ONLY in missing
+
+    def test_ddl_is_concurrent_partial(self):
+        assert DEVICE_DATE.ddl() == (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS health_connect_daily_daily_device_date_idx "
+            "ON health_connect_daily (device_id, date) WHERE source_type = 'daily'"
+        )
+
+
+class TestExplain:
+    def test_summarize_seq_scan(self):
+        plan = {
+            "Node Type": "Sort",
+            "Total Cost": 120.5,
+            "Plans": [{"Node Type": "Seq Scan", "Relation Name": "health_connect_daily"}],
+        }
+        summary = index_advisor.summarize_plan(plan)
+        assert summary == {"root": "Sort", "total_cost": 120.5, "indexes": [], "seq_scan": True}
+
+    @pytest.mark.asyncio
+    async def test_explains_each_connector_query(self):
+        statements: list[str] = []
+        plan = [{"Plan": {"Node Type": "Index Scan", "Total Cost": 8.3, "Index Name": "hcd_dev_date"}}]
+
+        class _Session(FakeSession):
+            async def execute(self, stmt, params=None):
+                statements.append(str(stmt))
+                return await super().execute(stmt, params)
+
+        out = await index_advisor.explain_connector_queries(
+            _Session([{"QUERY PLAN": plan}]), date(2026, 2, 1), date(2026, 2, 8), "dev"
+        )
+        assert len(out) == len(statements) == 4
+        assert all(s.startswith("EXPLAIN (FORMAT JSON) SELECT") for s in statements)
+        assert all(v["indexes"] == ["hcd_dev_date"] and not v["seq_scan"] for v in out.values())
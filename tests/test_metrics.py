@@ -0,0 +1,86 @@
+"""Tests for the in-process Prometheus metrics."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import metrics
+from app.metrics import Histogram
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        h = Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            h.observe(value, ("/x",))
+        lines = h.render()
+        assert lines[:2] == ["# HELP t_seconds Test.", "# TYPE t_seconds histogram"]
+        assert 't_seconds_bucket{route="/x",le="0.1"} 2' in lines
+        assert 't_seconds_bucket{route="/x",le="1.0"} 3' in lines
+        assert 't_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+        assert 't_seconds_sum{route="/x"} 3.65' in lines
+        assert 't_seconds_count{route="/x"} 4' in lines
+
+    def test_label_escaping(self):
+        h = Histogram("t", "Test.", ("path",), buckets=(1.0,))
+        h.observe(0.5, ('a"b\\c',))
+        assert 't_count{path="a\\"b\\\\c"} 1' in h.render()
+
+
+class TestEngineInstrumentation:
+    def test_statements_timed(self):
+        engine = create_engine("sqlite://")
+        before = metrics.DB_QUERY_SECONDS.count(("test",))
+        metrics.instrument_engine(SimpleNamespace(sync_engine=engine), "test")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 2"))
+            assert not conn.info["kernel_query_started"]
+        assert metrics.DB_QUERY_SECONDS.count(("test",)) == before + 2
+
+
+class TestMetricsEndpoint:
+    @pytest.mark.asyncio
+    async def test_disabled_404(self, client):
+        resp = await client.get("/metrics")
+        assert resp.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_card_request_recorded(self, client):
+        labels = ("GET", "/kernel/cards/{card_type}", "weekly_overview", "200")
+        before = metrics.REQUEST_SECONDS.count(labels)
+        with (
+            patch("app.metrics.settings.kernel_metrics", True),
+            patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]),
+        ):
+            resp = await client.get("/kernel/cards/weekly_overview?from=2026-02-09&to=2026-02-15")
+            assert resp.status_code == 200
+            assert metrics.REQUEST_SECONDS.count(labels) == before + 1
+            assert metrics.CARD_ROWS.count(("weekly_overview",)) >= 1
+            assert metrics.STAGE_SECONDS.count(("fetch", "weekly_overview")) >= 1
+            assert metrics.RESPONSE_BYTES.count(("/kernel/cards/{card_type}",)) >= 1
+
+            scrape = await client.get("/metrics")
+        assert scrape.status_code == 200
+        assert scrape.headers["content-type"].startswith("text/plain")
+        body = scrape.text
+        assert 'kernel_request_duration_seconds_count{method="GET",route="/kernel/cards/{card_type}"' in body
+        assert "# TYPE kernel_db_pool_connections gauge" in body
+        assert 'kernel_card_cache_events_total{event="hit"}' in body
+
+    @pytest.mark.asyncio
+    async def test_unknown_card_type_label_bounded(self, client):
+        labels = ("GET", "/kernel/cards/{card_type}", "other", "404")
+        before = metrics.REQUEST_SECONDS.count(labels)
+        with patch("app.metrics.settings.kernel_metrics", True):
+            for junk in ("nope", "nope2", "x" * 40):
+                resp = await client.get(f"/kernel/cards/{junk}?from=2026-02-09&to=2026-02-15")
+                assert resp.status_code == 404
+        assert metrics.REQUEST_SECONDS.count(labels) == before + 3
+        assert not any(key[2].startswith("nope") for key in metrics.REQUEST_SECONDS._series)
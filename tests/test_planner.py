@@ -0,0 +1,41 @@
+"""Tests for multi-card fetch planning."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from app.kernel.planner import FetchNeed, covering, merge_needs
+
+
+def _need(a: int, b: int, device_id: str | None = None) -> FetchNeed:
+    return FetchNeed(date(2026, 3, a), date(2026, 3, b), device_id)
+
+
+class TestMergeNeeds:
+    def test_nested_and_overlapping_merge(self):
+        assert merge_needs([_need(8, 9), _need(1, 10), _need(5, 20)]) == [_need(1, 20)]
+
+    def test_touching_ranges_merge(self):
+        assert merge_needs([_need(1, 5), _need(5, 9)]) == [_need(1, 9)]
+
+    def test_disjoint_ranges_kept(self):
+        assert merge_needs([_need(10, 12), _need(1, 5)]) == [_need(1, 5), _need(10, 12)]
+
+    def test_devices_not_merged(self):
+        merged = merge_needs([_need(1, 5, "a"), _need(2, 6, "b"), _need(3, 4)])
+        assert merged == [_need(3, 4), _need(1, 5, "a"), _need(2, 6, "b")]
+
+    def test_empty(self):
+        assert merge_needs([]) == []
+
+
+class TestCovering:
+    def test_finds_container(self):
+        intervals = merge_needs([_need(1, 5), _need(10, 20)])
+        assert covering(intervals, _need(12, 14)) == _need(10, 20)
+
+    def test_missing(self):
+        with pytest.raises(KeyError):
+            covering([_need(1, 5)], _need(4, 8))
@@ -0,0 +1,128 @@
+"""Tests for the background card pre-warm scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.kernel.cache import CardCache
+from app.kernel.prewarm import PrewarmScheduler, next_run_after_midnight, prewarm_targets
+from app.main import app, lifespan
+
+from tests.conftest import FakeSession
+
+
+class TestSchedule:
+    def test_targets(self):
+        # 2026-03-05 is a Thursday
+        assert prewarm_targets(date(2026, 3, 5)) == [
+            ("daily_summary", date(2026, 3, 5)),
+            ("daily_summary", date(2026, 3, 4)),
+            ("weekly_overview", date(2026, 3, 2)),
+        ]
+
+    def test_next_run_is_local_midnight_plus_delay(self):
+        tz = ZoneInfo("America/New_York")
+        now = datetime(2026, 3, 5, 23, 59, tzinfo=tz)
+        assert next_run_after_midnight(now, 120) == datetime(2026, 3, 6, 0, 2, tzinfo=tz)
+
+    def test_next_run_right_after_midnight_is_tomorrow(self):
+        now = datetime(2026, 3, 5, 0, 0, 1, tzinfo=timezone.utc)
+        assert next_run_after_midnight(now, 0) == datetime(2026, 3, 6, tzinfo=timezone.utc)
+
+
+class TestWarm:
+    @pytest.mark.asyncio
+    async def test_warms_every_device_and_all_devices(self):
+        get_card = AsyncMock()
+        scheduler = PrewarmScheduler(FakeSession, "UTC")
+        with (
+            patch("app.kernel.prewarm.connector.fetch_active_devices", AsyncMock(return_value=["phone", "watch"])),
+            patch("app.kernel.prewarm.cache.get_card", get_card),
+            patch("app.kernel.prewarm.cache.card_cache", CardCache(8, 60)),
+        ):
+            warmed = await scheduler.warm()
+        assert warmed == 9
+        assert {c.args[4] for c in get_card.await_args_list} == {None, "phone", "watch"}
+        assert (scheduler.runs, scheduler.cards_warmed) == (1, 9)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("store, expected", [(False, 0), (True, 3)])
+    async def test_counts_only_kept_cards(self, store, expected):
+        # without the cache only closed periods (yesterday's daily card) are kept, and only by the store
+        get_card = AsyncMock()
+        scheduler = PrewarmScheduler(FakeSession, "UTC")
+        with (
+            patch("app.kernel.prewarm.connector.fetch_active_devices", AsyncMock(return_value=["phone", "watch"])),
+            patch("app.kernel.prewarm.cache.get_card", get_card),
+            patch("app.kernel.prewarm.cache.card_cache", CardCache(0, 60)),
+            patch("app.kernel.prewarm.settings.kernel_card_store", store),
+        ):
+            warmed = await scheduler.warm()
+        assert warmed == get_card.await_count == expected
+        assert {c.args[1] for c in get_card.await_args_list} <= {"daily_summary"}
+
+
+class TestLifespan:
+    @pytest.mark.asyncio
+    async def test_refuses_without_cache_or_store(self, caplog):
+        with (
+            patch("app.main.settings.kernel_prewarm", True),
+            patch("app.main.settings.kernel_card_store", False),
+            patch("app.main.card_cache", CardCache(0, 60)),
+            patch("app.main.PrewarmScheduler") as scheduler,
+            patch("app.main.close_pg_pool", AsyncMock()),
+        ):
+            async with lifespan(app):
+                pass
+        scheduler.assert_not_called()
+        assert "KERNEL_PREWARM ignored" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_warms_once_per_settled_burst(self):
+        # watermark moves, holds (burst settled -> warm), holds (already warm), moves, holds (warm)
+        marks = iter([("t1", 3), ("t1", 3), ("t1", 3), ("t2", 5), ("t2", 5)])
+        done = asyncio.Event()
+
+        async def watermark(*args, **kwargs):
+            try:
+                return next(marks)
+            except StopIteration:
+                done.set()
+                await asyncio.sleep(3600)
+
+        scheduler = PrewarmScheduler(FakeSession, "UTC", poll_seconds=0)
+        with (
+            patch("app.kernel.prewarm.connector.fetch_watermark", side_effect=watermark),
+            patch.object(scheduler, "warm", AsyncMock(return_value=0)) as warm,
+        ):
+            scheduler.start()
+            await asyncio.wait_for(done.wait(), timeout=2)
+            await scheduler.stop()
+        assert [c.args for c in warm.await_args_list] == [("ingestion",), ("ingestion",)]
+
+    @pytest.mark.asyncio
+    async def test_failed_run_keeps_scheduler_alive(self):
+        marks = iter([("t1", 1), ("t1", 1), ("t2", 2), ("t2", 2)])
+        done = asyncio.Event()
+
+        async def watermark(*args, **kwargs):
+            try:
+                return next(marks)
+            except StopIteration:
+                done.set()
+                await asyncio.sleep(3600)
+
+        scheduler = PrewarmScheduler(FakeSession, "UTC", poll_seconds=0)
+        with (
+            patch("app.kernel.prewarm.connector.fetch_watermark", side_effect=watermark),
+            patch.object(scheduler, "warm", AsyncMock(side_effect=RuntimeError("db down"))) as warm,
+        ):
+            scheduler.start()
+            await asyncio.wait_for(done.wait(), timeout=2)
+            await scheduler.stop()
+        assert warm.call_count == 2
@@ -0,0 +1,202 @@
+"""Fast rendering (KERNEL_FAST_RENDER) must produce byte-identical JSON."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.kernel import render
+from app.kernel.builders import build_card, build_timeseries
+
+from tests.conftest import FakeSession, fake_fetch, make_daily_row
+
+FIXED = {"id": "00000000-0000-0000-0000-000000000000", "generated_at": datetime(2026, 3, 1, tzinfo=timezone.utc)}
+
+
+def _rows() -> list[dict]:
+    return [
+        make_daily_row(
+            date(2026, 1, 1) + timedelta(days=i),
+            steps_total=4000 + 37 * i,
+            body_metrics={"weight_kg": 131.2 - i / 20, "body_fat_percentage": 28.5} if i % 3 else {},
+            heart_rate_summary={"avg_hr": 60 + i % 11, "min_hr": 48, "max_hr": 151},
+            nutrition_summary={"calories_total": 1900 + 13 * i} if i % 2 else {},
+        )
+        for i in range(0, 90)
+        if i % 13 != 4
+    ]
+
+
+async def _card_bytes(card_type: str, start: date, rows: list[dict], fast: bool) -> bytes:
+    with (
+        patch("app.kernel.builders.settings.kernel_fast_render", fast),
+        patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)),
+    ):
+        card = await build_card(FakeSession(), card_type, start, "US/Eastern")
+    return render.CARD.dump_json(card.model_copy(update=FIXED))
+
+
+class TestConstructedEnvelopes:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("card_type", "start"),
+        [
+            ("daily_summary", date(2026, 3, 10)),
+            ("weekly_overview", date(2026, 3, 2)),
+            ("monthly_overview", date(2026, 3, 1)),
+            ("daily_summary", date(2027, 1, 1)),  # future, no data
+        ],
+    )
+    async def test_byte_identical(self, card_type, start):
+        rows = _rows()
+        assert await _card_bytes(card_type, start, rows, True) == await _card_bytes(card_type, start, rows, False)
+
+    @pytest.mark.asyncio
+    async def test_byte_identical_vectorized(self):
+        pytest.importorskip("numpy")
+        rows = _rows()
+        with patch("app.kernel.builders.settings.kernel_vectorized_features", True):
+            fast = await _card_bytes("monthly_overview", date(2026, 3, 1), rows, True)
+            slow = await _card_bytes("monthly_overview", date(2026, 3, 1), rows, False)
+        assert fast == slow
+
+
+class TestFastResponses:
+    @pytest.mark.asyncio
+    async def test_card_response_matches_fastapi(self, client):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(_rows())):
+            card = (await build_card(FakeSession(), "monthly_overview", date(2026, 3, 1))).model_copy(update=FIXED)
+
+        url = "/kernel/cards/monthly_overview?from=2026-03-01&to=2026-03-31"
+        with patch("app.kernel.router.cache.get_card", AsyncMock(return_value=card)):
+            default = await client.get(url)
+            with patch("app.kernel.router.settings.kernel_fast_render", True):
+                fast = await client.get(url)
+        assert fast.status_code == default.status_code == 200
+        assert fast.headers["content-type"] == default.headers["content-type"]
+        assert fast.content == default.content
+
+    @pytest.mark.asyncio
+    async def test_preset_response_matches_fastapi(self, client):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(_rows())):
+            card = (await build_card(FakeSession(), "weekly_overview", date(2026, 3, 2))).model_copy(update=FIXED)
+
+        url = "/kernel/presets/weekly_health/run?from=2026-03-02&to=2026-03-08"
+        with patch("app.kernel.router.builders.build_preset_cards", AsyncMock(return_value=[card, card])):
+            default = await client.get(url)
+            with patch("app.kernel.router.settings.kernel_fast_render", True):
+                fast = await client.get(url)
+        assert fast.content == default.content
+
+    @pytest.mark.asyncio
+    async def test_timeseries_response_matches_fastapi(self, client):
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(_rows())):
+            envelope = await build_timeseries(FakeSession(), "daily_summary", date(2026, 2, 1), date(2026, 2, 7))
+
+        url = "/kernel/timeseries/daily_summary?from=2026-02-01&to=2026-02-07"
+        with patch("app.kernel.router.builders.build_timeseries", AsyncMock(return_value=envelope)):
+            default = await client.get(url)
+            with patch("app.kernel.router.settings.kernel_fast_render", True):
+                fast = await client.get(url)
+        assert fast.status_code == default.status_code == 200
+        assert fast.content == default.content
+
+
+class TestParseFields:
+    def test_identity_fields_always_kept(self):
+        include = render.parse_fields("warnings")
+        assert set(include) == {*render.IDENTITY_FIELDS, "warnings"}
+        assert all(v is True for v in include.values())
+
+    def test_subfields(self):
+        include = render.parse_fields("signals.value, signals.record_type,evidence.total_rows,priority_summary")
+        assert include["signals"] == {"__all__": {"value", "record_type"}}
+        assert include["evidence"] == {"total_rows"}
+        assert include["priority_summary"] is True
+
+    def test_whole_section_wins_over_subfields(self):
+        assert render.parse_fields("signals.value,signals")["signals"] is True
+
+    @pytest.mark.parametrize("value", ["nope", "signals.nope", "warnings.value", "summary.x"])
+    def test_unknown_rejected(self, value):
+        with pytest.raises(ValueError):
+            render.parse_fields(value)
+
+    def test_sections(self):
+        assert render.sections(None) is None
+        assert render.sections(render.parse_fields("signals.value")) == {*render.IDENTITY_FIELDS, "signals"}
+
+
+class TestSparseCards:
+    @pytest.mark.asyncio
+    async def test_unrequested_sections_not_built(self):
+        rows = _rows()
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)):
+            full = await build_card(FakeSession(), "monthly_overview", date(2026, 3, 1))
+        with (
+            patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(rows)),
+            patch("app.kernel.builders.EvidenceSource") as evidence_source,
+            patch("app.kernel.builders.Drilldown") as drilldown,
+        ):
+            sparse = await build_card(
+                FakeSession(), "monthly_overview", date(2026, 3, 1), sections=render.sections(render.parse_fields("signals"))
+            )
+        evidence_source.assert_not_called()
+        drilldown.assert_not_called()
+        assert sparse.evidence.sources == [] and sparse.drilldowns == [] and sparse.coverage.signals == []
+        assert sparse.signals == full.signals
+        assert sparse.priority_summary == full.priority_summary
+        assert sparse.warnings == full.warnings
+
+    @pytest.mark.asyncio
+    async def test_card_endpoint(self, client):
+        url = "/kernel/cards/monthly_overview?from=2026-03-01&to=2026-03-31"
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(_rows())):
+            full_resp = await client.get(url)
+            resp = await client.get(url + "&fields=signals.value,priority_summary,warnings")
+        assert resp.status_code == 200
+        full, body = full_resp.json(), resp.json()
+        assert set(body) == {*render.IDENTITY_FIELDS, "signals", "priority_summary", "warnings"}
+        assert body["signals"] == [{"value": s["value"]} for s in full["signals"]]
+        assert body["priority_summary"] == full["priority_summary"]
+        assert len(resp.content) < len(full_resp.content) / 2
+
+    @pytest.mark.asyncio
+    async def test_cached_cards_stay_complete(self, client):
+        from app.kernel.cache import CardCache
+
+        cache = CardCache(8, 300.0)
+        url = "/kernel/cards/monthly_overview?from=2026-03-01&to=2026-03-31"
+        with (
+            patch("app.kernel.cache.card_cache", cache),
+            patch("app.kernel.cache.connector.fetch_watermark", AsyncMock(return_value=(None, 1))),
+            patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(_rows())),
+        ):
+            await client.get(url + "&fields=signals.value")
+            full = (await client.get(url)).json()
+        assert cache.hits == 1
+        assert full["evidence"]["sources"] and full["drilldowns"]
+
+    @pytest.mark.asyncio
+    async def test_preset_endpoint(self, client):
+        url = "/kernel/presets/weekly_health/run?from=2026-03-02&to=2026-03-08&fields=warnings,evidence.total_rows"
+        with patch("app.kernel.builders.connector.fetch_daily_rows", side_effect=fake_fetch(_rows())):
+            resp = await client.get(url)
+        assert resp.status_code == 200
+        (card,) = resp.json()
+        assert set(card) == {*render.IDENTITY_FIELDS, "warnings", "evidence"}
+        assert set(card["evidence"]) == {"total_rows"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/kernel/cards/daily_summary?from=2026-03-01&to=2026-03-01&fields=signals.nope",
+            "/kernel/presets/daily_brief/run?from=2026-03-01&to=2026-03-01&fields=bogus",
+        ],
+    )
+    async def test_unknown_field_422(self, client, path):
+        resp = await client.get(path)
+        assert resp.status_code == 422
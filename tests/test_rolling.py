@@ -0,0 +1,89 @@
+"""Rolling baselines vs. per-card recomputation."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+from app.kernel.rolling import card_stats, sliding_extreme
+from app.kernel.series import SignalSeries
+from app.kernel.signal_map import list_signals
+from app.kernel.stats import stats_from_series
+
+from tests.conftest import make_daily_row
+
+
+def _rows(days: int = 45, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    rows = []
+    for i in range(days):
+        if i % 11 == 5:
+            continue  # gap day
+        d = start + timedelta(days=i)
+        rows.append(
+            make_daily_row(
+                d,
+                steps_total=rng.randint(0, 15000),
+                body_metrics={"weight_kg": rng.uniform(120, 135)} if i % 3 else {},
+                heart_rate_summary={"avg_hr": rng.randint(55, 90), "min_hr": rng.randint(40, 60)},
+                nutrition_summary={"calories_total": rng.randint(1500, 3000)} if i % 2 else {},
+            )
+        )
+        if i % 7 == 0:
+            rows.append(make_daily_row(d, steps_total=rng.randint(0, 500), device_id="watch"))
+    return rows
+
+
+def _daily_periods(start: date, end_exclusive: date) -> list[tuple[date, date, date]]:
+    days = (start + timedelta(days=i) for i in range((end_exclusive - start).days))
+    return [(d, d + timedelta(days=1), d - timedelta(days=7)) for d in days]
+
+
+def _same(got, expected):
+    return got == expected
+
+
+class TestSlidingExtreme:
+    def test_matches_brute_force(self):
+        rng = random.Random(1)
+        values = [rng.choice([None, rng.uniform(-5, 5)]) for _ in range(40)]
+        windows = [(max(0, i - 7), i) for i in range(41)]
+        for largest in (True, False):
+            got = sliding_extreme(values, windows, largest)
+            for (lo, hi), g in zip(windows, got):
+                present = [v for v in values[lo:hi] if v is not None]
+                assert g == ((max if largest else min)(present) if present else None)
+
+
+class TestCardStats:
+    def test_matches_per_card_stats(self):
+        series = SignalSeries.from_rows(_rows())
+        periods = _daily_periods(date(2026, 1, 3), date(2026, 2, 20))
+        for (start, end, baseline_start), (target, baseline) in zip(periods, card_stats(series, periods)):
+            assert target == stats_from_series(series.slice(start, end), 1)
+            expected = stats_from_series(series.slice(baseline_start, start), 7)
+            assert (baseline.row_count, baseline.earliest, baseline.latest, baseline.tracking) == (
+                expected.row_count, expected.earliest, expected.latest, expected.tracking,
+            )
+            assert baseline.counts == expected.counts
+            for name in list_signals():
+                assert _same(baseline.means[name], expected.means[name]), (start, name)
+                assert _same(baseline.values[name], expected.values[name]), (start, name)
+
+    def test_weekly_periods(self):
+        series = SignalSeries.from_rows(_rows(days=90))
+        periods = [
+            (start, start + timedelta(days=7), start - timedelta(weeks=4))
+            for start in (date(2026, 2, 2) + timedelta(weeks=i) for i in range(6))
+        ]
+        for (start, end, baseline_start), (_, baseline) in zip(periods, card_stats(series, periods)):
+            expected = stats_from_series(series.slice(baseline_start, start), 28)
+            assert baseline.counts == expected.counts
+            assert _same(baseline.means["steps_total"], expected.means["steps_total"])
+
+    def test_empty(self):
+        assert card_stats(SignalSeries.empty(), []) == []
+        [(target, baseline)] = card_stats(SignalSeries.empty(), _daily_periods(date(2026, 1, 1), date(2026, 1, 2)))
+        assert target.row_count == baseline.row_count == 0
+        assert baseline.means["steps_total"] is None
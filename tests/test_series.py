@@ -0,0 +1,95 @@
+"""Tests for the date-aligned columnar signal series."""
+
+from __future__ import annotations
+
+import math
+from datetime import date
+
+from app.kernel.series import SignalSeries
+from app.kernel.stats import stats_from_rows, stats_from_series
+
+from tests.conftest import make_daily_row
+
+
+def _rows() -> list[dict]:
+    return [
+        make_daily_row(date(2026, 2, 10), steps_total=400, body_metrics={"weight_kg": 131.0}),
+        make_daily_row(date(2026, 2, 10), steps_total=50, device_id="other"),
+        make_daily_row(date(2026, 2, 11), steps_total=300, heart_rate_summary={"avg_hr": 70}),
+        make_daily_row(
+            date(2026, 2, 12),
+            body_metrics={"weight_kg": 130.4},
+            heart_rate_summary={"avg_hr": 74},
+            nutrition_summary={"calories_total": 2100},
+        ),
+        make_daily_row(date(2026, 2, 14), steps_total=900),
+    ]
+
+
+class TestFromRows:
+    def test_columns_aligned_to_dates(self):
+        series = SignalSeries.from_rows(_rows())
+        assert len(series) == 5
+        assert series.dates()[0] == date(2026, 2, 10)
+        assert list(series.present["avg_hr"]) == [0, 0, 1, 1, 0]
+        assert math.isnan(series.columns["avg_hr"][0])
+        assert series.columns["avg_hr"][2] == 70.0
+        assert list(series.tracked) == [1, 0, 0, 1, 0]
+
+    def test_unsorted_rows_sorted(self):
+        series = SignalSeries.from_rows(list(reversed(_rows())))
+        assert series.dates() == sorted(series.dates())
+
+    def test_projected_rows(self):
+        rows = [
+            {"date": date(2026, 2, 10), "steps_total": 10.0, "manual_tracked": True},
+            {"date": date(2026, 2, 11), "steps_total": None, "manual_tracked": False},
+        ]
+        series = SignalSeries.from_rows(rows, projected=True)
+        assert list(series.values("steps_total")) == [10.0]
+        assert series.tracked_days() == 1
+
+    def test_empty(self):
+        series = SignalSeries.from_rows([])
+        assert len(series) == 0
+        assert series.earliest is None
+        assert series.last("steps_total") is None
+        assert series.aggregate("steps_total", "sum") is None
+
+
+class TestSlicing:
+    def test_slice_half_open(self):
+        sliced = SignalSeries.from_rows(_rows()).slice(date(2026, 2, 11), date(2026, 2, 14))
+        assert sliced.dates() == [date(2026, 2, 11), date(2026, 2, 12)]
+        assert list(sliced.values("avg_hr")) == [70.0, 74.0]
+
+    def test_split_at(self):
+        before, after = SignalSeries.from_rows(_rows()).split_at(date(2026, 2, 12))
+        assert len(before) == 3
+        assert after.earliest == date(2026, 2, 12)
+
+    def test_bounds_outside_range(self):
+        series = SignalSeries.from_rows(_rows())
+        assert series.bounds(date(2026, 3, 1), date(2026, 3, 5)) == (5, 5)
+        assert series.bounds(date(2026, 2, 20), date(2026, 2, 1)) == (5, 5)
+
+
+class TestReductions:
+    def test_last_is_latest_present_value(self):
+        series = SignalSeries.from_rows(_rows())
+        assert series.last("weight_kg") == 130.4
+        assert series.aggregate("weight_kg", "last") == 130.4
+
+    def test_day_counts(self):
+        assert SignalSeries.from_rows(_rows()).day_counts() == {
+            "2026-02-10": 2, "2026-02-11": 1, "2026-02-12": 1, "2026-02-14": 1,
+        }
+
+    def test_stats_match_row_path(self):
+        rows = _rows()
+        series = SignalSeries.from_rows(rows)
+        assert stats_from_series(series, 7) == stats_from_rows(rows, 7)
+        pivot = date(2026, 2, 12)
+        before, after = series.split_at(pivot)
+        assert stats_from_series(after, 3) == stats_from_rows([r for r in rows if r["date"] >= pivot], 3)
+        assert stats_from_series(before, 7) == stats_from_rows([r for r in rows if r["date"] < pivot], 7)
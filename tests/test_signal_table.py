@@ -0,0 +1,152 @@
+"""Tests for the pre-extracted signal table (SQL shape + refresh/freshness logic)."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.kernel import connector, signal_table
+from app.kernel.signal_map import SIGNAL_CONFIG
+
+from tests.conftest import FakeSession
+
+
+class _ScriptedResult:
+    def __init__(self, row):
+        self._row = row
+
+    def fetchone(self):
+        return self._row
+
+
+class _ScriptedSession:
+    """Returns queued rows for successive execute() calls and records the SQL."""
+
+    def __init__(self, *rows, fail: bool = False):
+        self._rows = list(rows)
+        self.fail = fail
+        self.statements: list[tuple[str, dict | None]] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((str(stmt), params))
+        if self.fail:
+            raise RuntimeError("relation does not exist")
+        return _ScriptedResult(self._rows.pop(0) if self._rows else None)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture(autouse=True)
+def _reset_state_cache(monkeypatch):
+    monkeypatch.setattr(signal_table, "_state_cache", None)
+
+
+class TestSql:
+    def test_ddl_has_column_per_signal(self):
+        table_ddl = signal_table.create_table_sql()[0]
+        for name in SIGNAL_CONFIG:
+            assert f'"{name}" double precision' in table_ddl
+        assert "manual_tracked boolean" in table_ddl
+        assert "PRIMARY KEY (device_id, date)" in table_ddl
+
+    def test_refresh_is_incremental_upsert(self):
+        sql = signal_table.REFRESH_SQL
+        assert "received_at > :since" in sql
+        assert "DISTINCT ON (device_id, date)" in sql
+        assert "ON CONFLICT (device_id, date) DO UPDATE" in sql
+        assert connector.SIGNAL_PROJECTION_SQL in sql
+
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_first_refresh_scans_everything(self):
+        new_wm = datetime(2026, 2, 17, 16, 11, tzinfo=timezone.utc)
+        session = _ScriptedSession((None,), (12, new_wm), None)
+        assert await signal_table.refresh(session) == 12
+        assert session.statements[1][1] == {"since": None}
+        assert session.statements[2][1] == {"wm": new_wm}
+        assert session.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_rescans_overlap_behind_watermark(self):
+        wm = datetime(2026, 2, 17, 16, 11, tzinfo=timezone.utc)
+        session = _ScriptedSession((wm,), (0, None), None)
+        assert await signal_table.refresh(session) == 0
+        assert session.statements[1][1] == {"since": wm - signal_table.REFRESH_OVERLAP}
+
+    @pytest.mark.asyncio
+    async def test_refresh_marks_fresh(self):
+        session = _ScriptedSession((None,), (0, None), None)
+        await signal_table.refresh(session)
+        assert await signal_table.is_fresh(_ScriptedSession(fail=True), 60)
+
+
+class TestIsFresh:
+    @pytest.mark.asyncio
+    async def test_recent_refresh(self):
+        recent = datetime.now(timezone.utc) - timedelta(seconds=30)
+        assert await signal_table.is_fresh(_ScriptedSession((recent, None)), 900)
+
+    @pytest.mark.asyncio
+    async def test_stale_refresh(self):
+        old = datetime.now(timezone.utc) - timedelta(hours=2)
+        assert not await signal_table.is_fresh(_ScriptedSession((old, None)), 900)
+
+    @pytest.mark.asyncio
+    async def test_missing_table_is_not_fresh(self):
+        session = _ScriptedSession(fail=True)
+        assert not await signal_table.is_fresh(session, 900)
+        assert session.rollbacks == 1
+
+    @pytest.mark.asyncio
+    async def test_state_lookup_cached(self):
+        recent = datetime.now(timezone.utc)
+        session = _ScriptedSession((recent, None))
+        await signal_table.is_fresh(session, 900)
+        await signal_table.is_fresh(session, 900)
+        assert len(session.statements) == 1
+
+
+class TestCoveredWatermark:
+    @pytest.mark.asyncio
+    async def test_read_from_state(self):
+        wm = datetime(2026, 2, 17, 16, 11, tzinfo=timezone.utc)
+        session = _ScriptedSession((datetime.now(timezone.utc), wm))
+        assert await signal_table.covered_watermark(session) == wm
+        assert await signal_table.is_fresh(session, 900)
+        assert len(session.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_highest(self):
+        wm = datetime(2026, 2, 17, 16, 11, tzinfo=timezone.utc)
+        # nothing new since the stored watermark: it stays the covered one
+        await signal_table.refresh(_ScriptedSession((wm,), (0, None), None))
+        assert await signal_table.covered_watermark(_ScriptedSession(fail=True)) == wm
+
+    @pytest.mark.asyncio
+    async def test_missing_table_covers_nothing(self):
+        assert await signal_table.covered_watermark(_ScriptedSession(fail=True)) is None
+
+
+class TestFetchSignalRows:
+    @pytest.mark.asyncio
+    async def test_reads_signal_table(self):
+        captured: dict = {}
+
+        class _Session(FakeSession):
+            async def execute(self, stmt, params=None):
+                captured["sql"] = str(stmt)
+                return await super().execute(stmt, params)
+
+        await connector.fetch_signal_rows(_Session(), date(2026, 2, 1), date(2026, 2, 8), "dev")
+        assert f"FROM {connector.SIGNAL_TABLE}" in captured["sql"]
+        assert "raw_data" not in captured["sql"]
+        assert "source_type" not in captured["sql"]
+        assert "device_id = :device_id" in captured["sql"]
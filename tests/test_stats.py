@@ -0,0 +1,98 @@
+"""Tests for incremental per-period reductions."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, time, timezone
+
+import pytest
+from asyncpg.protocol.protocol import _create_record
+
+from app.kernel import extractor, features
+from app.kernel.signal_map import SIGNAL_CONFIG
+from app.kernel.stats import PeriodAccumulator, SignalAccumulator, stats_from_rows, stats_from_stream
+
+from tests.conftest import make_daily_row
+
+
+def _rows() -> list[dict]:
+    return [
+        make_daily_row(date(2026, 2, 10), steps_total=400, body_metrics={"weight_kg": 131.0}),
+        make_daily_row(date(2026, 2, 10), steps_total=50, device_id="other"),
+        make_daily_row(date(2026, 2, 11), steps_total=300, heart_rate_summary={"avg_hr": 70, "max_hr": 120}),
+        make_daily_row(
+            date(2026, 2, 12),
+            body_metrics={"weight_kg": 130.4},
+            heart_rate_summary={"avg_hr": 74, "max_hr": 110},
+            nutrition_summary={"calories_total": 2100},
+        ),
+    ]
+
+
+class TestSignalAccumulator:
+    @pytest.mark.parametrize("method", ["sum", "avg", "max", "min", "last", "unknown"])
+    def test_matches_aggregate(self, method):
+        values = [3.5, 1.0, 7.25, 2.0]
+        acc = SignalAccumulator(method)
+        for v in values:
+            acc.add(v)
+        assert acc.value == features.aggregate(values, method)
+        assert acc.mean == features.trailing_average(values)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_float_sums_match_builtin_sum(self, seed):
+        # naive running addition drifts from the compensated sum() in the last bits
+        rng = random.Random(seed)
+        values = [rng.uniform(55, 90) for _ in range(31)]
+        acc = SignalAccumulator("avg")
+        for v in values:
+            acc.add(v)
+        assert acc.total == sum(values)
+        assert acc.value == features.aggregate(values, "avg")
+
+    def test_empty(self):
+        acc = SignalAccumulator("sum")
+        assert acc.value is None
+        assert acc.mean is None
+
+
+class TestPeriodAccumulator:
+    def test_matches_list_features(self):
+        rows = _rows()
+        result = stats_from_rows(rows, expected_days=7)
+        series = extractor.extract_signal_series(rows)
+
+        assert result.row_count == 4
+        assert result.earliest == date(2026, 2, 10)
+        assert result.latest == date(2026, 2, 12)
+        assert result.tracking == features.tracking_consistency(rows, 7)
+        assert result.partial_days == features.detect_partial_days(
+            [datetime.combine(r["date"], time.min, tzinfo=timezone.utc) for r in rows]
+        )
+        for name, cfg in SIGNAL_CONFIG.items():
+            assert result.values[name] == features.aggregate(series[name], cfg.agg)
+            assert result.means[name] == features.trailing_average(series[name])
+            assert result.counts[name] == len(series[name])
+
+    def test_empty(self):
+        result = PeriodAccumulator().stats(expected_days=7)
+        assert result.row_count == 0
+        assert result.tracking == 0.0
+        assert all(v is None for v in result.values.values())
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_rows(self):
+        rows = _rows()
+
+        async def _batches():
+            yield rows[:3]
+            yield rows[3:]
+
+        streamed = await stats_from_stream(_batches(), expected_days=7)
+        assert streamed == stats_from_rows(rows, expected_days=7)
+
+    def test_accepts_asyncpg_records(self):
+        rows = _rows()
+        mapping = {"device_id": 0, "date": 1, "raw_data": 2}
+        records = [_create_record(mapping, (r["device_id"], r["date"], r["raw_data"])) for r in rows]
+        assert stats_from_rows(records, expected_days=7) == stats_from_rows(rows, expected_days=7)
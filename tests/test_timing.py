@@ -0,0 +1,74 @@
+"""Tests for per-stage timings and the Server-Timing header."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from app import timing
+from app.timing import Timings
+
+
+class TestSpans:
+    def test_noop_without_collector(self):
+        assert timing.current() is None
+        assert timing.start() == 0.0
+        with timing.span("fetch"):
+            pass
+        timing.stop("fetch", 0.0)
+        assert timing.current() is None
+
+    def test_spans_accumulate_per_stage(self):
+        timings = Timings()
+        token = timing._current.set(timings)
+        try:
+            with timing.span("fetch"):
+                pass
+            with timing.span("extract"):
+                pass
+            with timing.span("fetch"):
+                pass
+        finally:
+            timing._current.reset(token)
+        assert list(timings.stages) == ["fetch", "extract"]
+        assert all(seconds >= 0.0 for seconds in timings.stages.values())
+
+    def test_header_format(self):
+        timings = Timings()
+        timings.add("fetch", 0.0123)
+        timings.add("total", 0.02)
+        assert timings.header() == "fetch;dur=12.30, total;dur=20.00"
+        assert timings.milliseconds() == {"fetch": 12.3, "total": 20.0}
+
+    @pytest.mark.asyncio
+    async def test_timed_keeps_signature(self):
+        @timing.timed("handler")
+        async def handler(card_type: str, tz: str | None = None) -> str:
+            return card_type
+
+        assert handler.__wrapped__.__name__ == "handler"
+        assert await handler("daily_summary") == "daily_summary"
+
+
+class TestServerTimingHeader:
+    @pytest.mark.asyncio
+    async def test_card_stages_in_header(self, client, caplog):
+        with (
+            patch("app.timing.settings.kernel_server_timing", True),
+            patch("app.kernel.builders.connector.fetch_daily_rows", return_value=[]),
+            caplog.at_level("INFO", logger="app.timing"),
+        ):
+            resp = await client.get("/kernel/cards/daily_summary?from=2026-02-15&to=2026-02-15")
+        assert resp.status_code == 200
+        stages = [part.split(";")[0] for part in resp.headers["server-timing"].split(", ")]
+        assert stages[:2] == ["fetch", "extract"]
+        assert {"handler", "render", "total"} <= set(stages)
+        record = caplog.records[-1]
+        assert record.path == "/kernel/cards/daily_summary"
+        assert "fetch" in record.timings_ms
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, client):
+        resp = await client.get("/health")
+        assert "server-timing" not in resp.headers